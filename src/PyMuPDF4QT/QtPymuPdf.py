@@ -1,11 +1,22 @@
 import pymupdf
 import re
+import bisect
+import logging
+import threading
+from abc import ABCMeta, abstractmethod
 from enum import Enum
+from pathlib import Path
+from typing import Iterable, Iterator
 from dataclasses import dataclass, InitVar
+from pymupdf.utils import get_label_pno
 
 from qt_theme_manager import theme_icon_manager
 from qtpy import QtCore, QtGui, QtWidgets, Slot, Signal
 from utilities.utils import timeuuid
+from PyMuPDF4QT import text_index
+
+
+logger = logging.getLogger(__name__)
 
 
 
@@ -89,6 +100,36 @@ class ZoomSelector(QtWidgets.QWidget):
             self.zoomFactorChanged.emit(factor)
 
 
+class PageLabels:
+    """Page labels computed from the label rules of the document, no page is loaded
+
+    The labels are built by the function of Page.get_label from the same rules.
+    """
+    def __init__(self, document: pymupdf.Document):
+        self._rules: list[tuple[int, str]] = sorted(document._get_page_labels()) # (startpage, rule)
+        self._starts: list[int] = [rule[0] for rule in self._rules]
+        self._page_count: int = document.page_count
+        self._page_index: dict[str, int] = None
+
+    def label(self, pno: int) -> str:
+        i = bisect.bisect_right(self._starts, pno) - 1
+        if i < 0:
+            return ""
+        return get_label_pno(pno, [self._rules[i]])
+
+    def pageNumber(self, label: str) -> int | None:
+        if not self._rules:
+            return None
+
+        if self._page_index is None:
+            # First page wins if a label is repeated
+            self._page_index = {}
+            for pno in reversed(range(self._page_count)):
+                self._page_index[self.label(pno)] = pno
+
+        return self._page_index.get(label)
+
+
 class PageNavigator(QtWidgets.QWidget):
     currentPnoChanged = Signal(int)
     currentLocationChanged = Signal(QtCore.QPointF)
@@ -98,7 +139,7 @@ class PageNavigator(QtWidgets.QWidget):
         self._current_pno: int = None  # pno : page number
         self._current_page_label: str = ""
         self._current_location: QtCore.QPointF = QtCore.QPointF()
-        self._page_index:  dict[str, int] = {}
+        self._page_labels: PageLabels = None
 
         if parent is not None:
             parent = parent.toolbar()
@@ -136,15 +177,10 @@ class PageNavigator(QtWidgets.QWidget):
 
     def setDocument(self, document: pymupdf.Document):
         self._document: pymupdf.Document = document
-        self.indexPages()
-
-    def indexPages(self):
-        page: pymupdf.Page
-        for page in self._document:
-            self._page_index.update({page.get_label() : page.number})
+        self._page_labels = PageLabels(document)
     
     def _pageNumberFromLabel(self, label) -> int | None:
-        return self._page_index.get(label)
+        return self._page_labels.pageNumber(label)
 
     def _updatePageLineEdit(self):
         page_label = self._getCurrentPageLabel()
@@ -170,8 +206,7 @@ class PageNavigator(QtWidgets.QWidget):
                 self.currentPnoChanged.emit(self._current_pno)
 
     def _getCurrentPageLabel(self) -> str:
-        page: pymupdf.Page = self._document[self.currentPno()]
-        return page.get_label()
+        return self._page_labels.label(self.currentPno())
 
     def currentPno(self) -> int:
         return self._current_pno
@@ -233,39 +268,151 @@ class OutlineItem(QtGui.QStandardItem):
         return self.details
 
 
-class OutlineModel(QtGui.QStandardItemModel):
+class QtABCMeta(type(QtCore.QObject), ABCMeta):
+    """Metaclass of the Qt classes with abstract methods"""
+
+
+class ChunkSignals(QtCore.QObject):
+    chunk = Signal(int, object) # load id, list of entries
+    finished = Signal(int) # load id
+
+
+class ChunkWorker(QtCore.QRunnable, metaclass=QtABCMeta):
+    """Read entries of the document in its own handle and emit them in chunks
+
+    A chunk is emitted when it has `chunk_size` entries or `interval` ms after the previous one.
+    Subclasses implement `entries`.
+    """
+    def __init__(self, load_id: int, filepath: str, chunk_size: int = 200, interval: int = 100):
+        super().__init__()
+        self.load_id = load_id
+        self.filepath = filepath
+        self.chunk_size = chunk_size
+        self.interval = interval
+        self.signals = ChunkSignals()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @abstractmethod
+    def entries(self, doc: pymupdf.Document) -> Iterable:
+        """Return the entries of the document, read in the worker thread"""
+
+    def run(self):
+        try:
+            doc = pymupdf.Document(self.filepath)
+        except Exception as e:
+            logger.error(f"Cannot open document - Error: {e}")
+            self.signals.finished.emit(self.load_id)
+            return
+
+        chunk = []
+        timer = QtCore.QElapsedTimer()
+        timer.start()
+        try:
+            for entry in self.entries(doc):
+                if self._cancelled.is_set():
+                    break
+
+                chunk.append(entry)
+                if len(chunk) >= self.chunk_size or timer.hasExpired(self.interval):
+                    self.signals.chunk.emit(self.load_id, chunk)
+                    chunk = []
+                    timer.restart()
+        except Exception as e:
+            logger.error(f"Cannot read document {self.filepath} - Error: {e}")
+
+        if chunk and not self._cancelled.is_set():
+            self.signals.chunk.emit(self.load_id, chunk)
+
+        doc.close()
+        self.signals.finished.emit(self.load_id)
+
+
+class LazyModel(QtGui.QStandardItemModel, metaclass=QtABCMeta):
+    """Model of a document filled by a worker on first use, chunk by chunk
+
+    Subclasses set the `worker_type` reading the entries and implement `setupModelData`.
+    """
+    worker_type: type[ChunkWorker] = ChunkWorker
+
     def __init__(self, parent=None):
         super().__init__(parent)
+        self._document: pymupdf.Document = None
+        self._worker: ChunkWorker = None
+        self._load_id = 0
+        self._loaded = False
+
+    def setDocument(self, doc: pymupdf.Document):
+        self.cancel()
+        self.removeRows(0, self.rowCount())
+        self._document = doc
+        self._loaded = False
 
-    def setupModelData(self, outline: list[list]):    
-        parents: list[OutlineItem] = []
+    def isLoaded(self) -> bool:
+        return self._loaded
 
-        prev_child = OutlineItem([0, "", 0, {}])
-        parents.append(prev_child)
+    def isLoading(self) -> bool:
+        return self._worker is not None
 
-        for item in outline:
-            child = OutlineItem(item)
+    def load(self):
+        """Fill the model in the background, once per document"""
+        if self._document is None or self._loaded or self._worker is not None:
+            return
+
+        self._load_id += 1
+        self._worker = self.worker_type(self._load_id, self._document.name)
+        self._worker.signals.chunk.connect(self._onChunk)
+        self._worker.signals.finished.connect(self._onFinished)
+        QtCore.QThreadPool.globalInstance().start(self._worker)
+
+    def cancel(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+
+    @abstractmethod
+    def setupModelData(self, entries: list):
+        """Append a chunk of entries to the model"""
+
+    @Slot(int, object)
+    def _onChunk(self, load_id: int, entries: list):
+        if load_id == self._load_id and self._worker is not None:
+            self.setupModelData(entries)
 
-            if child.lvl == 1:
-                parent = self.invisibleRootItem()
-            elif child.lvl > prev_child.lvl:
-                parents.append(prev_child)
-                parent = parents[-1]
-            elif child.lvl < prev_child.lvl:
-                parents.pop()
-                parent = parents[-1]
+    @Slot(int)
+    def _onFinished(self, load_id: int):
+        if load_id == self._load_id and self._worker is not None:
+            self._worker = None
+            self._loaded = True
 
-            parent.appendRow(child)
 
-            prev_child = child
+class OutlineWorker(ChunkWorker):
+    def entries(self, doc: pymupdf.Document):
+        return doc.get_toc(simple=False)
+
+
+class OutlineModel(LazyModel):
+    worker_type = OutlineWorker
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._parents: list[QtGui.QStandardItem] = [self.invisibleRootItem()]
 
     def setDocument(self, doc: pymupdf.Document):
-        self._document = doc
-        self.setupModelData(self.getToc())
+        super().setDocument(doc)
+        self._parents = [self.invisibleRootItem()]
 
-    def getToc(self):
-        toc = self._document.get_toc(simple=False)
-        return toc
+    def setupModelData(self, outline: list[list]):
+        """Append the outline entries after those already in the model"""
+        for item in outline:
+            child = OutlineItem(item)
+
+            # Ancestors of the entry, the root for level 1
+            del self._parents[max(child.lvl, 1):]
+            self._parents[-1].appendRow(child)
+            self._parents.append(child)
 
 @dataclass
 class GoToLink:
@@ -277,14 +424,15 @@ class GoToLink:
     zoom: float = 1.0
     id: str = ""
     page: InitVar[pymupdf.Page | None] = None
+    textpage: InitVar[pymupdf.TextPage | None] = None
     page_from: int = 0
     label: str = ""
 
-    def __post_init__(self, page: pymupdf.Page):
+    def __post_init__(self, page: pymupdf.Page, textpage: pymupdf.TextPage | None):
         self.page_from = page.number
         height_correction = self.hotspot.height * 0.1
         rect = self.hotspot + [0, height_correction, 0, -height_correction]
-        label: str = page.get_textbox(rect)
+        label: str = page.get_textbox(rect, textpage=textpage)
         self.label = label.strip().replace("\n", " ")
 
 @dataclass
@@ -295,14 +443,15 @@ class UriLink:
     uri: str = ""
     id: str = ""
     page: InitVar[pymupdf.Page | None] = None
+    textpage: InitVar[pymupdf.TextPage | None] = None
     page_from: int = 0
     label: str = ""
 
-    def __post_init__(self, page: pymupdf.Page):
+    def __post_init__(self, page: pymupdf.Page, textpage: pymupdf.TextPage | None):
         self.page_from = page.number
         height_correction = self.hotspot.height * 0.1
         rect = self.hotspot + [0, height_correction, 0, -height_correction]
-        label: str = page.get_textbox(rect)
+        label: str = page.get_textbox(rect, textpage=textpage)
         self.label = label.strip().replace("\n", " ")
 
 @dataclass
@@ -316,14 +465,15 @@ class NamedLink:
     nameddest: str = ""
     id: str = ""
     page: InitVar[pymupdf.Page | None] = None
+    textpage: InitVar[pymupdf.TextPage | None] = None
     page_from: int = 0
     label: str = ""
 
-    def __post_init__(self, page: pymupdf.Page):
+    def __post_init__(self, page: pymupdf.Page, textpage: pymupdf.TextPage | None):
         self.page_from = page.number
         height_correction = - self.hotspot.height * 0.1
         rect = self.hotspot + [0, height_correction, 0, -height_correction]
-        label: str = page.get_textbox(rect)
+        label: str = page.get_textbox(rect, textpage=textpage)
         self.label = label.strip().replace("\n", " ")
 
 class LinkFactory:
@@ -334,12 +484,12 @@ class LinkFactory:
         for link_type in [GoToLink, UriLink, NamedLink]:
             self.link_types[link_type.kind] = link_type
 
-    def createLink(self, link: dict, page: pymupdf.Page) -> GoToLink | UriLink | NamedLink:
+    def createLink(self, link: dict, page: pymupdf.Page, textpage: pymupdf.TextPage | None = None) -> GoToLink | UriLink | NamedLink:
         val: GoToLink | UriLink | NamedLink
         # val = self.link_types.get(link['kind'])
         for key, val in self.link_types.items():
             if link['kind'] == key.value:
-                return val(*link.values(), page)
+                return val(*link.values(), page, textpage)
             
 class LinkItem(QtGui.QStandardItem):
     def __init__(self, link: GoToLink | UriLink | NamedLink):
@@ -351,25 +501,30 @@ class LinkItem(QtGui.QStandardItem):
     def link(self):
         return self._link
 
-class LinkModel(QtGui.QStandardItemModel):
-    def __init__(self, parent=None):
-        super().__init__(parent)
+class LinkWorker(ChunkWorker):
+    def entries(self, doc: pymupdf.Document):
+        link_factory = LinkFactory()
 
-    def setDocument(self, doc: pymupdf.Document):
-        self._document = doc
-        self.setupModelData()
+        for page in doc:
+            links = list(page.links([pymupdf.LINK_GOTO, pymupdf.LINK_NAMED]))
+            if not links:
+                continue
 
-    def setupModelData(self):    
-        parent = self.invisibleRootItem()
+            # The text of the page is extracted once for the labels of its links
+            textpage = page.get_textpage()
+            for link in links:
+                yield link_factory.createLink(link, page, textpage)
 
-        link_factory = LinkFactory()
 
-        for page in self._document:
-            for link in page.links([pymupdf.LINK_GOTO, pymupdf.LINK_NAMED]):
-                link_object = link_factory.createLink(link, page)
+class LinkModel(LazyModel):
+    worker_type = LinkWorker
 
-                link_item = LinkItem(link_object)
-                parent.appendRow(link_item)
+    def setupModelData(self, links: list[GoToLink | NamedLink]):
+        parent = self.invisibleRootItem()
+
+        for link_object in links:
+            link_item = LinkItem(link_object)
+            parent.appendRow(link_item)
 
 class SearchItem(QtGui.QStandardItem):
     def __init__(self, result: dict):
@@ -385,38 +540,177 @@ class SearchItem(QtGui.QStandardItem):
         return self.pno, self.quads, self.page_label
 
 
+class SearchSignals(QtCore.QObject):
+    found = Signal(int, object) # search id, {"pno", "label", "quads"}
+    finished = Signal(int) # search id
+    error = Signal(int, str) # search id, error message
+
+
+class SearchWorker(QtCore.QRunnable):
+    """Search the text page by page in its own handle of the document
+
+    The page `start` and its neighbours are searched first, then the other pages in order.
+    Only `pages` are searched if given. The hits of each page are emitted as soon as found.
+    `error` is emitted in place of `finished` if the document cannot be opened.
+    """
+    def __init__(self, search_id: int, filepath: str, text: str, start: int = 0, pages: list[int] | None = None):
+        super().__init__()
+        self.search_id = search_id
+        self.filepath = filepath
+        self.text = text
+        self.start = start
+        self.pages = pages
+        self.signals = SearchSignals()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @staticmethod
+    def pageOrder(start: int, page_count: int) -> list[int]:
+        first = [pno for pno in (start, start + 1, start - 1) if 0 <= pno < page_count]
+        return first + [pno for pno in range(page_count) if pno not in first]
+
+    def run(self):
+        try:
+            doc = pymupdf.Document(self.filepath)
+        except Exception as e:
+            self.signals.error.emit(self.search_id, str(e))
+            return
+
+        for page_result in self.searchPages(doc, self.text, self.start, self.pages, self._cancelled):
+            self.signals.found.emit(self.search_id, page_result)
+
+        doc.close()
+        self.signals.finished.emit(self.search_id)
+
+    @classmethod
+    def searchPages(cls, doc: pymupdf.Document, text: str, start: int = 0, pages: list[int] | None = None,
+                    cancelled: threading.Event | None = None) -> Iterator[dict]:
+        """Yield {"pno", "label", "quads"} for each page of the document where the text is found"""
+        order = cls.pageOrder(start, doc.page_count)
+        if pages is not None:
+            pages = set(pages)
+            order = [pno for pno in order if pno in pages]
+
+        for pno in order:
+            if cancelled is not None and cancelled.is_set():
+                break
+
+            page = doc.load_page(pno)
+            quads: list = page.search_for(text, quads=True)
+
+            if len(quads) > 0:
+                yield {"pno" : pno, "label": page.get_label(), "quads" : quads}
+
+
 class SearchModel(QtGui.QStandardItemModel):
+    """Search results, one row per page in page order, filled as the pages are searched
+
+    The pages of an indexed document are looked up in the text index first.
+    """
     sigTextFound = Signal(str)
+    sigPageFound = Signal(int, object) # pno, quads
 
     def __init__(self, parent=None):
         super().__init__(parent)
 
         self._search_results: dict[int, list] = {}
+        self._found_pages: list[int] = [] # sorted pno of the rows
+        self._found_count = 0
+        self._text = ""
+        self._search_id = 0
+        self._worker: SearchWorker = None
+        self._document_id: int | None = None
 
-    def setDocument(self, doc: pymupdf.Document):
+    def setDocument(self, doc: pymupdf.Document, document_id: int | None = None):
+        self.cancel()
         self._document = doc
+        self._document_id = document_id
+        self._text = ""
+
+    def searchText(self) -> str:
+        return self._text
+
+    def isSearching(self) -> bool:
+        return self._worker is not None
 
-    def searchFor(self, text: str):
+    def cancel(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+
+    def searchFor(self, text: str, start: int = 0):
+        """Search the text in a worker, from the page `start`, the running search is cancelled"""
+        self.cancel()
         self.clear()
         self._search_results.clear()
-        
+        self._found_pages.clear()
+        self._text = text
+        self._search_id += 1
         self._found_count = 0
 
-        if text != "":
-            root_item = self.invisibleRootItem()
-            page: pymupdf.Page
-            for page in self._document:
-                quads: list = page.search_for(text, quads=True)
-                
-                if len(quads) > 0:
-                    self._found_count = self._found_count + len(quads)
-                    page_result = {"pno" : page.number, "label": page.get_label(), "quads" : quads}
-                    self._search_results.update({page.number: quads})
-                    search_item = SearchItem(page_result)
-                    root_item.appendRow(search_item)
-        
+        pages = None
+        if text != "" and self._document_id is not None:
+            pages = text_index.indexedPages(self._document_id, self._document.name, text)
+
+        if text == "" or pages == []:
+            self.sigTextFound.emit(f"Hits: {self._found_count}")
+            return
+
+        # A document without file (e.g. opened from memory) cannot be reopened by the worker
+        if not self._document.name or not Path(self._document.name).is_file():
+            self._searchOpenDocument(self._search_id, text, start, pages)
+            return
+
+        self._worker = SearchWorker(self._search_id, self._document.name, text, start, pages)
+        self._worker.signals.found.connect(self._onPageFound)
+        self._worker.signals.finished.connect(self._onFinished)
+        self._worker.signals.error.connect(self._onError)
+        QtCore.QThreadPool.globalInstance().start(self._worker)
+
+    def _searchOpenDocument(self, search_id: int, text: str, start: int = 0, pages: list[int] | None = None):
+        """Search the document opened by the viewer, in the GUI thread"""
+        try:
+            for page_result in SearchWorker.searchPages(self._document, text, start, pages):
+                self._onPageFound(search_id, page_result)
+        except Exception as e:
+            logger.error(f"Cannot search document - Error: {e}")
+        self._onFinished(search_id)
+
+    @Slot(int, object)
+    def _onPageFound(self, search_id: int, page_result: dict):
+        if search_id != self._search_id:
+            return
+
+        pno = page_result["pno"]
+        quads = page_result["quads"]
+        row = bisect.bisect_left(self._found_pages, pno)
+        self._found_pages.insert(row, pno)
+        self._search_results[pno] = quads
+        self._found_count = self._found_count + len(quads)
+        self.insertRow(row, SearchItem(page_result))
+
+        self.sigPageFound.emit(pno, quads)
+        self.sigTextFound.emit(f"Hits: {self._found_count}...")
+
+    @Slot(int)
+    def _onFinished(self, search_id: int):
+        if search_id != self._search_id:
+            return
+
+        self._worker = None
         self.sigTextFound.emit(f"Hits: {self._found_count}")
 
+    @Slot(int, str)
+    def _onError(self, search_id: int, error: str):
+        if search_id != self._search_id or self._worker is None:
+            return
+
+        logger.warning(f"Cannot open document for search, searching the opened document - Error: {error}")
+        worker, self._worker = self._worker, None
+        self._searchOpenDocument(search_id, self._text, worker.start, worker.pages)
+
     def foundCount(self):
         return self._found_count
     
@@ -518,6 +812,96 @@ class BaseAnnotation:
     
 
 
+class PageItem(QtWidgets.QGraphicsItem):
+    """Page of the document laid out at the zoom factor of the view
+
+    The item has the size of the page even when nothing is rendered, a blank sheet
+    is drawn until a pixmap is set. The pixmap is stretched to the page size.
+    At high zoom, the page is drawn by tiles {(column, row): (rect, pixmap)} over the pixmap.
+    """
+    def __init__(self, pno: int, size: QtCore.QSizeF, rotation: int = 0, parent=None):
+        super().__init__(parent)
+        self.pno = pno
+        self.rotation = rotation # page rotation of the document
+        self._size = size # page size in points
+        self._zoom: float = 1.0
+        self._pixmap: QtGui.QPixmap = None
+        self._rendered_zoom: float = None
+        self._tiles: dict[tuple[int, int], tuple[QtCore.QRectF, QtGui.QPixmap]] = {}
+        self._wanted_tiles: set[tuple[int, int]] = set()
+
+        self.setZValue(-1)
+
+    def pageSize(self) -> QtCore.QSizeF:
+        return self._size
+
+    def zoom(self) -> float:
+        return self._zoom
+
+    def setZoom(self, zoom: float):
+        if zoom != self._zoom:
+            self.prepareGeometryChange()
+            self._zoom = zoom
+            self.clearTiles()
+
+    def renderedZoom(self) -> float | None:
+        """Zoom factor of the pixmap, None if there is no pixmap or it is outdated"""
+        return self._rendered_zoom
+
+    def pixmap(self) -> QtGui.QPixmap | None:
+        return self._pixmap
+
+    def setPixmap(self, pixmap: QtGui.QPixmap, zoom: float):
+        self._pixmap = pixmap
+        self._rendered_zoom = zoom
+        self.update()
+
+    def clearPixmap(self):
+        self._pixmap = None
+        self._rendered_zoom = None
+        self.clearTiles()
+        self.update()
+
+    def hasTile(self, tile: tuple[int, int]) -> bool:
+        return tile in self._tiles
+
+    def wantsTile(self, tile: tuple[int, int]) -> bool:
+        return tile in self._wanted_tiles and tile not in self._tiles
+
+    def setTile(self, tile: tuple[int, int], rect: QtCore.QRectF, pixmap: QtGui.QPixmap):
+        self._tiles[tile] = (rect, pixmap)
+        self.update(rect)
+
+    def retainTiles(self, tiles: list[tuple[int, int]]):
+        """Keep the tiles in the list and release the others"""
+        self._wanted_tiles = set(tiles)
+        for tile in [tile for tile in self._tiles if tile not in self._wanted_tiles]:
+            del self._tiles[tile]
+
+    def clearTiles(self):
+        self._tiles.clear()
+        self._wanted_tiles.clear()
+
+    def invalidate(self):
+        """Mark the pixmap as outdated, it is drawn until replaced, release the tiles"""
+        self._rendered_zoom = None
+        self.clearTiles()
+
+    def boundingRect(self) -> QtCore.QRectF:
+        return QtCore.QRectF(0, 0, self._size.width() * self._zoom, self._size.height() * self._zoom)
+
+    def paint(self, painter: QtGui.QPainter, option, widget=None):
+        rect = self.boundingRect()
+        painter.fillRect(rect, QtCore.Qt.GlobalColor.white)
+
+        if self._pixmap is not None:
+            painter.setRenderHint(QtGui.QPainter.RenderHint.SmoothPixmapTransform)
+            painter.drawPixmap(rect, self._pixmap, QtCore.QRectF(self._pixmap.rect()))
+
+        for tile_rect, tile in self._tiles.values():
+            painter.drawPixmap(tile_rect, tile, QtCore.QRectF(tile.rect()))
+
+
 class RectItem(QtWidgets.QGraphicsRectItem, BaseAnnotation):
     def __init__(self, dbid = None, parent = None):
         QtWidgets.QGraphicsRectItem.__init__(self, parent)
@@ -572,3 +956,32 @@ class LinkBox(QtWidgets.QGraphicsObject):
         event.accept()
     
 
+
+
+class HighlightItem(QtWidgets.QGraphicsItem):
+    """Search hits of a page drawn over the page pixmap
+
+    The quads are in page points, the item is scaled to the zoom factor (zfactor = 1).
+    """
+    def __init__(self, quads: list[pymupdf.Quad], pno: int, parent=None):
+        super().__init__(parent)
+        self.pno = pno
+        self.zfactor = 1.0
+        self.color = QtGui.QColor(255, 235, 0)
+
+        self.path = QtGui.QPainterPath()
+        for quad in quads:
+            self.path.addPolygon(QtGui.QPolygonF([QtCore.QPointF(quad.ul.x, quad.ul.y),
+                                                  QtCore.QPointF(quad.ur.x, quad.ur.y),
+                                                  QtCore.QPointF(quad.lr.x, quad.lr.y),
+                                                  QtCore.QPointF(quad.ll.x, quad.ll.y)]))
+            self.path.closeSubpath()
+
+        self.setAcceptedMouseButtons(QtCore.Qt.MouseButton.NoButton)
+
+    def boundingRect(self):
+        return self.path.boundingRect()
+
+    def paint(self, painter, option, widget):
+        painter.setCompositionMode(QtGui.QPainter.CompositionMode.CompositionMode_Multiply)
+        painter.fillPath(self.path, self.color)
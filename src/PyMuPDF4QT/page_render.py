@@ -0,0 +1,43 @@
+"""Render PDF pages in the processes of a pool
+
+MuPDF objects are not thread-safe and rendering holds the GIL, so the pages
+are rendered in other processes. Each process keeps its own handles of the
+last opened documents.
+
+This module is imported by the pool processes, keep it free of Qt imports.
+"""
+import pymupdf
+
+from collections import OrderedDict
+
+_documents: OrderedDict = OrderedDict()
+
+
+def documentHandle(document_key: tuple, filepath: str, max_handles: int = 4) -> pymupdf.Document:
+    """Return the handle of the document owned by the calling process"""
+    doc = _documents.get(document_key)
+
+    if doc is None:
+        doc = pymupdf.Document(filepath)
+        _documents[document_key] = doc
+        while len(_documents) > max_handles:
+            _, old = _documents.popitem(last=False)
+            old.close()
+    else:
+        _documents.move_to_end(document_key)
+
+    return doc
+
+
+def renderPage(document_key: tuple, filepath: str, pno: int, scale: float,
+               clip: tuple | None = None) -> tuple[int, int, int, int, bytes]:
+    """Render the page at scale (zoom x dpr)
+
+    clip: area of the page (x0, y0, x1, y1) in points, the whole page if None.
+
+    Return the raster as (width, height, stride, components, samples).
+    """
+    doc = documentHandle(document_key, filepath)
+    page = doc.load_page(pno)
+    fitzpix: pymupdf.Pixmap = page.get_pixmap(alpha=0, matrix=pymupdf.Matrix(scale, scale), clip=clip)
+    return fitzpix.width, fitzpix.height, fitzpix.stride, fitzpix.n, fitzpix.samples
@@ -1,17 +1,24 @@
 import json
+import math
+import bisect
 import pymupdf
 import logging
 
 from enum import Enum
+from pathlib import Path
 
 from qtpy import QtWidgets, QtGui, QtCore, Signal, Slot
 from documentviewer.viewerwidget import ViewerWidget
 
 from PyMuPDF4QT.QtPymuPdf import (OutlineModel, OutlineItem, PageNavigator, 
                                   ZoomSelector, SearchModel, SearchItem, MetaDataWidget, 
-                                  TextSelection, RectItem, LinkBox)
+                                  TextSelection, RectItem, LinkBox, PageItem, HighlightItem)
 from PyMuPDF4QT.annotation import AnnotationModel, AnnotationPane
+from PyMuPDF4QT.render_cache import pixmapCache, DisplayListCache
+from PyMuPDF4QT.render_worker import PageRenderer, RenderRequest, toQPixmap
+from PyMuPDF4QT.text_index import TextIndexWorker
 from qt_theme_manager import theme_icon_manager
+from utilities import config as mconf
 
 
 SUPPORTED_FORMART = (".pdf", ".epub")
@@ -56,8 +63,10 @@ class PdfView(QtWidgets.QGraphicsView):
         self.a0 = QtCore.QPointF()
         self.b1 = QtCore.QPointF()
 
-        self.graphic_items = {} # dict of QGraphicItem > {pno:{id(rectItem):rectItem}}
-        self.link_boxes = {} # {pno:[RectItems]}
+        # Items drawn over the pages, children of their PageItem
+        self.graphic_items = {} # annotations {pno:{uid:RectItem}}
+        self.link_boxes = {} # {pno:[LinkBox]}
+        self.highlight_items = {} # {pno:HighlightItem} search hits drawn over the pages
         self._current_graphic_item = None
 
         self.setMouseTracking(True)
@@ -69,31 +78,337 @@ class PdfView(QtWidgets.QGraphicsView):
         self.page_count: int = 0
         self.page_dlist: pymupdf.DisplayList = None
  
-        self.annotations = {} # document native annotations
+        self.annotations = {} # search hits {pno:[quads]}
+
+        # Pages are laid out from their page rect, only rendered pages hold a pixmap
+        self.page_items: list[PageItem] = []
+        self._page_tops: list[float] = [] # y of each page in the scene, sorted
+        self._rendered: set[int] = set() # pno of the pages holding a pixmap
+        self._continuous: bool = mconf.settings.value("PDF_CONTINUOUS_SCROLL", False, bool)
+        self._tracking_scroll = False # current page changed by scrolling
+        self._scrolling_to_page = False # current page changed by navigation
+        self.page_spacing = 10
+        self.render_margin = 0.5 # viewport heights rendered above and below the viewport
+        self._kept_pages = range(0) # continuous mode: pages rendered around the viewport
+        self.tile_size = 512 # scene unit
+        self.tile_threshold = 4096 * 4096 # device pixels of a page above which it is rendered by tiles
+        self.preview_factor = 0.25 # zoom of the first pass relative to the page zoom
+        self.preview_threshold = 1024 * 1024 # device pixels of a page above which a first pass is shown
+
+        # Background rendering of the pages likely displayed next
+        self.page_renderer = PageRenderer(mconf.settings.value("PDF_RENDER_PROCESSES", 2, int), self)
+        self.page_renderer.rendered.connect(self.onPrefetched)
 
         self.doc_scene = QtWidgets.QGraphicsScene(self)
         self.setScene(self.doc_scene)
 
-        self.page_pixmap_item = self.createPixmapItem()
-        self.doc_scene.addItem(self.page_pixmap_item)
-
         self.setBackgroundBrush(QtGui.QColor(242, 242, 242))
         self.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing)
         self.setRenderHint(QtGui.QPainter.RenderHint.TextAntialiasing)
 
-        self.doc_scene.setSceneRect(self.page_pixmap_item.boundingRect()) 
         self.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter | QtCore.Qt.AlignmentFlag.AlignHCenter)
-    
+
+        # Coalesce the scroll events of an event loop iteration
+        self._visible_pages_timer = QtCore.QTimer(self)
+        self._visible_pages_timer.setSingleShot(True)
+        self._visible_pages_timer.setInterval(0)
+        self._visible_pages_timer.timeout.connect(self.updateVisiblePages)
+        self.verticalScrollBar().valueChanged.connect(self.onScrolled)
+        self.horizontalScrollBar().valueChanged.connect(self._visible_pages_timer.start)
+
+        # Full quality render once the zoom settles, the pixmaps are stretched meanwhile
+        self._zoom_timer = QtCore.QTimer(self)
+        self._zoom_timer.setSingleShot(True)
+        self._zoom_timer.setInterval(150)
+        self._zoom_timer.timeout.connect(self.refresh)
+
     def showEvent(self, event: QtGui.QShowEvent | None) -> None:
         return super().showEvent(event)
-    
+
+    def resizeEvent(self, event: QtGui.QResizeEvent):
+        super().resizeEvent(event)
+        self._visible_pages_timer.start()
+
     def setDocument(self, doc: pymupdf.Document):
         self.fitzdoc: pymupdf.Document = doc
-        self._page_navigator.setDocument(self.fitzdoc)
         self.page_count = len(self.fitzdoc)
-        self.dlist: list[pymupdf.DisplayList] = [None] * self.page_count
+        self.dlist = DisplayListCache(self.fitzdoc, mconf.settings.value("PDF_DISPLAYLIST_CACHE_SIZE", 32, int))
+        self.pixmap_cache = pixmapCache()
+        self._document_key = self.documentKey(self.fitzdoc)
+        self.createPageItems()
+        self._page_navigator.setDocument(self.fitzdoc)
         self._page_navigator.setCurrentPno(0)
 
+    def documentKey(self, doc: pymupdf.Document) -> tuple:
+        """Identify the document in the pixmap cache, a modified file is a new document"""
+        try:
+            return (doc.name, Path(doc.name).stat().st_mtime_ns)
+        except OSError:
+            return (id(doc),)
+
+    def createPageItems(self):
+        """Create an item per page from the page rects, nothing is rendered"""
+        for item in self.page_items:
+            self.doc_scene.removeItem(item)
+        self.page_items.clear()
+        self._rendered.clear()
+        self.graphic_items.clear()
+        self.link_boxes.clear()
+        self.highlight_items.clear()
+
+        for pno in range(self.page_count):
+            item = PageItem(pno, *self.pageGeometry(pno))
+            self.doc_scene.addItem(item)
+            self.page_items.append(item)
+
+        self.layoutPages()
+
+    def pageGeometry(self, pno: int) -> tuple[QtCore.QSizeF, int]:
+        """Return the size (rotated, like page.rect) and the rotation of a page
+
+        The pages of a PDF are not loaded: the CropBox and /Rotate are read from the page tree.
+        """
+        if not self.fitzdoc.is_pdf:
+            page = self.fitzdoc[pno]
+            return QtCore.QSizeF(page.rect.width, page.rect.height), page.rotation
+
+        rect = self.fitzdoc.page_cropbox(pno)
+
+        # /Rotate is inheritable from the page tree nodes
+        rotation = 0
+        xref = self.fitzdoc.page_xref(pno)
+        while xref:
+            kind, value = self.fitzdoc.xref_get_key(xref, "Rotate")
+            if kind == "int":
+                rotation = int(value)
+                break
+            kind, value = self.fitzdoc.xref_get_key(xref, "Parent")
+            xref = int(value.split()[0]) if kind == "xref" else 0
+        rotation = rotation % 360 if rotation % 90 == 0 else 0
+
+        if rotation in (90, 270):
+            return QtCore.QSizeF(rect.height, rect.width), rotation
+        return QtCore.QSizeF(rect.width, rect.height), rotation
+
+    def layoutPages(self):
+        """Place the pages at the current zoom factor
+
+        Continuous mode: the pages are stacked vertically and centered.
+        Single page mode: the pages are at the origin, only the current page is visible.
+        """
+        zoom = self._zoom_selector.zoomFactor
+        current = self.pageNavigator().currentPno()
+        width = max((item.pageSize().width() for item in self.page_items), default=0) * zoom
+        y = 0.0
+
+        self._page_tops.clear()
+        for item in self.page_items:
+            item.setZoom(zoom)
+            if self._continuous:
+                rect = item.boundingRect()
+                item.setPos((width - rect.width()) / 2, y)
+                item.setVisible(True)
+                y += rect.height() + self.page_spacing
+            else:
+                item.setPos(0, 0)
+                item.setVisible(item.pno == current)
+            self._page_tops.append(item.y())
+
+        if self._continuous:
+            self.doc_scene.setSceneRect(QtCore.QRectF(0, 0, width, max(0.0, y - self.page_spacing)))
+            self.transformGraphicItems(self._kept_pages)
+        else:
+            self.transformGraphicItems([current])
+
+    def isContinuous(self) -> bool:
+        return self._continuous
+
+    @Slot(bool)
+    def setContinuous(self, enabled: bool):
+        """Switch between continuous scrolling and single page mode"""
+        if enabled == self._continuous:
+            return
+
+        self._continuous = enabled
+        mconf.settings.setValue("PDF_CONTINUOUS_SCROLL", enabled)
+
+        for pno in self._rendered:
+            self.page_items[pno].clearPixmap()
+        self._rendered.clear()
+
+        if not self.page_items:
+            return
+
+        self.layoutPages()
+        self.renderPage(self.pageNavigator().currentPno())
+
+    def pageItem(self, pno: int) -> PageItem | None:
+        if isinstance(pno, int) and 0 <= pno < len(self.page_items):
+            return self.page_items[pno]
+
+    def pageAt(self, y: float) -> int:
+        """Return the page at the scene ordinate y"""
+        if not self._continuous:
+            return self.pageNavigator().currentPno()
+
+        pno = bisect.bisect_right(self._page_tops, y) - 1
+        return min(max(pno, 0), self.page_count - 1)
+
+    def scrollToPage(self, pno: int, y: float = 0.0):
+        """Scroll the ordinate y of the page (in scene unit) to the top of the viewport"""
+        page_item = self.pageItem(pno)
+        if page_item is None:
+            return
+
+        top = page_item.mapToScene(QtCore.QPointF(0, y))
+        scrollbar = self.verticalScrollBar()
+
+        self._scrolling_to_page = True
+        scrollbar.setValue(scrollbar.value() + self.mapFromScene(top).y())
+        self._scrolling_to_page = False
+
+    @Slot(int)
+    def onScrolled(self, value: int):
+        if not self.page_items:
+            return
+
+        if self._continuous and not self._scrolling_to_page:
+            top = self.mapToScene(QtCore.QPoint(0, 0)).y() + self.page_spacing
+            pno = self.pageAt(top)
+            if pno != self.pageNavigator().currentPno():
+                self._tracking_scroll = True
+                self.pageNavigator().setCurrentPno(pno)
+                self._tracking_scroll = False
+
+        self._visible_pages_timer.start()
+
+    def viewportSceneRect(self) -> QtCore.QRectF:
+        return self.mapToScene(self.viewport().rect()).boundingRect()
+
+    @Slot()
+    def updateVisiblePages(self):
+        """Render the pages intersecting the viewport plus a margin, release the others
+
+        Single page mode: update the tiles of the current page.
+        """
+        if not self.page_items or self._zoom_timer.isActive():
+            return
+
+        rect = self.viewportSceneRect()
+
+        if not self._continuous:
+            page_item = self.pageItem(self.pageNavigator().currentPno())
+            if page_item is not None and self.isTiled(page_item):
+                self.prefetch([], self.updateTiles(page_item, rect))
+            return
+
+        margin = rect.height() * self.render_margin
+        first = self.pageAt(rect.top() - margin)
+        last = self.pageAt(rect.bottom() + margin)
+
+        for pno in [pno for pno in self._rendered if not first <= pno <= last]:
+            self.page_items[pno].clearPixmap()
+            self._rendered.discard(pno)
+
+        self._kept_pages = range(first, last + 1)
+
+        # Visible pages are rendered now, the margin in the background
+        visible = range(self.pageAt(rect.top()), self.pageAt(rect.bottom()) + 1)
+        requests = []
+        for pno in visible:
+            page_item = self.page_items[pno]
+            if self.isTiled(page_item):
+                requests.extend(self.updateTiles(page_item, rect))
+            elif page_item.renderedZoom() != page_item.zoom():
+                request = self.renderPageProgressive(page_item)
+                if request is not None:
+                    requests.append(request)
+            self.renderLinks(pno)
+            self.renderHighlights(pno)
+
+        margin_pages = [pno for pno in self._kept_pages if pno not in visible]
+        for pno in margin_pages:
+            page_item = self.page_items[pno]
+            if self.isTiled(page_item):
+                requests.extend(self.updateTiles(page_item, rect))
+            elif page_item.renderedZoom() != page_item.zoom():
+                self.setCachedPixmap(page_item)
+            self.renderLinks(pno)
+            self.renderHighlights(pno)
+
+        self.transformGraphicItems(self._kept_pages)
+        self.prefetch([*margin_pages, last + 1, first - 1, *self.searchHitsAround(visible.start)], requests)
+
+    def isTiled(self, page_item: PageItem) -> bool:
+        """Return True if the page is too large at its zoom to be rendered at once"""
+        size = page_item.pageSize() * (page_item.zoom() * self.dpr)
+        return size.width() * size.height() > self.tile_threshold
+
+    def tileRect(self, page_item: PageItem, tile: tuple[int, int]) -> QtCore.QRectF:
+        column, row = tile
+        rect = QtCore.QRectF(column * self.tile_size, row * self.tile_size, self.tile_size, self.tile_size)
+        return rect.intersected(page_item.boundingRect())
+
+    def tileClip(self, page_item: PageItem, tile: tuple[int, int]) -> tuple:
+        """Return the area of the tile in page points"""
+        rect = self.tileRect(page_item, tile)
+        zoom = page_item.zoom()
+        return (rect.left() / zoom, rect.top() / zoom, rect.right() / zoom, rect.bottom() / zoom)
+
+    def updateTiles(self, page_item: PageItem, view_rect: QtCore.QRectF) -> list[RenderRequest]:
+        """Show the tiles of the page in the viewport and one tile around
+
+        Tiles are taken by distance to the center of the viewport. Tiles in the viewport
+        not in the cache are rendered now, the requests of the others are returned.
+        """
+        size = self.tile_size
+        local = page_item.mapRectFromScene(view_rect)
+        keep = local.adjusted(-size, -size, size, size).intersected(page_item.boundingRect())
+
+        if keep.isEmpty():
+            page_item.retainTiles([])
+            return []
+
+        columns = range(int(keep.left() // size), math.ceil(keep.right() / size))
+        rows = range(int(keep.top() // size), math.ceil(keep.bottom() / size))
+        center = local.center()
+
+        def distance(tile):
+            offset = self.tileRect(page_item, tile).center() - center
+            return offset.x() ** 2 + offset.y() ** 2
+
+        tiles = sorted(((column, row) for row in rows for column in columns), key=distance)
+        page_item.retainTiles(tiles)
+
+        requests = []
+        base_key = self.pixmapKey(page_item)
+        for tile in tiles:
+            if page_item.hasTile(tile):
+                continue
+
+            key = base_key + (tile,)
+            pixmap = self.pixmap_cache.get(key)
+            rect = self.tileRect(page_item, tile)
+
+            if pixmap is None and rect.intersects(local):
+                pixmap = self.renderTile(page_item, tile)
+                self.pixmap_cache.insert(key, pixmap)
+
+            if pixmap is not None:
+                page_item.setTile(tile, rect, pixmap)
+            else:
+                requests.append(RenderRequest(key, page_item.pno, page_item.zoom(), self.tileClip(page_item, tile)))
+        self._rendered.add(page_item.pno)
+
+        return requests
+
+    def renderTile(self, page_item: PageItem, tile: tuple[int, int]) -> QtGui.QPixmap:
+        zf = page_item.zoom() * self.dpr
+        fitzpix = self.displayList(page_item.pno).get_pixmap(alpha=0,
+                                                             matrix=pymupdf.Matrix(zf, zf),
+                                                             clip=self.tileClip(page_item, tile))
+        return self.toQPixmap(fitzpix)
+
     def pageNavigator(self) -> PageNavigator:
         return self._page_navigator
     
@@ -107,33 +422,57 @@ class PdfView(QtWidgets.QGraphicsView):
 
         content_margins = self.contentsMargins()
 
-        page_width = self.dlist[self.pageNavigator().currentPno()].rect.width
-        page_height = self.dlist[self.pageNavigator().currentPno()].rect.height
+        page_size = self.page_items[self.pageNavigator().currentPno()].pageSize()
+        page_width = page_size.width()
+        page_height = page_size.height()
         
         if mode == ZoomSelector.ZoomMode.FitToWidth:
             self._zoom_selector.zoomFactor = (view_width - content_margins.left() - content_margins.right() - 20) / page_width
-            self.renderPage(self.pageNavigator().currentPno())
+            self.applyZoom()
         elif mode == ZoomSelector.ZoomMode.FitInView:
             self._zoom_selector.zoomFactor = (view_height - content_margins.bottom() - content_margins.top() - 20) / page_height
-            self.renderPage(self.pageNavigator().currentPno())
+            self.applyZoom()
     
     @Slot()
     def zoomIn(self):
         self._zoom_selector.zoomIn()
-        self.renderPage(self.pageNavigator().currentPno())
+        self.applyZoom()
     
     @Slot()
     def zoomOut(self):
         self._zoom_selector.zoomOut()
-        self.renderPage(self.pageNavigator().currentPno())
+        self.applyZoom()
+
+    def applyZoom(self):
+        """Lay out the pages at the zoom factor, keep the position in the current page
+
+        The current pixmaps are stretched at once, the pages are rendered again
+        when the zoom has not changed for a while.
+        """
+        pno = self.pageNavigator().currentPno()
+        page_item = self.pageItem(pno)
+        if page_item is None:
+            return
+
+        self._zoom_timer.start()
+
+        if not self._continuous:
+            page_item.setZoom(self._zoom_selector.zoomFactor)
+            self.transformGraphicItems([pno])
+            self.doc_scene.setSceneRect(page_item.sceneBoundingRect())
+            self.centerOn(page_item)
+            return
+
+        old_zoom = page_item.zoom()
+        y = page_item.mapFromScene(self.mapToScene(QtCore.QPoint(0, 0))).y()
+
+        self.layoutPages()
+        self.scrollToPage(pno, y * page_item.zoom() / old_zoom)
 
     def toQPixmap(self, fitzpix:pymupdf.Pixmap) -> QtGui.QPixmap:
         """Convert pymupdf.Pixmap to QtGui.QPixmap"""
-        fitzpix_bytes = fitzpix.tobytes()
-        pixmap = QtGui.QPixmap()
-        r = pixmap.loadFromData(fitzpix_bytes)
-        pixmap.setDevicePixelRatio(self.dpr)
-        if not r:
+        pixmap = toQPixmap(fitzpix, self.dpr)
+        if pixmap.isNull():
             logger.error(f"Cannot load pixmap from data")
         return pixmap
     
@@ -154,9 +493,92 @@ class PdfView(QtWidgets.QGraphicsView):
         return fitzpix
     
     def setAnnotations(self, annotations: dict):
+        """Set the search hits, drawn over the pages without rendering them again"""
         self.annotations.clear()
         self.annotations.update(annotations)
 
+        for item in self.highlight_items.values():
+            self.doc_scene.removeItem(item)
+        self.highlight_items.clear()
+
+        for pno in self._rendered:
+            self.renderHighlights(pno)
+
+    @Slot(int, object)
+    def addAnnotations(self, pno: int, quads: list):
+        """Add the search hits of a page"""
+        self.annotations[pno] = quads
+
+        if pno in self._rendered:
+            self.renderHighlights(pno)
+
+    def searchHitsAround(self, pno: int, count: int = 1) -> list[int]:
+        """Return the pages of the `count` search hits after and before the page"""
+        hits = sorted(self.annotations)
+        after = bisect.bisect_right(hits, pno)
+        before = bisect.bisect_left(hits, pno)
+        return [*hits[after:after + count], *hits[max(0, before - count):before]]
+
+    def pixmapKey(self, page_item: PageItem) -> tuple:
+        return (self._document_key, page_item.pno, page_item.zoom(), page_item.rotation, self.dpr)
+
+    def setCachedPixmap(self, page_item: PageItem) -> bool:
+        """Show the pixmap of the page from the cache, return False if not cached"""
+        pixmap = self.pixmap_cache.get(self.pixmapKey(page_item))
+
+        if pixmap is None:
+            return False
+
+        page_item.setPixmap(pixmap, page_item.zoom())
+        self._rendered.add(page_item.pno)
+        return True
+
+    def prefetch(self, pnos: list[int], tile_requests: list[RenderRequest] | None = None):
+        """Render the requests (displayed pages or tiles), then the pages at the current zoom in the background
+
+        The rendered pages are inserted into the pixmap cache. The previous prefetch is cancelled.
+        Tiled pages are not prefetched.
+        """
+        self.page_renderer.cancel()
+
+        if not Path(self.fitzdoc.name).is_file():
+            return
+
+        zoom = self._zoom_selector.zoomFactor
+        requests = list(tile_requests) if tile_requests else []
+        for pno in dict.fromkeys(pnos):
+            page_item = self.pageItem(pno)
+            if page_item is None or page_item.zoom() != zoom or self.isTiled(page_item):
+                continue
+
+            key = self.pixmapKey(page_item)
+            if key not in self.pixmap_cache:
+                requests.append(RenderRequest(key, pno, zoom))
+
+        if requests:
+            self.page_renderer.render(self._document_key, self.fitzdoc.name, requests, self.dpr)
+
+    @Slot(object, QtGui.QPixmap)
+    def onPrefetched(self, key: tuple, pixmap: QtGui.QPixmap):
+        if key[0] != self._document_key:
+            return
+
+        self.pixmap_cache.insert(key, pixmap)
+        page_item = self.pageItem(key[1])
+
+        # Tile waiting for its pixmap
+        if len(key) > 5:
+            tile = key[-1]
+            if page_item.wantsTile(tile) and key[:-1] == self.pixmapKey(page_item):
+                page_item.setTile(tile, self.tileRect(page_item, tile), pixmap)
+            return
+
+        # Displayed or margin page waiting for its pixmap
+        if (page_item.isVisible() and (not self._continuous or page_item.pno in self._kept_pages)
+                and page_item.renderedZoom() != page_item.zoom() and key == self.pixmapKey(page_item)):
+            page_item.setPixmap(pixmap, page_item.zoom())
+            self._rendered.add(page_item.pno)
+
     def renderLinks(self, pno: int):
         boxes: list = self.link_boxes.get(pno)
 
@@ -168,58 +590,149 @@ class PdfView(QtWidgets.QGraphicsView):
                 linkbox = LinkBox(link, pno, self.zoomSelector().zoomFactor)
                 linkbox.sigJumpTo.connect(self.onLinkClicked)
                 linkbox.sigToUri.connect(self.onUriClicked)
-                self.doc_scene.addItem(linkbox)
+                self.placeGraphicItem(linkbox)
                 boxes.append(linkbox)
             self.link_boxes[pno] = boxes
-    
-    def renderPage(self, pno: int = 0):
+
+    def renderHighlights(self, pno: int):
+        if pno in self.highlight_items or pno not in self.annotations:
+            return
+
+        item = HighlightItem(self.annotations[pno], pno)
+        self.placeGraphicItem(item)
+        self.highlight_items[pno] = item
+
+    def displayList(self, pno: int) -> pymupdf.DisplayList:
+        return self.dlist.displayList(pno)
+
+    def renderPagePixmap(self, page_item: PageItem):
         """
-            Render the image
+            Render the image of the page at the zoom factor of the item
             Convert the pymupdf Displaylist to QPixmap
         """
-        page_dlist: pymupdf.DisplayList = self.dlist[pno]
-
-        if not page_dlist :  # create if not yet there
-            fitzpage = self.fitzdoc.load_page(pno)
-            self.dlist[pno] = fitzpage.get_displaylist()
-            page_dlist = self.dlist[pno]
-
-        # Remove annotations
-        page = self.fitzdoc.load_page(pno)
-        self.fitzdoc.xref_set_key(page.xref, "Annots", "null")    
-
-        add_annotations = self.annotations.get(pno)
-        if add_annotations is not None:
-            quads: pymupdf.Quad
-            for quads in add_annotations:
-                page.add_highlight_annot(quads)
-            page_dlist = page.get_displaylist()
-
-        fitzpix = self.createFitzpix(page_dlist, self._zoom_selector.zoomFactor)
-        pixmap = self.toQPixmap(fitzpix)
-        
-        self.page_pixmap_item.setPixmap(pixmap)
+        pno = page_item.pno
+        key = self.pixmapKey(page_item)
+        pixmap = self.pixmap_cache.get(key)
 
-        self.renderLinks(pno)
+        if pixmap is None:
+            page_dlist: pymupdf.DisplayList = self.displayList(pno)
+            fitzpix = self.createFitzpix(page_dlist, page_item.zoom())
+            pixmap = self.toQPixmap(fitzpix)
+            self.pixmap_cache.insert(key, pixmap)
 
-        # Show/Hide/Transform graphic annotation items
-        items = self.doc_scene.items()
-        for item in items:
-            if isinstance(item, QtWidgets.QGraphicsPixmapItem):
-                continue
-            elif isinstance(item, QtWidgets.QGraphicsLineItem):
-                continue
-            elif item.pno == pno:
-                item.setVisible(True)
-                item.setScale(self.zoomSelector().zoomFactor / item.zfactor)
-            else:
-                item.setVisible(False)
+        page_item.setPixmap(pixmap, page_item.zoom())
+        self._rendered.add(pno)
+
+    def renderPageProgressive(self, page_item: PageItem) -> RenderRequest | None:
+        """Show the page from the cache, or render it in the background
+
+        A page shown for the first time gets a fast low resolution pass first,
+        a page already shown at another zoom is stretched until rendered.
+        Return the request of the full quality render, None if the page is rendered.
+        """
+        if self.setCachedPixmap(page_item):
+            return None
+
+        size = page_item.pageSize() * (page_item.zoom() * self.dpr)
+        large = size.width() * size.height() > self.preview_threshold
+
+        if not Path(self.fitzdoc.name).is_file() or (page_item.pixmap() is None and not large):
+            self.renderPagePixmap(page_item)
+            return None
+
+        if page_item.pixmap() is None:
+            zoom = page_item.zoom() * self.preview_factor
+            fitzpix = self.createFitzpix(self.displayList(page_item.pno), zoom)
+            page_item.setPixmap(self.toQPixmap(fitzpix), zoom)
+            self._rendered.add(page_item.pno)
+
+        return RenderRequest(self.pixmapKey(page_item), page_item.pno, page_item.zoom())
+
+    def renderPage(self, pno: int = 0):
+        """Show the page
+
+        Continuous mode: scroll to the page, render the pages in the viewport.
+        Single page mode: render the page, by tiles at high zoom, and hide the previous one.
+        """
+        page_item = self.pageItem(pno)
+        if page_item is None:
+            return
+
+        if self._continuous:
+            if not self._tracking_scroll:
+                self.scrollToPage(pno)
+            self.updateVisiblePages()
+            return
+
+        for other in self._rendered - {pno}:
+            self.page_items[other].clearPixmap()
+            self.page_items[other].setVisible(False)
+        self._rendered.intersection_update({pno})
+
+        page_item.setZoom(self._zoom_selector.zoomFactor)
+        page_item.setVisible(True)
+        tiled = self.isTiled(page_item)
+        requests = []
+        if not tiled and page_item.renderedZoom() != page_item.zoom():
+            request = self.renderPageProgressive(page_item)
+            if request is not None:
+                requests.append(request)
+
+        self.renderLinks(pno)
+        self.renderHighlights(pno)
+        self.transformGraphicItems([pno])
                 
-        self.centerOn(self.page_pixmap_item)
+        self.centerOn(page_item)
         self.setAlignment(QtCore.Qt.AlignmentFlag.AlignHCenter | QtCore.Qt.AlignmentFlag.AlignCenter)
-        self.doc_scene.setSceneRect(self.page_pixmap_item.boundingRect()) 
+        self.doc_scene.setSceneRect(page_item.sceneBoundingRect()) 
+
+        if tiled:
+            requests.extend(self.updateTiles(page_item, self.viewportSceneRect()))
+        self.prefetch([pno + 1, pno - 1, *self.searchHitsAround(pno)], requests)
         self.viewport().update()
 
+    def refresh(self):
+        """Render the displayed pages again, without scrolling"""
+        if self._continuous:
+            self.updateVisiblePages()
+        else:
+            self.renderPage(self.pageNavigator().currentPno())
+
+    def placeGraphicItem(self, item: RectItem | LinkBox | HighlightItem):
+        """Place the annotation item on its page and scale it to the zoom factor
+
+        The item is a child of the page item, it moves and is shown or hidden with the page.
+        """
+        page_item = self.pageItem(item.pno)
+
+        if page_item is None:
+            item.setVisible(False)
+            return
+
+        if item.parentItem() is not page_item:
+            item.setParentItem(page_item)
+        item.setPos(0, 0)
+        item.setScale(page_item.zoom() / item.zfactor)
+        item.setVisible(True)
+
+    def pageGraphicItems(self, pno: int) -> list[RectItem | LinkBox | HighlightItem]:
+        """Return the items drawn over the page"""
+        items = [*self.graphic_items.get(pno, {}).values(), *self.link_boxes.get(pno, [])]
+        if pno in self.highlight_items:
+            items.append(self.highlight_items[pno])
+        return items
+
+    def transformGraphicItems(self, pnos: list[int] | range):
+        """Scale the items of the pages to the zoom factor of their page"""
+        for pno in pnos:
+            for item in self.pageGraphicItems(pno):
+                self.placeGraphicItem(item)
+
+    def addGraphicItem(self, item: RectItem):
+        """Draw the annotation over its page"""
+        self.graphic_items.setdefault(item.pno, {})[item.uid] = item
+        self.placeGraphicItem(item)
+
     @Slot()
     def setRotation(self, degree):
         """Rotate current page"""
@@ -245,8 +758,10 @@ class PdfView(QtWidgets.QGraphicsView):
                 self._zoom_selector.zoomOut()
             while self._zoom_selector.zoomFactor < self._zoom_selector.min_zoom_factor:
                 self._zoom_selector.zoomIn()
-            self.renderPage(self.pageNavigator().currentPno())
+            self.applyZoom()
             self.setTransformationAnchor(anchor)
+        elif self._continuous:
+            super().wheelEvent(event)
         else:
             # Scroll Down
             if event.angleDelta().y() < 0 and self.verticalScrollBar().sliderPosition() == self.verticalScrollBar().maximum():
@@ -288,9 +803,7 @@ class PdfView(QtWidgets.QGraphicsView):
             rect.setRect(r)
             rect.pno = position.get("pageIndex")
             rect.zfactor = position.get("zfactor")
-            if rect.pno > self.pageNavigator().currentPno():
-                rect.setVisible(False)
-            self.doc_scene.addItem(rect)
+            self.addGraphicItem(rect)
         
     def getGraphicItems(self) -> dict:
         return self.graphic_items
@@ -308,6 +821,11 @@ class PdfView(QtWidgets.QGraphicsView):
     def scrollTo(self, location: QtCore.QPointF | int):
         if isinstance(location, QtCore.QPointF):
             location = location.toPoint().y()
+
+        if self._continuous:
+            self.scrollToPage(self.pageNavigator().currentPno(), location)
+            return
+
         self.verticalScrollBar().setValue(location)
 
     @Slot(int, QtCore.QPointF)
@@ -332,7 +850,8 @@ class PdfView(QtWidgets.QGraphicsView):
         self.cursor_position = event.position()
 
         if self._current_graphic_item is not None:
-            r = QtCore.QRectF(self.a0, self.mapToScene(event.position().toPoint())).normalized()
+            r = QtCore.QRectF(self._current_graphic_item.mapFromScene(self.a0),
+                              self._current_graphic_item.mapFromScene(self.mapToScene(event.position().toPoint()))).normalized()
             self._current_graphic_item.setRect(r)
             self.update()
         self.sig_mouse_position.emit(self.mapToScene(event.position().toPoint()))
@@ -350,14 +869,17 @@ class PdfView(QtWidgets.QGraphicsView):
         if self.mouse_interaction.interaction == MouseInteraction.InteractionType.TEXTSELECTION:
             self._current_graphic_item = RectItem()
             self._current_graphic_item.setPen(QtGui.QPen(QtCore.Qt.GlobalColor.red))
-            r = QtCore.QRectF(self.a0, self.a0)
-            self._current_graphic_item.setRect(r)
-            self._current_graphic_item.pno = self.pageNavigator().currentPno()
+            self._current_graphic_item.pno = self.pageAt(self.a0.y())
             self._current_graphic_item.zfactor = self.zoomSelector().zoomFactor
-            self.doc_scene.addItem(self._current_graphic_item)
+            self.addGraphicItem(self._current_graphic_item)
+            a0 = self._current_graphic_item.mapFromScene(self.a0)
+            self._current_graphic_item.setRect(QtCore.QRectF(a0, a0))
 
     def endMouseInteraction(self):
-        self._current_graphic_item.textSelection = self.getTextFromSelection(self.pageNavigator().currentPno(), self.a0, self.b1)
+        item = self._current_graphic_item
+        self._current_graphic_item.textSelection = self.getTextFromSelection(item.pno,
+                                                                             item.mapFromScene(self.a0),
+                                                                             item.mapFromScene(self.b1))
 
         # Put text into clipboard
         clipboard = QtWidgets.QApplication.clipboard()
@@ -386,15 +908,14 @@ class PdfView(QtWidgets.QGraphicsView):
 
     @Slot('qint64')
     def removeAnnotation(self, uid: int) -> bool:
-        items = self.doc_scene.items()
-        for item in items:
-            if isinstance(item, RectItem):
-                if item.uid == uid:
-                    try:
-                        self.doc_scene.removeItem(item)
-                    except Exception as e:
-                        logger.exception(e)
-                        return False  
+        for items in self.graphic_items.values():
+            item = items.pop(uid, None)
+            if item is not None and item.scene() is not None:
+                try:
+                    self.doc_scene.removeItem(item)
+                except Exception as e:
+                    logger.exception(e)
+                    return False
         return True
 
 
@@ -423,11 +944,16 @@ class PdfViewer(ViewerWidget):
             return
 
         self.outline_model.setDocument(self.fitzdoc)
-        self.search_model.setDocument(self.fitzdoc)
+        if self.outline_tab.isVisible():
+            self.outline_model.load()
+        self.search_model.setDocument(self.fitzdoc, self.document.id)
         self.metadata_tab.setMetadata(self.fitzdoc.metadata)
         self.annotation_model.setFilter(f"document_id={self.document.id}")
         if self.annotation_model.initCache(self.document.id):
             self.pdfview.loadGraphicItems(self.annotation_model.cache())
+
+        # Text of the pages for the next searches
+        QtCore.QThreadPool.globalInstance().start(TextIndexWorker(self.document.id, filepath))
         
         self.pdfview.renderPage()
 
@@ -483,6 +1009,12 @@ class PdfViewer(ViewerWidget):
         self.rotate_clockwise.setToolTip("Rotate clockwise")
         self.rotate_clockwise.triggered.connect(lambda: self.pdfview.setRotation(90))
 
+        # Continuous scroll
+        self.action_continuous = QtGui.QAction(theme_icon_manager.get_icon(':stack-line'), "Continuous scroll", self)
+        self.action_continuous.setCheckable(True)
+        self.action_continuous.setChecked(self.pdfview.isContinuous())
+        self.action_continuous.toggled.connect(self.pdfview.setContinuous)
+
         # Add Action/Widget to toolbar
         self._toolbar.insertWidget(self.toolbarFreeSpace(), self.page_navigator)
         self._toolbar.insertSeparator(self.toolbarFreeSpace())
@@ -490,6 +1022,7 @@ class PdfViewer(ViewerWidget):
         self._toolbar.insertAction(self.toolbarFreeSpace(), self.action_fitheight)
         self._toolbar.insertAction(self.toolbarFreeSpace(), zoom_in)
         self._toolbar.insertAction(self.toolbarFreeSpace(), zoom_out)
+        self._toolbar.insertAction(self.toolbarFreeSpace(), self.action_continuous)
         self._toolbar.insertSeparator(self.toolbarFreeSpace())
         self._toolbar.insertAction(self.toolbarFreeSpace(), self.rotate_anticlockwise)
         self._toolbar.insertAction(self.toolbarFreeSpace(), self.rotate_clockwise)
@@ -507,6 +1040,9 @@ class PdfViewer(ViewerWidget):
         self.outline_tab.selectionModel().selectionChanged.connect(self.onOutlineSelected)
         self.left_pane.addTab(self.outline_tab, "Outline")
 
+        # The outline is read when its tab is shown
+        self.outline_tab.installEventFilter(self)
+
         # Search Tab
         search_tab = QtWidgets.QWidget(self.left_pane)
         search_tab_layout = QtWidgets.QVBoxLayout()
@@ -515,6 +1051,13 @@ class PdfViewer(ViewerWidget):
         self.search_LineEdit = QtWidgets.QLineEdit()
         self.search_LineEdit.setPlaceholderText("Find in document")
         self.search_LineEdit.editingFinished.connect(self.searchFor)
+
+        # Search while typing, the running search is cancelled by the next one
+        self.search_timer = QtCore.QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(300)
+        self.search_timer.timeout.connect(self.searchFor)
+        self.search_LineEdit.textEdited.connect(self.search_timer.start)
         
         self.search_count = QtWidgets.QLabel("Hits: ")
 
@@ -549,6 +1092,7 @@ class PdfViewer(ViewerWidget):
         self.page_navigator.currentPnoChanged.connect(self.pdfview.renderPage) # Render page at init time
         self.page_navigator.currentLocationChanged.connect(self.pdfview.scrollTo)
         self.search_model.sigTextFound.connect(self.onSearchFound)
+        self.search_model.sigPageFound.connect(self.pdfview.addAnnotations)
         self.pdfview.sig_annotation_added.connect(self.onAnnotationAdded)
         self.pdfview.sigRemoveAnnotation.connect(self.annotation_model.removeById)
         self.annotation_pane.clicked.connect(self.onAnnotationListClicked)
@@ -575,9 +1119,8 @@ class PdfViewer(ViewerWidget):
     @Slot(str)
     def onSearchFound(self, count: str):
         self.search_count.setText(count)
-        self.pdfview.setAnnotations(self.search_model.getSearchResults())
-        self.pdfview.renderPage(self.page_navigator.currentPno())
-        self.search_results.resizeColumnToContents(0)
+        if not self.search_model.isSearching():
+            self.search_results.resizeColumnToContents(0)
 
     def pdfViewSize(self) -> QtCore.QSize:
         idx = self.splitter.indexOf(self.pdfview)
@@ -592,11 +1135,19 @@ class PdfViewer(ViewerWidget):
     def eventFilter(self, object: QtCore.QObject, event: QtCore.QEvent):
         if object == self and event.type() == QtCore.QEvent.Type.Wheel:
             return True
+        if object == self.outline_tab and event.type() == QtCore.QEvent.Type.Show:
+            self.outline_model.load()
         return False
     
     @Slot()
     def searchFor(self):
-        self.search_model.searchFor(self.search_LineEdit.text())
+        self.search_timer.stop()
+        text = self.search_LineEdit.text()
+        if text == self.search_model.searchText():
+            return
+
+        self.pdfview.setAnnotations({})
+        self.search_model.searchFor(text, self.page_navigator.currentPno())
     
     @Slot()
     def fitwidth(self):
@@ -628,6 +1179,9 @@ class PdfViewer(ViewerWidget):
         citation = "; ".join(x for x in [refkey, title, self.subtitle.text(), self.reference.text(), "PDF", page] if x)
         return f"[{citation}]"
     
+    def goToPage(self, page: int):
+        self.page_navigator.jump(page)
+
     def getAnchor(self):
         anchor = {"type": "pdf",
                    "page": self.page_navigator.currentPageLabel()}
@@ -0,0 +1,147 @@
+"""Caches of the PDF viewer
+
+`PixmapCache` keeps the rendered pages, least recently used first out, within a
+memory budget shared by every viewer. `DisplayListCache` keeps a bounded number
+of MuPDF display lists of a document.
+"""
+import logging
+import pymupdf
+
+from collections import OrderedDict
+
+from qtpy import QtGui
+from utilities import config as mconf
+
+
+logger = logging.getLogger(__name__)
+
+
+class LRUCache:
+    """Least recently used cache bounded by the total cost of its entries"""
+    def __init__(self, capacity: int, name: str = "cache", log_every: int = 100):
+        self._entries: OrderedDict = OrderedDict()
+        self._costs: dict = {}
+        self._capacity = capacity
+        self._total_cost = 0
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self.log_every = log_every
+
+    def cost(self, value) -> int:
+        return 1
+
+    def capacity(self) -> int:
+        return self._capacity
+
+    def setCapacity(self, capacity: int):
+        self._capacity = capacity
+        self._trim()
+
+    def totalCost(self) -> int:
+        return self._total_cost
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key):
+        value = self._entries.get(key)
+
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+
+        if self.log_every and (self.hits + self.misses) % self.log_every == 0:
+            logger.debug(self.stats())
+
+        return value
+
+    def insert(self, key, value):
+        cost = self.cost(value)
+
+        if cost > self._capacity:
+            return
+
+        self.remove(key)
+        self._entries[key] = value
+        self._costs[key] = cost
+        self._total_cost += cost
+        self._trim()
+
+    def remove(self, key):
+        if key in self._entries:
+            del self._entries[key]
+            self._total_cost -= self._costs.pop(key)
+
+    def removeIf(self, predicate):
+        for key in [key for key in self._entries if predicate(key)]:
+            self.remove(key)
+
+    def clear(self):
+        self._entries.clear()
+        self._costs.clear()
+        self._total_cost = 0
+
+    def hitRate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> str:
+        return (f"{self.name}: hit rate {self.hitRate():.1%} ({self.hits}/{self.hits + self.misses}), "
+                f"{len(self)} entries, cost {self._total_cost}/{self._capacity}")
+
+    def _trim(self):
+        while self._total_cost > self._capacity and self._entries:
+            key, _ = self._entries.popitem(last=False)
+            self._total_cost -= self._costs.pop(key)
+
+
+class PixmapCache(LRUCache):
+    """Rendered pages keyed by (document, pno, zoom, rotation, dpr, ...), cost in bytes
+
+    The key of a tile ends with its (column, row).
+    """
+    def __init__(self, budget: int):
+        super().__init__(budget, "Pixmap cache")
+
+    def cost(self, pixmap: QtGui.QPixmap) -> int:
+        return pixmap.width() * pixmap.height() * pixmap.depth() // 8
+
+    def stats(self) -> str:
+        return (f"{self.name}: hit rate {self.hitRate():.1%} ({self.hits}/{self.hits + self.misses}), "
+                f"{len(self)} pages/tiles, {self._total_cost / 2**20:.1f}/{self._capacity / 2**20:.0f} MB")
+
+
+class DisplayListCache(LRUCache):
+    """Display lists of the pages of a document, at most `size` pages"""
+    def __init__(self, document: pymupdf.Document, size: int):
+        super().__init__(size, "Display list cache")
+        self._document = document
+
+    def displayList(self, pno: int) -> pymupdf.DisplayList:
+        dlist = self.get(pno)
+
+        if dlist is None:
+            dlist = self._document.load_page(pno).get_displaylist()
+            self.insert(pno, dlist)
+
+        return dlist
+
+
+_pixmap_cache: PixmapCache = None
+
+
+def pixmapCache() -> PixmapCache:
+    """Return the pixmap cache shared by the viewers, its budget is the PDF_CACHE_SIZE_MB setting"""
+    global _pixmap_cache
+
+    if _pixmap_cache is None:
+        budget = mconf.settings.value("PDF_CACHE_SIZE_MB", 256, int)
+        _pixmap_cache = PixmapCache(budget * 2**20)
+
+    return _pixmap_cache
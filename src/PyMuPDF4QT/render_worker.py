@@ -0,0 +1,153 @@
+"""Background rendering of the PDF pages likely displayed next"""
+import logging
+import threading
+import pymupdf
+
+from concurrent.futures import ProcessPoolExecutor, Future
+from dataclasses import dataclass
+
+from qtpy import QtCore, QtGui, Signal, Slot
+
+from PyMuPDF4QT import page_render
+
+
+logger = logging.getLogger(__name__)
+
+_executor: ProcessPoolExecutor = None
+
+_IMAGE_FORMATS = {1: QtGui.QImage.Format.Format_Grayscale8,
+                  3: QtGui.QImage.Format.Format_RGB888,
+                  4: QtGui.QImage.Format.Format_RGBA8888}
+
+
+def imageFromSamples(samples, width: int, height: int, stride: int, n: int = 3) -> QtGui.QImage:
+    """Wrap a raster in a QImage without copy, the samples must outlive the image"""
+    return QtGui.QImage(samples, width, height, stride, _IMAGE_FORMATS[n])
+
+
+def toQPixmap(fitzpix: pymupdf.Pixmap, dpr: float = 1.0) -> QtGui.QPixmap:
+    """Convert pymupdf.Pixmap to QtGui.QPixmap
+
+    The image is built over the samples of the pixmap, QPixmap.fromImage makes the only copy.
+    """
+    image = imageFromSamples(fitzpix.samples_mv, fitzpix.width, fitzpix.height, fitzpix.stride, fitzpix.n)
+    pixmap = QtGui.QPixmap.fromImage(image)
+    pixmap.setDevicePixelRatio(dpr)
+    return pixmap
+
+
+def renderExecutor(max_workers: int = 2) -> ProcessPoolExecutor:
+    """Return the process pool shared by the viewers, created on first use
+
+    The pool is replaced when `max_workers` changes, the pages already submitted
+    to the previous pool finish in the background.
+    """
+    global _executor
+
+    max_workers = max(1, max_workers)
+
+    if _executor is not None and _executor._max_workers != max_workers:
+        _executor.shutdown(wait=False)
+        _executor = None
+
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=max_workers)
+
+    return _executor
+
+
+@dataclass
+class RenderRequest:
+    key: tuple # pixmap cache key
+    pno: int
+    zoom: float
+    clip: tuple | None = None # tile (x0, y0, x1, y1) in page points
+
+
+class PageRenderer(QtCore.QObject):
+    """Render pages in the process pool, emit the pixmaps on the GUI thread
+
+    A new request cancels the pages of the previous one not yet started. Once the renderer
+    is closed or deleted, the pages still rendering are dropped.
+    """
+    rendered = Signal(object, QtGui.QPixmap) # pixmap cache key, pixmap
+    _done = Signal(object, object) # emitted by the executor thread
+
+    def __init__(self, max_workers: int = 2, parent=None):
+        super().__init__(parent)
+        self.max_workers = max_workers
+        self._futures: list[Future] = []
+        self._closed = threading.Event()
+        self._done.connect(self._onDone)
+        # Deleted with its parent viewer: the done callbacks must not emit anymore
+        self.destroyed.connect(lambda *args, closed=self._closed, futures=self._futures:
+                               PageRenderer._release(closed, futures))
+
+    def render(self, document_key: tuple, filepath: str, requests: list[RenderRequest], dpr: float):
+        self.cancel()
+
+        if self._closed.is_set():
+            return
+
+        try:
+            executor = renderExecutor(self.max_workers)
+        except Exception as e:
+            logger.error(f"Cannot start the render processes - Error: {e}")
+            return
+
+        for request in requests:
+            future = executor.submit(page_render.renderPage, document_key, filepath,
+                                     request.pno, request.zoom * dpr, request.clip)
+            future.add_done_callback(lambda f, key=request.key, closed=self._closed, done=self._done:
+                                     PageRenderer._emitDone(closed, done, key, (f, dpr)))
+            self._futures.append(future)
+
+    def cancel(self):
+        for future in self._futures:
+            future.cancel()
+        self._futures.clear()
+
+    def close(self):
+        """Cancel the pending pages and drop those still rendering"""
+        self._release(self._closed, self._futures)
+
+    def isClosed(self) -> bool:
+        return self._closed.is_set()
+
+    # The callbacks below do not hold the renderer, they may run after its deletion
+
+    @staticmethod
+    def _release(closed: threading.Event, futures: list[Future]):
+        closed.set()
+        for future in futures:
+            future.cancel()
+        futures.clear()
+
+    @staticmethod
+    def _emitDone(closed: threading.Event, done, key: tuple, result: tuple):
+        """Called by the executor thread, the renderer may have been closed or deleted meanwhile"""
+        if closed.is_set():
+            return
+
+        try:
+            done.emit(key, result)
+        except RuntimeError:
+            # Deleted between the check and the emit
+            pass
+
+    @Slot(object, object)
+    def _onDone(self, key: tuple, result: tuple):
+        future, dpr = result
+
+        if future.cancelled():
+            return
+
+        try:
+            width, height, stride, n, samples = future.result()
+        except Exception as e:
+            logger.error(f"Cannot render page {key[1]} - Error: {e}")
+            return
+
+        pixmap = QtGui.QPixmap.fromImage(imageFromSamples(samples, width, height, stride, n))
+        pixmap.setDevicePixelRatio(dpr)
+        self.rendered.emit(key, pixmap)
@@ -0,0 +1,163 @@
+"""Full-text index of the PDF pages
+
+The text of the pages is extracted once in the background and stored in the
+document_text table, indexed by document_text_fts (FTS5, trigram tokenizer).
+A search then looks up the matching pages in the index and only asks MuPDF
+for the geometry of the hits on these pages.
+"""
+import logging
+
+from pathlib import Path
+
+from qtpy import QtCore, QtSql, Signal
+
+from database.database import AppDatabase
+from utilities.text_extractor import TEXT_VERSION, normalizeText, pdfPages
+
+
+logger = logging.getLogger(__name__)
+
+
+def fileState(filepath: str) -> tuple[int, int] | None:
+    """Return (mtime in ns, size) of the file, None if it cannot be read"""
+    try:
+        stat = Path(filepath).stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def isIndexed(document_id: int, filepath: str, db: QtSql.QSqlDatabase | None = None) -> bool:
+    """Return True if the text of the document is indexed from the current file by the current extractor"""
+    state = fileState(filepath)
+    if state is None:
+        return False
+
+    query = QtSql.QSqlQuery(db) if db is not None else QtSql.QSqlQuery()
+    query.prepare("""SELECT mtime, size, version FROM document_text_state WHERE document_id = :document_id;""")
+    query.bindValue(":document_id", document_id)
+
+    if not query.exec():
+        logger.error(f"Query execution failed with error : {query.lastError().text()}")
+        return False
+
+    return query.next() and (query.value(0), query.value(1)) == state and query.value(2) == TEXT_VERSION
+
+
+def matchExpression(text: str) -> str | None:
+    """Return the FTS5 phrase matching the text, None if the text is too short for the trigram index"""
+    text = normalizeText(text)
+    if len(text) < 3:
+        return None
+    return '"' + text.replace('"', '""') + '"'
+
+
+def indexedPages(document_id: int, filepath: str, text: str) -> list[int] | None:
+    """Return the pages of the document containing the text
+
+    None if the document is not indexed or the text cannot be looked up in the index,
+    every page must be searched then.
+    """
+    match = matchExpression(text)
+    if match is None or not isIndexed(document_id, filepath):
+        return None
+
+    query = QtSql.QSqlQuery()
+    query.setForwardOnly(True)
+    query.prepare("""
+                    SELECT document_text.page
+                    FROM document_text_fts
+                    JOIN document_text ON document_text.id = document_text_fts.rowid
+                    WHERE
+                        document_text_fts MATCH :match
+                    AND
+                        document_text.document_id = :document_id
+                    ORDER BY
+                        document_text.page;
+                  """)
+    query.bindValue(":match", match)
+    query.bindValue(":document_id", document_id)
+
+    if not query.exec():
+        logger.error(f"Query execution failed with error : {query.lastError().text()}")
+        return None
+
+    pages = []
+    while query.next():
+        pages.append(query.value(0))
+    return pages
+
+
+def writePages(db: QtSql.QSqlDatabase, document_id: int, pages: list[str], state: tuple[int, int]) -> bool:
+    """Replace the indexed text of the document"""
+    query = QtSql.QSqlQuery(db)
+
+    db.transaction()
+
+    query.prepare("""DELETE FROM document_text WHERE document_id = :document_id;""")
+    query.bindValue(":document_id", document_id)
+    if not query.exec():
+        logger.error(f"Cannot clear the text of document {document_id} - Error: {query.lastError().text()}")
+        db.rollback()
+        return False
+
+    query.prepare("""INSERT INTO document_text (document_id, page, content) VALUES (?, ?, ?);""")
+    query.addBindValue([document_id] * len(pages))
+    query.addBindValue(list(range(len(pages))))
+    query.addBindValue(pages)
+    if pages and not query.execBatch():
+        logger.error(f"Cannot index the text of document {document_id} - Error: {query.lastError().text()}")
+        db.rollback()
+        return False
+
+    query.prepare("""
+                    INSERT OR REPLACE INTO document_text_state (document_id, mtime, size, version)
+                    VALUES (:document_id, :mtime, :size, :version);
+                  """)
+    query.bindValue(":document_id", document_id)
+    query.bindValue(":mtime", state[0])
+    query.bindValue(":size", state[1])
+    query.bindValue(":version", TEXT_VERSION)
+    if not query.exec():
+        logger.error(f"Cannot save the index state of document {document_id} - Error: {query.lastError().text()}")
+        db.rollback()
+        return False
+
+    return db.commit()
+
+
+class IndexSignals(QtCore.QObject):
+    finished = Signal(int, bool) # document id, indexed
+
+
+class TextIndexWorker(QtCore.QRunnable):
+    """Extract the text of the document and store it in the index, unless already indexed"""
+    def __init__(self, document_id: int, filepath: str):
+        super().__init__()
+        self.document_id = document_id
+        self.filepath = filepath
+        self.signals = IndexSignals()
+
+    def run(self):
+        name = f"text_index_{self.document_id}_{id(self)}"
+        db = AppDatabase.openWriteConnection(name)
+        if db is None:
+            self.signals.finished.emit(self.document_id, False)
+            return
+
+        indexed = isIndexed(self.document_id, self.filepath, db)
+
+        if not indexed:
+            state = fileState(self.filepath)
+            try:
+                pages = pdfPages(self.filepath)
+            except Exception as e:
+                logger.error(f"Cannot extract the text of {self.filepath} - Error: {e}")
+            else:
+                indexed = writePages(db, self.document_id, pages, state)
+                if indexed:
+                    logger.debug(f"{len(pages)} pages of document {self.document_id} indexed")
+
+        del db
+        AppDatabase.closeConnection(name)
+        self.signals.finished.emit(self.document_id, indexed)
@@ -3,75 +3,143 @@ from qtpy import QtCore, QtGui
 
 
 class ProxyModel(QtCore.QSortFilterProxyModel):
+    """Filter proxy
+
+    The values used by the filters are read once per source row and kept in
+    a filter key cache. Keys are refreshed on dataChanged and dropped when
+    rows are inserted, removed or moved, or when the filtered columns change.
+    """
 
     def __init__(self, model):
         super().__init__()
+        self._filter_keys: dict[tuple, dict] = {}
         self.setSourceModel(model)
 
         self.permanent_filter = QtCore.QRegularExpression()
-        self.user_filter = QtCore.QRegularExpression()
+        self.user_filter = ""
         self.permanent_columns = []
         self.user_columns = []
         self.status_filter = []
         self.types_filter = []
+        self.status_column = None
+        self.types_column = None
+
+    def setSourceModel(self, model: QtCore.QAbstractItemModel):
+        if model is self.sourceModel():
+            return
+
+        if self.sourceModel() is not None:
+            self.sourceModel().dataChanged.disconnect(self._onSourceDataChanged)
+            for signal in self._resetSignals(self.sourceModel()):
+                signal.disconnect(self.clearFilterKeys)
+
+        # Connect before the base class so that keys are refreshed before the rows are filtered again
+        if model is not None:
+            model.dataChanged.connect(self._onSourceDataChanged)
+            for signal in self._resetSignals(model):
+                signal.connect(self.clearFilterKeys)
+
+        self.clearFilterKeys()
+        super().setSourceModel(model)
+
+    @staticmethod
+    def _resetSignals(model: QtCore.QAbstractItemModel) -> list:
+        return [model.modelReset,
+                model.layoutChanged,
+                model.rowsInserted,
+                model.rowsRemoved,
+                model.rowsMoved]
+
+    def clearFilterKeys(self):
+        self._filter_keys.clear()
+
+    def _onSourceDataChanged(self, top_left: QtCore.QModelIndex, bottom_right: QtCore.QModelIndex, roles: list | None = None):
+        parent_id = self._parentId(top_left.parent())
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            self._filter_keys.pop((parent_id, row), None)
+
+    @staticmethod
+    def _parentId(source_parent: QtCore.QModelIndex) -> int:
+        return source_parent.internalId() if source_parent.isValid() else 0
+
+    def _sourceData(self, source_row: int, column: int, source_parent: QtCore.QModelIndex):
+        index = self.sourceModel().index(source_row, column, source_parent)
+        return self.sourceModel().data(index, QtCore.Qt.ItemDataRole.DisplayRole)
+
+    def filterKey(self, source_row: int, source_parent: QtCore.QModelIndex) -> dict:
+        """Return the cached filter key of a source row"""
+        key_id = (self._parentId(source_parent), source_row)
+        key = self._filter_keys.get(key_id)
+        if key is None:
+            key = self.buildFilterKey(source_row, source_parent)
+            self._filter_keys[key_id] = key
+        return key
+
+    def buildFilterKey(self, source_row: int, source_parent: QtCore.QModelIndex) -> dict:
+        """Read the values used by the filters for a source row"""
+        key = {}
+
+        key["permanent"] = all(self.permanent_filter.match(str(self._sourceData(source_row, col, source_parent))).hasMatch()
+                               for col in self.permanent_columns)
+
+        # Columns are separated by a non-printable character so that a pattern never matches across two columns
+        key["user"] = "\x1f".join(str(self._sourceData(source_row, col, source_parent)).lower()
+                                  for col in self.user_columns)
+
+        if self.status_column is not None:
+            key["status"] = self._sourceData(source_row, self.status_column, source_parent)
+
+        if self.types_column is not None:
+            key["type"] = self._sourceData(source_row, self.types_column, source_parent)
+
+        return key
 
     def setPermanentFilter(self, pattern: str, columns: list):
         self.permanent_filter = QtCore.QRegularExpression(pattern,
                                                           QtCore.QRegularExpression.PatternOption.CaseInsensitiveOption)
+        self.permanent_filter.optimize()
         self.permanent_columns = columns
+        self.clearFilterKeys()
 
     def setUserFilter(self, pattern: str, columns: list):
         self.user_filter = pattern.lower()
-        self.user_columns = columns
+        if columns != self.user_columns:
+            self.user_columns = columns
+            self.clearFilterKeys()
 
     def setSatusFilter(self, statuses: list, column: int):
         self.status_filter = statuses
-        self.status_column = column
+        if column != self.status_column:
+            self.status_column = column
+            self.clearFilterKeys()
 
     def setTypeFilter(self, signage_types: list, column: int):
         self.types_filter = signage_types
-        self.types_column = column
+        if column != self.types_column:
+            self.types_column = column
+            self.clearFilterKeys()
     
     def filterAcceptsRow(self, source_row: int, source_parent: QtCore.QModelIndex) -> bool:
-        user_filter = True
-        status_filter = True
-        types_filter = True
+        key = self.filterKey(source_row, source_parent)
 
         # Apply the permanent filter on the specified column
-        for col in self.permanent_columns:
-            index_perm = self.sourceModel().index(source_row, col, source_parent)
-            data_perm = str(self.sourceModel().data(index_perm))
-            if not self.permanent_filter.match(data_perm).hasMatch():
-                return False
-            
-        if len(self.status_filter) > 0:
-            index_status = self.sourceModel().index(source_row, self.status_column, source_parent)
-            data_status = self.sourceModel().data(index_status, QtCore.Qt.ItemDataRole.DisplayRole)
-            if data_status in self.status_filter:
-                status_filter = True
-            else:
-                status_filter = False
-
-        if len(self.types_filter) > 0:
-            index_type = self.sourceModel().index(source_row, self.types_column, source_parent)
-            data_type = self.sourceModel().data(index_type, QtCore.Qt.ItemDataRole.DisplayRole)
-            if data_type in self.types_filter:
-                types_filter = True
-            else:
-                types_filter = False
+        if not key["permanent"]:
+            return False
+
+        if len(self.status_filter) > 0 and key.get("status") not in self.status_filter:
+            return False
+
+        if len(self.types_filter) > 0 and key.get("type") not in self.types_filter:
+            return False
 
         # Apply the user filter on the specified columns
-        for column in self.user_columns:
-            index_user = self.sourceModel().index(source_row, column, source_parent)
-            data_user = str(self.sourceModel().data(index_user, QtCore.Qt.ItemDataRole.DisplayRole)).lower()
-
-            if self.user_filter not in data_user:
-                user_filter = False
-            else: 
-                user_filter = True
-                break
-            
-        return user_filter and status_filter and types_filter
+        if not self.acceptsUserFilter(key):
+            return False
+
+        return True
+
+    def acceptsUserFilter(self, key: dict) -> bool:
+        return len(self.user_columns) == 0 or self.user_filter in key["user"]
 
 
 class TreeItem:
@@ -159,6 +159,10 @@ class Connector:
     name: str= ""
     value: str = ""
     last_modified: str = ""
+    size: int = 0
+    content_hash: str = ""
+    line_ids: set = field(default_factory=set)
+    sync_interval: int = 0 # minutes, 0: manual import only
 
     @classmethod
     def from_json(cls, value):
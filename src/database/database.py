@@ -1,8 +1,9 @@
+import json
 import logging
 
 from qtpy import QtSql, QtCore
 
-from common import Cache, Workspace, SignageType, SignageStatus, DocumentStatus
+from common import Cache, Workspace, SignageType, SignageStatus, DocumentStatus, Connector
 
 
 logger = logging.getLogger(__name__)
@@ -14,6 +15,7 @@ class AppDatabase:
     cache_signage_status = Cache()
     cache_signage_type = Cache()
     cache_document_status = Cache()
+    _query_cache: dict[str, tuple] = {}  # query name: (workspace id, write generation, result)
 
     @classmethod
     def connect(cls, path: str):
@@ -47,6 +49,52 @@ class AppDatabase:
     @classmethod
     def db(cls) -> QtSql.QSqlDatabase:
         return cls._db
+
+    @classmethod
+    def openReadConnection(cls, name: str) -> QtSql.QSqlDatabase | None:
+        """Open a read-only connection to the database
+
+        Connections cannot be shared between threads: open it from the thread that uses it
+        and release it with `closeConnection`.
+        """
+        db = QtSql.QSqlDatabase.addDatabase("QSQLITE", name)
+        db.setDatabaseName(cls._db.databaseName())
+        db.setConnectOptions("QSQLITE_OPEN_READONLY")
+
+        if not db.open():
+            logger.error(f"Read connection failed - Error : {db.lastError().text()}")
+            db = None
+            QtSql.QSqlDatabase.removeDatabase(name)
+        return db
+
+    @classmethod
+    def openWriteConnection(cls, name: str) -> QtSql.QSqlDatabase | None:
+        """Open a connection to the database for a worker thread
+
+        Same rules as `openReadConnection`, release it with `closeConnection`.
+        """
+        db = QtSql.QSqlDatabase.addDatabase("QSQLITE", name)
+        db.setDatabaseName(cls._db.databaseName())
+
+        if not db.open():
+            logger.error(f"Write connection failed - Error : {db.lastError().text()}")
+            db = None
+            QtSql.QSqlDatabase.removeDatabase(name)
+        else:
+            QtSql.QSqlQuery(db).exec("""PRAGMA foreign_keys = ON;""")
+        return db
+
+    @classmethod
+    def closeConnection(cls, name: str):
+        """Close a connection opened with `openReadConnection` or `openWriteConnection`
+
+        Every query on the connection must have been deleted.
+        """
+        db = QtSql.QSqlDatabase.database(name, False)
+        if db.isValid():
+            db.close()
+        del db
+        QtSql.QSqlDatabase.removeDatabase(name)
     
     @classmethod
     def version(cls):
@@ -62,9 +110,178 @@ class AppDatabase:
 
     @classmethod
     def setup(cls):
+        cls.migrate()
         cls.setActiveWorkspace()
         cls.initCache()
 
+    @classmethod
+    def migrate(cls):
+        """Upgrade the schema of databases created by previous versions"""
+        cls._migrateSignageSource()
+        cls._migrateSignageTarget()
+        cls._migrateConnectorSyncState()
+        cls._migrateDocumentText()
+
+        query = QtSql.QSqlQuery()
+        if not query.exec("""CREATE INDEX IF NOT EXISTS signage_parent_idx ON signage(parentID);"""):
+            logger.error(f"Fail to create index signage_parent_idx: {query.lastError().text()}")
+
+    @classmethod
+    def _migrateSignageSource(cls):
+        """Promote application, module and object_id from signage.source JSON to indexed columns"""
+        query = QtSql.QSqlQuery()
+
+        if not cls._db.record("signage").contains("object_id"):
+            cls._db.transaction()
+            for statement in ("""ALTER TABLE signage ADD COLUMN application TEXT;""",
+                              """ALTER TABLE signage ADD COLUMN module TEXT;""",
+                              """ALTER TABLE signage ADD COLUMN object_id TEXT;""",
+                              """
+                              UPDATE signage
+                              SET
+                                application = json_extract(source, '$.application'),
+                                module = json_extract(source, '$.module'),
+                                object_id = json_extract(source, '$.object_id')
+                              WHERE
+                                json_valid(source);
+                              """):
+                if not query.exec(statement):
+                    logger.error(f"Signage source migration failed: {query.lastError().text()}")
+                    cls._db.rollback()
+                    return False
+            cls._db.commit()
+            logger.info("Signage source migrated to application, module and object_id columns")
+
+        if not query.exec("""CREATE INDEX IF NOT EXISTS signage_source_idx ON signage(workspace_id, application, object_id);"""):
+            logger.error(f"Fail to create index signage_source_idx: {query.lastError().text()}")
+            return False
+
+        return True
+
+    @classmethod
+    def _migrateSignageTarget(cls):
+        """Promote the target reached from a signage (file, link or note) from signage.source JSON to columns"""
+        if cls._db.record("signage").contains("target"):
+            return True
+
+        query = QtSql.QSqlQuery()
+        cls._db.transaction()
+        for statement in ("""ALTER TABLE signage ADD COLUMN target TEXT;""",
+                          """ALTER TABLE signage ADD COLUMN anchor TEXT;""",
+                          """
+                          UPDATE signage
+                          SET
+                            target = CASE
+                              WHEN module = 'Notebook' THEN json_extract(source, '$.item_title')
+                              WHEN application = 'Docx' THEN json_extract(source, '$.file')
+                              WHEN application = 'OneNote' THEN json_extract(source, '$.link')
+                              ELSE json_extract(source, '$.filepath')
+                            END,
+                            anchor = json_extract(source, '$.anchor')
+                          WHERE
+                            json_valid(source);
+                          """):
+            if not query.exec(statement):
+                logger.error(f"Signage target migration failed: {query.lastError().text()}")
+                cls._db.rollback()
+                return False
+        cls._db.commit()
+        logger.info("Signage target migrated to target and anchor columns")
+
+        return True
+
+    @classmethod
+    def _migrateConnectorSyncState(cls):
+        """Add the columns holding the state of the last connector synchronisation"""
+        query = QtSql.QSqlQuery()
+
+        if not query.exec("""
+                          CREATE TABLE IF NOT EXISTS connectors (
+                            id INTEGER PRIMARY KEY AUTOINCREMENT,
+                            type TEXT,
+                            name TEXT,
+                            value TEXT,
+                            last_modified TEXT,
+                            workspace_id INTEGER
+                          );
+                          """):
+            logger.error(f"Fail to create table connectors: {query.lastError().text()}")
+            return False
+
+        record = cls._db.record("connectors")
+        columns = {"size": "INTEGER",
+                   "content_hash": "TEXT",
+                   "line_ids": "TEXT",
+                   "sync_interval": "INTEGER DEFAULT 0"} # minutes, 0: manual import only
+        missing = [name for name in columns if not record.contains(name)]
+
+        if not missing:
+            return True
+
+        cls._db.transaction()
+        for name in missing:
+            if not query.exec(f"""ALTER TABLE connectors ADD COLUMN {name} {columns[name]};"""):
+                logger.error(f"Connector sync state migration failed: {query.lastError().text()}")
+                cls._db.rollback()
+                return False
+        cls._db.commit()
+        logger.info(f"Connector sync state columns added: {', '.join(missing)}")
+
+        return True
+
+    @classmethod
+    def _migrateDocumentText(cls):
+        """Create the full-text index of the documents
+
+        document_text holds the text of each page, document_text_fts indexes it
+        (external content, kept in sync by triggers) and document_text_state the
+        file state and extractor version the text was extracted from.
+        """
+        query = QtSql.QSqlQuery()
+
+        for statement in ("""
+                          CREATE TABLE IF NOT EXISTS document_text (
+                            id INTEGER PRIMARY KEY,
+                            document_id INTEGER REFERENCES document(id) ON DELETE CASCADE,
+                            page INTEGER,
+                            content TEXT
+                          );
+                          """,
+                          """CREATE INDEX IF NOT EXISTS document_text_idx ON document_text(document_id, page);""",
+                          """
+                          CREATE TABLE IF NOT EXISTS document_text_state (
+                            document_id INTEGER PRIMARY KEY REFERENCES document(id) ON DELETE CASCADE,
+                            mtime INTEGER,
+                            size INTEGER,
+                            version INTEGER DEFAULT 0
+                          );
+                          """,
+                          """
+                          CREATE VIRTUAL TABLE IF NOT EXISTS document_text_fts
+                          USING fts5(content, content='document_text', content_rowid='id', tokenize='trigram');
+                          """,
+                          """
+                          CREATE TRIGGER IF NOT EXISTS document_text_ai AFTER INSERT ON document_text BEGIN
+                            INSERT INTO document_text_fts(rowid, content) VALUES (new.id, new.content);
+                          END;
+                          """,
+                          """
+                          CREATE TRIGGER IF NOT EXISTS document_text_ad AFTER DELETE ON document_text BEGIN
+                            INSERT INTO document_text_fts(document_text_fts, rowid, content) VALUES ('delete', old.id, old.content);
+                          END;
+                          """):
+            if not query.exec(statement):
+                logger.error(f"Fail to create the document text index: {query.lastError().text()}")
+                return False
+
+        # Text extracted before the extractor version was recorded, indexed again
+        if not cls._db.record("document_text_state").contains("version"):
+            if not query.exec("""ALTER TABLE document_text_state ADD COLUMN version INTEGER DEFAULT 0;"""):
+                logger.error(f"Document text state migration failed: {query.lastError().text()}")
+                return False
+
+        return True
+
     @classmethod
     def initCache(cls):
         cls._cacheSignageType()
@@ -177,6 +394,201 @@ class AppDatabase:
 
         return refkey
     
+    @classmethod
+    def querySignageKeys(cls) -> list[tuple]:
+        """Snapshot (signage_id, refkey, type, title) of the active workspace's signages"""
+        result = []
+        query = QtSql.QSqlQuery()
+        query.setForwardOnly(True)
+        query.prepare("""
+                        SELECT signage_id, refkey, type, title
+                        FROM signage
+                        WHERE
+                            signage.workspace_id = :workspace_id;
+                      """)
+        query.bindValue(":workspace_id", AppDatabase.activeWorkspace().id)
+
+        if not query.exec():
+            logger.error(f"Query execution failed with error : {query.lastError().text()}")
+            return result
+
+        while query.next():
+            result.append((query.value(0), query.value(1), query.value(2), query.value(3)))
+
+        return result
+
+    @classmethod
+    def querySignageObjectIds(cls, applications: list[str]) -> dict[str, set]:
+        """Return the object_id of the signages imported from each application"""
+        result = {application: set() for application in applications}
+        query = QtSql.QSqlQuery()
+        query.setForwardOnly(True)
+        query.prepare(f"""
+                        SELECT application, object_id
+                        FROM signage
+                        WHERE
+                            signage.workspace_id = :workspace_id
+                        AND
+                            signage.application IN ({", ".join(f":application{i}" for i in range(len(applications)))})
+                        AND
+                            signage.object_id IS NOT NULL;
+                      """)
+        query.bindValue(":workspace_id", AppDatabase.activeWorkspace().id)
+        for i, application in enumerate(applications):
+            query.bindValue(f":application{i}", application)
+
+        if not query.exec():
+            logger.error(f"Query execution failed with error : {query.lastError().text()}")
+            return result
+
+        while query.next():
+            result[query.value(0)].add(query.value(1))
+
+        return result
+
+    @classmethod
+    def querySignageIdsByNote(cls, text: str) -> set[int]:
+        """Return the id of the signages whose private or public note contains the text (case insensitive)"""
+        result = set()
+        if not text:
+            return result
+
+        pattern = "%" + text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+        query = QtSql.QSqlQuery()
+        query.setForwardOnly(True)
+        query.prepare("""
+                        SELECT signage_id
+                        FROM signage
+                        WHERE
+                            signage.workspace_id = :workspace_id
+                        AND
+                            (signage.note LIKE :pattern ESCAPE '\\' OR signage.public_note LIKE :pattern ESCAPE '\\');
+                      """)
+        query.bindValue(":workspace_id", AppDatabase.activeWorkspace().id)
+        query.bindValue(":pattern", pattern)
+
+        if not query.exec():
+            logger.error(f"Query execution failed with error : {query.lastError().text()}")
+            return result
+
+        while query.next():
+            result.add(query.value(0))
+
+        return result
+
+    @classmethod
+    def updateConnectorSyncState(cls, connector: Connector) -> bool:
+        """Save the state of the last synchronisation of a connector"""
+        query = QtSql.QSqlQuery()
+        query.prepare("""
+                        UPDATE connectors
+                        SET
+                            last_modified = :last_modified,
+                            size = :size,
+                            content_hash = :content_hash,
+                            line_ids = :line_ids
+                        WHERE
+                            id = :id;
+                      """)
+        query.bindValue(":last_modified", str(connector.last_modified))
+        query.bindValue(":size", connector.size)
+        query.bindValue(":content_hash", connector.content_hash)
+        query.bindValue(":line_ids", json.dumps(sorted(connector.line_ids)))
+        query.bindValue(":id", connector.uid)
+
+        if not query.exec():
+            logger.error(f"Fail to update connector {connector.uid} sync state: {query.lastError().text()}")
+            return False
+
+        return True
+
+    @classmethod
+    def writeGeneration(cls) -> tuple:
+        """Return a value that changes whenever the database is written
+
+        total_changes() counts the rows written by this connection and data_version
+        changes on commits from other connections.
+        """
+        query = QtSql.QSqlQuery()
+        if not query.exec("""SELECT total_changes();""") or not query.next():
+            return None
+        total_changes = query.value(0)
+
+        if not query.exec("""PRAGMA data_version;""") or not query.next():
+            return None
+        data_version = query.value(0)
+
+        return total_changes, data_version
+
+    @classmethod
+    def _cachedQuery(cls, name: str, func: callable, use_cache: bool):
+        """Return the result of func, reused as long as the database was not written"""
+        key = (cls.activeWorkspace().id, cls.writeGeneration())
+
+        if use_cache and key[1] is not None:
+            cached = cls._query_cache.get(name)
+            if cached is not None and cached[:2] == key:
+                return cached[2]
+
+        result = func()
+        cls._query_cache[name] = (*key, result)
+        return result
+
+    @classmethod
+    def querySignageSummary(cls, use_cache: bool = True) -> dict[tuple, int]:
+        """Count the signages per (status, type) uid"""
+        def func():
+            result = {}
+            query = QtSql.QSqlQuery()
+            query.setForwardOnly(True)
+            query.prepare("""
+                            SELECT status, type, COUNT(*)
+                            FROM signage
+                            WHERE
+                                signage.workspace_id = :workspace_id
+                            GROUP BY
+                                status, type;
+                          """)
+            query.bindValue(":workspace_id", cls.activeWorkspace().id)
+
+            if not query.exec():
+                logger.error(f"Query execution failed with error : {query.lastError().text()}")
+                return result
+
+            while query.next():
+                result[(query.value(0), query.value(1))] = query.value(2)
+            return result
+
+        return cls._cachedQuery("signage_summary", func, use_cache)
+
+    @classmethod
+    def queryEvidenceSummary(cls, use_cache: bool = True) -> dict[int, int]:
+        """Count the documents per status uid"""
+        def func():
+            result = {}
+            query = QtSql.QSqlQuery()
+            query.setForwardOnly(True)
+            query.prepare("""
+                            SELECT status, COUNT(*)
+                            FROM document
+                            WHERE
+                                document.workspace_id = :workspace_id
+                            GROUP BY
+                                status;
+                          """)
+            query.bindValue(":workspace_id", cls.activeWorkspace().id)
+
+            if not query.exec():
+                logger.error(f"Query execution failed with error : {query.lastError().text()}")
+                return result
+
+            while query.next():
+                result[query.value(0)] = query.value(1)
+            return result
+
+        return cls._cachedQuery("evidence_summary", func, use_cache)
+
     @classmethod
     def lastSignageInserted(cls):
         query = QtSql.QSqlQuery()
@@ -258,6 +258,10 @@ class ViewerWidget(QtWidgets.QWidget):
     def source(self) -> str:
         ...
 
+    def goToPage(self, page: int):
+        """Show the page (0-based), viewers without pages ignore it"""
+        ...
+
     @Slot()
     def createChildSignage(self):
         signage_id = self.signage_id.text()
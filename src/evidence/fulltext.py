@@ -0,0 +1,288 @@
+"""Full-text search over the evidence of the workspace
+
+The text of the documents (PDF through MuPDF, Word through a streaming XML
+reader, text and markdown as is) is extracted on a process pool and stored in
+the document_text index shared with the PDF viewer. A document is indexed again
+when its file changes, its text is removed with it from the document table.
+"""
+import logging
+import os
+
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+
+from qtpy import QtCore, QtGui, QtWidgets, QtSql, Signal, Slot
+
+from database.database import AppDatabase
+from PyMuPDF4QT.text_index import fileState, matchExpression, writePages
+from utilities.text_extractor import SUPPORTED_SUFFIXES, TEXT_VERSION, extractPages
+from utilities import config as mconf
+
+
+logger = logging.getLogger(__name__)
+
+
+class IndexerSignals(QtCore.QObject):
+    progress = Signal(int, int) # indexed, total
+    finished = Signal(int) # documents indexed
+
+
+class WorkspaceIndexWorker(QtCore.QRunnable):
+    """Index the documents of the workspace not indexed yet or changed since"""
+    def __init__(self, workspace_id: int, max_workers: int | None = None, batch: int = 4):
+        super().__init__()
+        self.workspace_id = workspace_id
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.batch = batch # documents in flight per process
+        self._abort = False
+        self.signals = IndexerSignals()
+
+    def abort(self):
+        self._abort = True
+
+    def staleDocuments(self, db: QtSql.QSqlDatabase) -> list[tuple[int, str, tuple[int, int]]]:
+        """Return (id, filepath, file state) of the documents to index"""
+        stale = []
+        query = QtSql.QSqlQuery(db)
+        query.setForwardOnly(True)
+        query.prepare("""
+                        SELECT
+                            document.id,
+                            document.filepath,
+                            document_text_state.mtime,
+                            document_text_state.size,
+                            document_text_state.version
+                        FROM document
+                        LEFT JOIN document_text_state ON document_text_state.document_id = document.id
+                        WHERE
+                            document.workspace_id = :workspace_id;
+                      """)
+        query.bindValue(":workspace_id", self.workspace_id)
+
+        if not query.exec():
+            logger.error(f"Query execution failed with error : {query.lastError().text()}")
+            return stale
+
+        while query.next():
+            filepath: str = query.value(1)
+            if not filepath or Path(filepath).suffix.lower() not in SUPPORTED_SUFFIXES:
+                continue
+
+            state = fileState(filepath)
+            if state is not None and (state != (query.value(2), query.value(3)) or query.value(4) != TEXT_VERSION):
+                stale.append((query.value(0), filepath, state))
+
+        return stale
+
+    def run(self):
+        name = f"workspace_index_{id(self)}"
+        db = AppDatabase.openWriteConnection(name)
+        if db is None:
+            self.signals.finished.emit(0)
+            return
+
+        indexed = 0
+        stale = self.staleDocuments(db)
+        executor = ProcessPoolExecutor(max_workers=self.max_workers) if stale else None
+
+        try:
+            pending = {}
+            documents = iter(stale)
+            while not self._abort:
+                # Bounded number of documents in flight, the texts are written as they come
+                for document_id, filepath, state in documents:
+                    pending[executor.submit(extractPages, filepath)] = (document_id, filepath, state)
+                    if len(pending) >= self.max_workers * self.batch:
+                        break
+
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    document_id, filepath, state = pending.pop(future)
+                    try:
+                        pages = future.result()
+                    except Exception as e:
+                        # Not extracted again until the file changes
+                        logger.error(f"Cannot extract the text of {filepath} - Error: {e}")
+                        pages = []
+
+                    if writePages(db, document_id, pages, state):
+                        indexed += 1
+                    self.signals.progress.emit(indexed, len(stale))
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+            del db
+            AppDatabase.closeConnection(name)
+
+        logger.info(f"Full-text index: {indexed} of {len(stale)} document(s) indexed")
+        self.signals.finished.emit(indexed)
+
+
+class TextIndexer(QtCore.QObject):
+    """Keep the full-text index of the active workspace up to date in the background
+
+    An update requested while indexing runs again once the current one is finished.
+    """
+    sigProgress = Signal(int, int)
+    sigFinished = Signal(int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._worker: WorkspaceIndexWorker = None
+        self._pending = False
+
+    def isIndexing(self) -> bool:
+        return self._worker is not None
+
+    @Slot()
+    def update(self):
+        if self._worker is not None:
+            self._pending = True
+            return
+
+        workspace_id = AppDatabase.activeWorkspace().id
+        if not workspace_id:
+            return
+
+        self._pending = False
+        max_workers = mconf.settings.value("FULLTEXT_INDEX_PROCESSES", max(1, (os.cpu_count() or 2) // 2), int)
+        self._worker = WorkspaceIndexWorker(workspace_id, max_workers)
+        self._worker.signals.progress.connect(self.sigProgress)
+        self._worker.signals.finished.connect(self._onFinished)
+        QtCore.QThreadPool.globalInstance().start(self._worker)
+
+    def stop(self):
+        self._pending = False
+        if self._worker is not None:
+            self._worker.abort()
+
+    @Slot(int)
+    def _onFinished(self, indexed: int):
+        self._worker = None
+        self.sigFinished.emit(indexed)
+
+        if self._pending:
+            self.update()
+
+
+def searchWorkspace(text: str, workspace_id: int, limit: int = 500) -> list[dict] | None:
+    """Return the pages of the workspace documents containing the text
+
+    [{"id", "title", "filepath", "page", "snippet"}] sorted by title and page,
+    at most `limit` pages. None if the text is too short for the index.
+    """
+    match = matchExpression(text)
+    if match is None:
+        return None
+
+    results = []
+    query = QtSql.QSqlQuery()
+    query.setForwardOnly(True)
+    query.prepare("""
+                    SELECT
+                        document.id,
+                        document.title,
+                        document.filepath,
+                        document_text.page,
+                        snippet(document_text_fts, 0, '', '', '...', 64)
+                    FROM document_text_fts
+                    JOIN document_text ON document_text.id = document_text_fts.rowid
+                    JOIN document ON document.id = document_text.document_id
+                    WHERE
+                        document_text_fts MATCH :match
+                    AND
+                        document.workspace_id = :workspace_id
+                    ORDER BY
+                        document.title, document.id, document_text.page
+                    LIMIT :limit;
+                  """)
+    query.bindValue(":match", match)
+    query.bindValue(":workspace_id", workspace_id)
+    query.bindValue(":limit", limit)
+
+    if not query.exec():
+        logger.error(f"Query execution failed with error : {query.lastError().text()}")
+        return results
+
+    while query.next():
+        results.append({"id": query.value(0),
+                        "title": query.value(1),
+                        "filepath": query.value(2),
+                        "page": query.value(3),
+                        "snippet": query.value(4)})
+
+    return results
+
+
+class FullTextSearchPane(QtWidgets.QWidget):
+    """Search the text of the workspace documents, a double click opens the document at the page"""
+    sigOpenPage = Signal(int, int) # document id, page
+
+    class Columns:
+        Title = 0
+        Page = 1
+        Text = 2
+
+    def __init__(self, indexer: TextIndexer, parent=None):
+        super().__init__(parent)
+        self.indexer = indexer
+        self.limit = 500
+
+        self.search_edit = QtWidgets.QLineEdit(self)
+        self.search_edit.setPlaceholderText("Search in evidence content")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_edit.returnPressed.connect(self.searchFor)
+
+        self.status = QtWidgets.QLabel(self)
+
+        self.model = QtGui.QStandardItemModel(self)
+        self.model.setHorizontalHeaderLabels(["Title", "Page", "Text"])
+
+        self.results = QtWidgets.QTreeView(self)
+        self.results.setModel(self.model)
+        self.results.setRootIsDecorated(False)
+        self.results.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.results.setUniformRowHeights(True)
+        self.results.doubleClicked.connect(self.onResultDoubleClicked)
+
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.addWidget(self.search_edit)
+        layout.addWidget(self.status)
+        layout.addWidget(self.results)
+
+        self.indexer.sigProgress.connect(self.onIndexProgress)
+        self.indexer.sigFinished.connect(lambda: self.status.setText(""))
+
+    @Slot()
+    def searchFor(self):
+        self.model.removeRows(0, self.model.rowCount())
+
+        results = searchWorkspace(self.search_edit.text(), AppDatabase.activeWorkspace().id, self.limit)
+        if results is None:
+            self.status.setText("Type at least 3 characters")
+            return
+
+        for result in results:
+            title = QtGui.QStandardItem(result["title"])
+            title.setData(result["id"], QtCore.Qt.ItemDataRole.UserRole)
+            title.setToolTip(result["filepath"])
+            page = QtGui.QStandardItem(str(result["page"] + 1))
+            page.setData(result["page"], QtCore.Qt.ItemDataRole.UserRole)
+            self.model.appendRow([title, page, QtGui.QStandardItem(result["snippet"])])
+
+        count = f"{len(results)}+" if len(results) == self.limit else f"{len(results)}"
+        self.status.setText(f"Pages: {count}" + (" (indexing...)" if self.indexer.isIndexing() else ""))
+        self.results.resizeColumnToContents(self.Columns.Title)
+
+    @Slot(int, int)
+    def onIndexProgress(self, indexed: int, total: int):
+        self.status.setText(f"Indexing {indexed}/{total}")
+
+    @Slot(QtCore.QModelIndex)
+    def onResultDoubleClicked(self, index: QtCore.QModelIndex):
+        document_id = index.sibling(index.row(), self.Columns.Title).data(QtCore.Qt.ItemDataRole.UserRole)
+        page = index.sibling(index.row(), self.Columns.Page).data(QtCore.Qt.ItemDataRole.UserRole)
+        self.sigOpenPage.emit(document_id, page)
@@ -305,24 +305,25 @@ class EvidenceModel(QSqlRelationalTableModel):
             record.setValue(self.Fields.Filepath.index, fpath.as_posix())
             self.refresh()
     
-    def summary(self) -> list:
+    def summary(self, use_cache: bool = True) -> list:
         vheaders = []
+        status_rows = {}
         status_model = self.relationModel(self.Fields.Status.index)
         for row in range(status_model.rowCount()):
             record = status_model.record(row)
             vheaders.append(record.value("name"))
+            status_rows[record.value("uid")] = row
         vheaders.append("Total")
         hheaders = ["Count"]
 
         data = [[0] for _ in range(len(vheaders))] 
 
         # Populate data table
-        for row in range(self.rowCount()):
-            sname = self.index(row, self.Fields.Status.index).data(QtCore.Qt.ItemDataRole.DisplayRole)
-            s = vheaders.index(sname)
+        for status, count in AppDatabase.queryEvidenceSummary(use_cache).items():
+            s = status_rows.get(status)
 
             if s is not None:
-                data[int(s)][0] += 1    # row data
-                data[-1][0] += 1        # Total row
+                data[s][0] += count    # row data
+                data[-1][0] += count   # Total row
 
         return data, vheaders, hheaders
@@ -10,6 +10,7 @@ from qtpy import Qt, QtGui, QtCore, Signal, Slot, QtWidgets, QtSql
 from database.database import AppDatabase
 
 from evidence.model import EvidenceModel
+from evidence.fulltext import TextIndexer, FullTextSearchPane
 from evidence.style import TABLE_STYLE
 from signage.model import SignageModel, SignageSqlModel
 
@@ -195,6 +196,7 @@ class StatusColorDelegate(QtWidgets.QStyledItemDelegate):
 
 class EvidenceTab(BaseTab):
     sigOpenDocument = Signal(object, QtCore.QModelIndex)
+    sigOpenDocumentPage = Signal(object, QtCore.QModelIndex, int)
     sigCreateSignage = Signal(str, dict)
     sigCreateChildSignage = Signal(int, dict)
     sigUpdateReviewProgress = Signal()
@@ -214,8 +216,10 @@ class EvidenceTab(BaseTab):
         self.signage_model = signage_model
         self.startSpinner = startSpinner
         self.stopSpinner = stopSpinner
+        self.text_indexer = TextIndexer(self)
         self.createAction()
         self.initUI()
+        self.text_indexer.update()
 
     def initUI(self):
         # --- Left Pane ---
@@ -228,6 +232,10 @@ class EvidenceTab(BaseTab):
         self.signage_filter.table.clicked.connect(self.onRequestFilterClicked)
         self.left_pane.addTab(self.signage_filter, theme_icon_manager.get_icon(":request"), "")
 
+        self.fulltext_search = FullTextSearchPane(self.text_indexer)
+        self.fulltext_search.sigOpenPage.connect(self.openDocumentPage)
+        self.left_pane.addTab(self.fulltext_search, theme_icon_manager.get_icon(":search-line"), "")
+
         # --- Table ---
         self.table = QtWidgets.QTreeView()
         self.table.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers) # ReadOnly
@@ -309,7 +317,7 @@ class EvidenceTab(BaseTab):
         self.status.currentIndexChanged[int].connect(self.mapper.submit)
 
          # --- Connections ---
-        self.search_tool.textChanged.connect(self.searchfor)
+        self.search_timer.timeout.connect(self.searchfor)
         self.status.activated.connect(self.sigUpdateReviewProgress)
         self.refkey.editingFinished.connect(self.sigUpdateReviewProgress)
         self.refkey.editingFinished.connect(AppDatabase.update_document_signage_id)
@@ -613,6 +621,28 @@ class EvidenceTab(BaseTab):
     @Slot(QtCore.QModelIndex)
     def onTableDoubleClicked(self, index: QtCore.QModelIndex):
         sidx = self.proxy_model.mapToSource(index) # Source index
+        self.sigOpenDocument.emit(self.documentFromIndex(sidx), sidx)
+
+    @Slot(int, int)
+    def openDocumentPage(self, document_id: int, page: int):
+        """Open the document of the full-text search result at the page"""
+        while self._model.canFetchMore():
+            self._model.fetchMore()
+
+        indexes = self._model.match(self._model.index(0, self._model.Fields.ID.index),
+                                    QtCore.Qt.ItemDataRole.DisplayRole,
+                                    document_id,
+                                    1,
+                                    QtCore.Qt.MatchFlag.MatchExactly)
+        if not indexes:
+            logger.error(f"Document {document_id} not found in the evidence table")
+            return
+
+        sidx = indexes[0]
+        self.sigOpenDocumentPage.emit(self.documentFromIndex(sidx), sidx, page)
+
+    def documentFromIndex(self, sidx: QtCore.QModelIndex) -> Document:
+        """Return the Document of the row of the source model index"""
         r = sidx.row() #row
 
         doc = Document(refkey=sidx.sibling(r, self._model.Fields.Refkey.index).data(QtCore.Qt.ItemDataRole.DisplayRole),
@@ -629,7 +659,7 @@ class EvidenceTab(BaseTab):
 
         doc.filepath = sidx.sibling(r, self._model.Fields.Filepath.index).data(QtCore.Qt.ItemDataRole.DisplayRole)
 
-        self.sigOpenDocument.emit(doc, sidx)
+        return doc
 
     @Slot()
     def searchfor(self):
@@ -699,6 +729,7 @@ class EvidenceTab(BaseTab):
         self.sigCreateChildSignage.emit(signage_id, source)
 
     def _on_load_ended(self, m: str = ""):
+        self.text_indexer.update()
         self.sigUpdateReviewProgress.emit()
         self.stopSpinner(m)
         self.table.sortByColumn(EvidenceModel.Fields.Title.index, QtCore.Qt.SortOrder.AscendingOrder)
@@ -742,8 +773,10 @@ class EvidenceTab(BaseTab):
         self._model.refresh()
         self.doc_filter.setRootPath(AppDatabase.activeWorkspace().evidence_path)
         self.onResetFilters()
+        self.text_indexer.update()
 
     def closeEvent(self, a0):
+        self.text_indexer.stop()
         self.saveTableColumnWidth()
         self.mapper.submit()
         return super().closeEvent(a0)
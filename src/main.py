@@ -1,4 +1,5 @@
 import sys
+import multiprocessing
 import logging
 import logging.config
 from uuid import uuid4
@@ -95,4 +96,5 @@ def main() -> int:
     return sys.exit(app.exec())
 
 if __name__ == '__main__':
+    multiprocessing.freeze_support()
     sys.exit(main())
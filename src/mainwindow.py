@@ -50,7 +50,7 @@ class MainWindow(QtWidgets.QMainWindow):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.force_close = False
-        self.signage_treemodel = SignageModel()
+        self.signage_treemodel = SignageModel(lazy=mconf.settings.value("LAZY_SIGNAGE_TREE", False, bool))
         self.evidence_model = EvidenceModel()
         self.viewer_factory = ViewerFactory(self.evidence_model, self)
         self.workspace_manager =  None
@@ -283,6 +283,12 @@ class MainWindow(QtWidgets.QMainWindow):
         self.alternating_table_row_color.setCheckable(True)
         self.view_menu.addAction(self.alternating_table_row_color)
 
+        self.lazy_signage_tree = QtGui.QAction("Load signage children on expand (restart required)",
+                                               self.view_menu,
+                                               triggered=self.saveSettings)
+        self.lazy_signage_tree.setCheckable(True)
+        self.view_menu.addAction(self.lazy_signage_tree)
+
         app_menu = QtWidgets.QMenu("Application FontSize", self.menubar)
         app_menu.addAction(QtGui.QAction("Small", self, triggered=lambda: self.setAppFont(9.0)))
         app_menu.addAction(QtGui.QAction("Medium", self, triggered=lambda: self.setAppFont(10.0)))
@@ -338,6 +344,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self.signage_tree_tab.sigOpenNote.connect(self.onOpenNoteTriggered)
         self.evidence_model.modelReset.connect(self.onEvidenceModelReset)
         self.evidence_tab.sigOpenDocument.connect(self.onOpenEvidenceTriggered)
+        self.evidence_tab.sigOpenDocumentPage.connect(self.onOpenEvidencePageTriggered)
         self.evidence_tab.sigCreateChildSignage.connect(self.signage_tree_tab.createChildSignage)
         self.evidence_tab.sigCreateSignage.connect(self.signage_tree_tab.createSignage)
         self.evidence_tab.sigUpdateReviewProgress.connect(self.signage_tree_tab.updateReviewProgess)
@@ -404,12 +411,14 @@ class MainWindow(QtWidgets.QMainWindow):
     def loadSettings(self):
         self.file_open_option.setChecked(mconf.settings.value("USE_DEFAULT_FILEOPENER", False, bool))
         self.alternating_table_row_color.setChecked(mconf.settings.value("ALTERNATING_TABLE_ROW_COLOR", False, bool))
+        self.lazy_signage_tree.setChecked(mconf.settings.value("LAZY_SIGNAGE_TREE", False, bool))
         self.onSettingsChanged()
 
     @Slot()
     def saveSettings(self):
         mconf.settings.setValue("USE_DEFAULT_FILEOPENER", self.file_open_option.isChecked())
         mconf.settings.setValue("ALTERNATING_TABLE_ROW_COLOR", self.alternating_table_row_color.isChecked())
+        mconf.settings.setValue("LAZY_SIGNAGE_TREE", self.lazy_signage_tree.isChecked())
         self.onSettingsChanged()
     
     def onSettingsChanged(self):
@@ -440,6 +449,17 @@ class MainWindow(QtWidgets.QMainWindow):
         else:
             status_signal.status_message.emit("Cannot open file", 7000)
 
+    @Slot(object, QtCore.QModelIndex, int)
+    def onOpenEvidencePageTriggered(self, doc: Document, index, page: int):
+        if self.file_open_option.isChecked():
+            utils.open_file(doc.filepath)
+            return
+
+        self.onOpenEvidenceTriggered(doc, index)
+
+        if self.viewer is not None:
+            self.viewer.goToPage(page)
+
     def onOpenNoteTriggered(self, filepath, anchor = ""):
         self.notepad_tab.loadfile(filename=filepath, anchor=anchor)
         self.notepad_dock_widget.toggleView()
@@ -0,0 +1,298 @@
+"""Concurrent OneNote tag fetcher
+
+Each section is fetched by a backend process writing the section's tags as a
+JSON array on stdout. Several sections are fetched at once, and the output
+is parsed item by item as it is read from the pipe.
+
+The backend only builds the process command lines: `PowershellBackend` runs
+the OneNote COM scrapper and GetHierarchy, `ReplayBackend` runs a script replaying recorded
+JSON (see tests/onenote_replay.py) so the pipeline can run without OneNote.
+"""
+import sys
+import json
+import codecs
+import queue
+import logging
+import tempfile
+import subprocess
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from xml.etree import ElementTree as ET
+from typing import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+
+from common import OETag
+from utilities.utils import get_safe_temp_path
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = " \t\r\n"
+
+
+def iterJsonItems(stream, chunk_size: int = 1 << 16) -> Iterator:
+    """Yield the items of a top-level JSON array as they are read from a binary stream
+
+    A top-level value other than an array is yielded as a single item, `null`
+    and empty output yield nothing.
+    """
+    read = getattr(stream, "read1", stream.read)  # return as soon as some bytes are available
+    decode = codecs.getincrementaldecoder("utf-8-sig")().decode
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    in_array = None
+
+    while True:
+        chunk = read(chunk_size)
+        eof = not chunk
+        buffer = buffer[pos:] + decode(chunk, final=eof)
+        pos = 0
+
+        while True:
+            while pos < len(buffer) and (buffer[pos] in _WHITESPACE or (in_array and buffer[pos] == ",")):
+                pos += 1
+            if pos == len(buffer):
+                break
+
+            if in_array is None:
+                in_array = buffer[pos] == "["
+                if in_array:
+                    pos += 1
+                    continue
+            elif in_array and buffer[pos] == "]":
+                return
+
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                break
+
+            # The item may be truncated (e.g. '2.' of '2.5'): wait for the next delimiter
+            if not eof:
+                next_pos = end
+                while next_pos < len(buffer) and buffer[next_pos] in _WHITESPACE:
+                    next_pos += 1
+                if next_pos == len(buffer) or (in_array and buffer[next_pos] not in ",]"):
+                    break
+
+            pos = end
+            if item is not None:
+                yield item
+
+        if eof:
+            if in_array:
+                raise json.JSONDecodeError("Unterminated array", buffer, pos)
+            return
+
+
+class TagFetchError(Exception):
+    """The tags of a section cannot be fetched"""
+
+    def __init__(self, section_id: str, message: str):
+        super().__init__(f"Cannot fetch section {section_id}. {message}")
+        self.section_id = section_id
+
+
+class TagBackend(ABC):
+    """Build the command fetching the tags of a OneNote section"""
+
+    @abstractmethod
+    def command(self, section_id: str) -> list[str]:
+        """Build the command writing the section's tags as a JSON array on stdout"""
+
+    @abstractmethod
+    def sectionCommand(self, section_id: str) -> list[str]:
+        """Build the command writing the section hierarchy node (without pages) on stdout"""
+
+
+class PowershellBackend(TagBackend):
+    """Fetch the tags through the OneNote COM API with the onenotescrapper.ps1 script"""
+
+    def __init__(self, ps_script: str):
+        self.ps_script = ps_script
+
+    def command(self, section_id: str) -> list[str]:
+        outfile = ""
+
+        if logging.root.level == logging.DEBUG:
+            outfile = get_safe_temp_path().joinpath(f"output_{section_id}.json").as_posix()
+            logger.debug(f"Output powershell will written to '{outfile}'")
+
+        return ["powershell", "-NoProfile",
+                "-File", self.ps_script,
+                "-SectionId", section_id,
+                "-OutputJson", outfile]
+
+    def sectionCommand(self, section_id: str) -> list[str]:
+        # The id is quoted in the script: escape the quotes of PowerShell single-quoted strings
+        section_id = section_id.replace("'", "''")
+        ps_script = ("$OutputEncoding = [Console]::OutputEncoding = [System.Text.UTF8Encoding]::new(); "
+                     "$OneNote = New-Object -ComObject OneNote.Application; "
+                     "[xml]$Hierarchy = ''; "
+                     f"$OneNote.GetHierarchy('{section_id}', 0, [ref]$Hierarchy); "
+                     "$Hierarchy.outerXml")
+        return ["powershell", "-NoProfile", "-Command", ps_script]
+
+
+class ReplayBackend(TagBackend):
+    """Replay the JSON recorded for each section in a folder ('<section_id>.json')"""
+
+    def __init__(self, folder: str | Path, script: str | Path, delay: float = 0.0):
+        self.folder = Path(folder)
+        self.script = Path(script)
+        self.delay = delay
+
+    def command(self, section_id: str) -> list[str]:
+        return [sys.executable, self.script.as_posix(),
+                "--folder", self.folder.as_posix(),
+                "--section-id", section_id,
+                "--delay", str(self.delay)]
+
+    def sectionCommand(self, section_id: str) -> list[str]:
+        return [sys.executable, self.script.as_posix(),
+                "--folder", self.folder.as_posix(),
+                "--section-id", section_id,
+                "--hierarchy"]
+
+
+class TagFetcher:
+    """Fetch the tags of several sections concurrently
+
+    At most `max_workers` backend processes run at the same time.
+    """
+    _DONE = object()
+
+    def __init__(self, backend: TagBackend, max_workers: int = 4):
+        self.backend = backend
+        self.max_workers = max(1, max_workers)
+        self._processes: set[subprocess.Popen] = set()
+        self._lock = threading.Lock()
+
+    def sectionLastModified(self, section_id: str, timeout: float = 60) -> str | None:
+        """Return the lastModifiedTime of a section, a cheap change signal compared to fetching its tags"""
+        command = self.backend.sectionCommand(section_id)
+
+        try:
+            process = subprocess.run(command, check=True, capture_output=True, timeout=timeout)
+            xml = ET.fromstring(process.stdout.strip())
+        except subprocess.CalledProcessError as e:
+            logger.error(f"Cannot query section {section_id}\n"
+                         f"\tCommand: {command}\n"
+                         f"\tReturn Code: {e.returncode}\n"
+                         f"\tError Output: {e.stderr.decode('utf-8', errors='replace')}")
+            return None
+        except Exception as e:
+            logger.error(f"Cannot query section {section_id}. Error: {e}")
+            return None
+
+        return xml.get("lastModifiedTime")
+
+    def fetchSection(self, section_id: str, stop: threading.Event | None = None) -> Iterator[OETag]:
+        """Yield the tags of a section as the backend outputs them
+
+        Raise `TagFetchError` if the backend cannot be started, fails or outputs invalid JSON,
+        so that a failed section is not mistaken for a section without tags.
+        """
+        command = self.backend.command(section_id)
+
+        # stderr is only read once the process has exited: a file cannot fill up and block the backend
+        stderr_file = tempfile.TemporaryFile()
+        try:
+            process = subprocess.Popen(command,
+                                       stdout=subprocess.PIPE,
+                                       stderr=stderr_file)
+        except Exception as e:
+            stderr_file.close()
+            raise TagFetchError(section_id, f"Cannot start tag backend. Error: {e}") from e
+
+        with self._lock:
+            self._processes.add(process)
+
+        error = None
+        try:
+            for item in iterJsonItems(process.stdout):
+                if stop is not None and stop.is_set():
+                    return
+
+                if not isinstance(item, dict):
+                    logger.error(f"JSON output of section {section_id} contains non-dict item: {item}")
+                    continue
+
+                try:
+                    yield OETag.from_dict(item)
+                except Exception as e:
+                    logger.error(f"Cannot decrompress dict into dataclass. Error={e}\n\tData:{item}")
+        except json.JSONDecodeError as e:
+            error = f"Cannot parse output using json. Error={e}"
+        finally:
+            with self._lock:
+                self._processes.discard(process)
+            if process.poll() is None and ((stop is not None and stop.is_set()) or error is not None):
+                process.kill()
+            process.stdout.close()
+            returncode = process.wait()
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode("utf-8", errors="replace")
+            stderr_file.close()
+
+        if stop is not None and stop.is_set():
+            return
+
+        if returncode != 0:
+            raise TagFetchError(section_id,
+                                f"Tag backend failed\n"
+                                f"\tCommand: {command}\n"
+                                f"\tReturn Code: {returncode}\n"
+                                f"\tError Output: {stderr}")
+
+        if error is not None:
+            raise TagFetchError(section_id, error)
+
+    def fetch(self, section_ids: Iterable[str]) -> Iterator[tuple[str, OETag | TagFetchError]]:
+        """Yield (section_id, tag) pairs as soon as they are parsed, whatever the section
+
+        A section which cannot be fetched yields a `TagFetchError` in place of a tag, after the
+        tags parsed before the failure: the other sections are still fetched.
+        """
+        section_ids = list(dict.fromkeys(section_ids))
+        if not section_ids:
+            return
+
+        results = queue.Queue()
+        stop = threading.Event()
+
+        def work(section_id: str):
+            try:
+                for tag in self.fetchSection(section_id, stop):
+                    results.put((section_id, tag))
+            except TagFetchError as e:
+                results.put((section_id, e))
+            except Exception as e:
+                logger.error(f"Unexepected error occured while fetching section {section_id}. Error: {e}")
+                results.put((section_id, TagFetchError(section_id, f"Unexpected error: {e}")))
+            finally:
+                results.put((section_id, self._DONE))
+
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(section_ids)),
+                                      thread_name_prefix="onenote-fetch")
+        for section_id in section_ids:
+            executor.submit(work, section_id)
+
+        pending = len(section_ids)
+        try:
+            while pending:
+                section_id, tag = results.get()
+                if tag is self._DONE:
+                    pending -= 1
+                    continue
+                yield section_id, tag
+        finally:
+            # Consumer stopped early: do not wait for the running processes
+            stop.set()
+            with self._lock:
+                for process in self._processes:
+                    process.kill()
+            executor.shutdown(wait=True, cancel_futures=True)
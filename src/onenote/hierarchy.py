@@ -0,0 +1,154 @@
+"""Lazy loader for the OneNote hierarchy XML
+
+`parseHierarchy` streams the output of `GetHierarchy` with iterparse and only
+builds the notebooks and their top-level sections. The children of section
+groups and the pages of sections are built the first time the node is
+iterated, page `Meta` nodes are dropped while parsing.
+"""
+import logging
+from xml.etree import ElementTree as ET
+
+from onenote.onenote_api import namespace
+
+
+logger = logging.getLogger(__name__)
+
+_SECTION = namespace + "Section"
+_SECTION_GROUP = namespace + "SectionGroup"
+_PAGE = namespace + "Page"
+
+
+class HierarchyNode:
+    __slots__ = ("name", "path", "id", "last_modified_time", "parent")
+
+    def __init__(self, xml: ET.Element, parent=None):
+        name = xml.get("name")
+        self.name = name if name else "other"
+        self.path = xml.get("path")
+        self.id = xml.get("ID")
+        self.last_modified_time = xml.get("lastModifiedTime")
+        self.parent = parent
+
+    def __str__(self):
+        return self.name
+
+
+class Notebook(HierarchyNode):
+    __slots__ = ("nickname", "color", "is_currently_viewed", "recycle_bin", "_children")
+
+    def __init__(self, xml: ET.Element, parent=None):
+        super().__init__(xml, parent)
+        self.nickname = xml.get("nickname")
+        self.color = xml.get("color")
+        self.is_currently_viewed = xml.get("isCurrentlyViewed")
+        self.recycle_bin = None
+        self._children = []
+
+        for node in xml:
+            if node.tag == _SECTION:
+                self._children.append(Section(node, self))
+            elif node.tag == _SECTION_GROUP:
+                if node.get("isRecycleBin"):
+                    self.recycle_bin = SectionGroup(node, self)
+                else:
+                    self._children.append(SectionGroup(node, self))
+
+    def __iter__(self):
+        yield from self._children
+
+    def __str__(self):
+        return self.nickname if self.nickname else self.name
+
+
+class SectionGroup(HierarchyNode):
+    """Section group, its sections and section groups are built on first iteration"""
+    __slots__ = ("is_recycle_bin", "_xml", "_children")
+
+    def __init__(self, xml: ET.Element, parent=None):
+        super().__init__(xml, parent)
+        self.is_recycle_bin = bool(xml.get("isRecycleBin"))
+        self._xml = xml
+        self._children = None
+
+    def isExpanded(self) -> bool:
+        return self._children is not None
+
+    def __iter__(self):
+        if self._children is None:
+            self._children = []
+            for node in self._xml:
+                if node.tag == _SECTION_GROUP:
+                    self._children.append(SectionGroup(node, self))
+                elif node.tag == _SECTION:
+                    self._children.append(Section(node, self))
+            self._xml = None
+        yield from self._children
+
+
+class Section(HierarchyNode):
+    """Section, its pages are built on first iteration"""
+    __slots__ = ("color", "read_only", "is_currently_viewed", "_xml", "_children")
+
+    def __init__(self, xml: ET.Element, parent=None):
+        super().__init__(xml, parent)
+        self.color = xml.get("color")
+        self.read_only = xml.get("readOnly", False)
+        self.is_currently_viewed = xml.get("isCurrentlyViewed", False)
+        self._xml = xml
+        self._children = None
+
+    def isExpanded(self) -> bool:
+        return self._children is not None
+
+    def __iter__(self):
+        if self._children is None:
+            self._children = [Page(node, self) for node in self._xml if node.tag == _PAGE]
+            self._xml = None
+        yield from self._children
+
+
+class Page:
+    __slots__ = ("name", "id", "date_time", "last_modified_time", "page_level", "is_currently_viewed", "parent")
+
+    def __init__(self, xml: ET.Element, parent=None):
+        self.name = xml.get("name")
+        self.id = xml.get("ID")
+        self.date_time = xml.get("dateTime")
+        self.last_modified_time = xml.get("lastModifiedTime")
+        self.page_level = xml.get("pageLevel")
+        self.is_currently_viewed = xml.get("isCurrentlyViewed")
+        self.parent = parent
+
+    def __str__(self):
+        return self.name
+
+
+def parseHierarchy(source) -> list[Notebook]:
+    """Parse the XML returned by `GetHierarchy` (file name or binary file object)
+
+    Every child of the root element becomes a Notebook, like `onenote_api.Hierarchy`
+    (e.g. 'UnfiledNotes' and 'OpenSections' nodes).
+    """
+    notebooks = []
+    root = None
+    depth = 0
+
+    for event, element in ET.iterparse(source, events=("start", "end")):
+        if event == "start":
+            if root is None:
+                root = element
+            depth += 1
+            continue
+
+        depth -= 1
+        if element.tag == _PAGE:
+            # Only the page attributes are used, drop Meta nodes
+            for child in list(element):
+                element.remove(child)
+        elif depth == 1:
+            notebooks.append(Notebook(element))
+            root.remove(element)
+
+    logger.debug(f"{len(notebooks)} notebook(s) loaded from hierarchy")
+
+    return notebooks
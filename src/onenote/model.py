@@ -1,10 +1,11 @@
 import logging
 import subprocess
 from qtpy import QtGui, QtCore, Signal
+from io import BytesIO
 from onenote import onenote_api as OE
-from xml.etree import ElementTree as ET
+from onenote import hierarchy
 
-from utilities.utils import get_safe_temp_path, json
+from onenote.fetcher import TagFetcher, PowershellBackend
 from common import OETag
 
 
@@ -35,74 +36,20 @@ class Worker(QtCore.QRunnable):
 
 
 def getTags(ps_script: str, section_id: str) -> list[OETag]:
-    outfile = ""
-
-    if logging.root.level == logging.DEBUG:
-        outfile = get_safe_temp_path().joinpath(f"output_{section_id}.json").as_posix()
-        logger.debug(f"Output powershell will written to '{outfile}'")
-
-    try:
-        process = subprocess.run(
-            ["powershell", "-NoProfile",
-            "-File", ps_script, 
-            "-SectionId", section_id, 
-            "-OutputJson", outfile],
-            shell=True,
-            check=True,
-            capture_output=True,
-            encoding="utf-8"
-            )
-    except subprocess.CalledProcessError as e:
-        logger.error(f"CalledProcessError={e}")
-        logger.error(f"Command: {e.cmd}")
-        logger.error(f"Return Code: {e.returncode}")
-        logger.error(f"Output: {e.output}")
-        logger.error(f"Error Output: {e.stderr}")
-        return []
-    except Exception as e:
-        logger.error(f"Unexepected error occured. Error: {e}")
-        return []
-        
-    try:
-        json_text = process.stdout.strip()
-    except Exception as e:
-        logger.error(f"Cannot read Powershell script output. Error={e}")
-        return []
-    
-    try:
-        raw: list[dict] = json.loads(json_text) 
-    except Exception as e:
-        logger.error(f"Cannot parse data into dict using json. Error={e}")
-        return []
-    
-    # normalize
-    if raw is None:
-        data: list[dict] = []
-    elif isinstance(raw, dict):
-        data = [raw]
-    elif isinstance(raw, list):
-        if not all(isinstance(t, dict) for t in raw):
-            logger.error("JSON list contains non-dict items")
-            return []
-        data = raw
-    
-    try:
-        tags = [OETag.from_dict(t) for t in data]
-    except Exception as e:
-        logger.error(f"Cannot decrompress dict into dataclass. Error={e}\n\tData:{data}")
-        return []
-      
-    return tags
+    return list(TagFetcher(PowershellBackend(ps_script)).fetchSection(section_id))
 
 
 class TreeStandardItem(QtGui.QStandardItem):
-    def __init__(self, onenote_node: OE.HierarchyNode):
+    def __init__(self, onenote_node: hierarchy.HierarchyNode):
         super().__init__()       
-        if isinstance(onenote_node, OE.Notebook):
+        if isinstance(onenote_node, hierarchy.Notebook):
             self.name = onenote_node.nickname if onenote_node.nickname else "Other"
         else:
             self.name = onenote_node.name 
         self.object_id = onenote_node.id
+
+        # Section groups are expanded on demand, see OnenoteModel.fetchMore
+        self.pending = onenote_node if isinstance(onenote_node, hierarchy.SectionGroup) else None
         
         self.setData(self.name, role=QtCore.Qt.ItemDataRole.DisplayRole)
 
@@ -113,29 +60,51 @@ class OnenoteModel(QtGui.QStandardItemModel):
     def __init__(self):
         super().__init__()
 
-    def buildModel(self, hierarchy: OE.Hierarchy):
+    def buildModel(self, notebooks: list[hierarchy.Notebook]):
         self.clear()
         self.setHorizontalHeaderLabels(['Name'])
       
-        for notebook in hierarchy:
+        for notebook in notebooks:
             notebook_node = TreeStandardItem(notebook)
             notebook_node.setSelectable(False)
             for section in notebook:
-                section_node = TreeStandardItem(section)
-                if isinstance(section, OE.SectionGroup):
-                    section_node.setSelectable(False)
-                    for subsection in section:
-                        subsection_node = TreeStandardItem(subsection)
-                        section_node.appendRow(subsection_node)
-                notebook_node.appendRow(section_node)
+                notebook_node.appendRow(self.createItem(section))
             self.appendRow(notebook_node)
 
+    def createItem(self, node: hierarchy.HierarchyNode) -> TreeStandardItem:
+        item = TreeStandardItem(node)
+        if isinstance(node, hierarchy.SectionGroup):
+            item.setSelectable(False)
+        return item
+
+    def _pendingItem(self, parent: QtCore.QModelIndex) -> TreeStandardItem | None:
+        item = self.itemFromIndex(parent)
+        if isinstance(item, TreeStandardItem) and item.pending is not None:
+            return item
+
+    def hasChildren(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> bool:
+        if self._pendingItem(parent) is not None:
+            return True
+        return super().hasChildren(parent)
+
+    def canFetchMore(self, parent: QtCore.QModelIndex) -> bool:
+        return self._pendingItem(parent) is not None or super().canFetchMore(parent)
+
+    def fetchMore(self, parent: QtCore.QModelIndex):
+        item = self._pendingItem(parent)
+        if item is None:
+            return super().fetchMore(parent)
+
+        section_group: hierarchy.SectionGroup = item.pending
+        item.pending = None
+        item.appendRows([self.createItem(node) for node in section_group])
+
     def getHierarchy(self,
                      on_finished: callable,
                      node_id: str = "",
                      scope: int = 4):
         
-        def func() -> OE.Hierarchy:
+        def func() -> list[hierarchy.Notebook]:
             ps_script = f"""
                             $OutputEncoding = [Console]::InputEncoding = [Console]::OutputEncoding = [System.Text.UTF8Encoding]::new()
                             $OneNote = New-Object -ComObject OneNote.Application
@@ -146,10 +115,8 @@ class OnenoteModel(QtGui.QStandardItemModel):
             process = subprocess.run(["powershell", "-Command", ps_script],
                                     check=True,
                                     capture_output=True)
-            output = process.stdout.decode("UTF-8").strip()
-            xml = ET.fromstring(output)
-            hierarchy = OE.Hierarchy(xml) if xml else []
-            return hierarchy
+            output = process.stdout.strip()
+            return hierarchy.parseHierarchy(BytesIO(output)) if output else []
         
         pool = QtCore.QThreadPool().globalInstance()
         worker = Worker(func)
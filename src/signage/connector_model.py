@@ -17,6 +17,10 @@ class ConnectorModel(QSqlRelationalTableModel):
         NAME: DatabaseField
         LASTMODIFIED: DatabaseField
         WorkspaceID: DatabaseField
+        SIZE: DatabaseField
+        CONTENTHASH: DatabaseField
+        LINEIDS: DatabaseField
+        SYNCINTERVAL: DatabaseField
 
         @classmethod
         def fields(self) -> list["DatabaseField"]:
@@ -43,6 +47,9 @@ class ConnectorModel(QSqlRelationalTableModel):
         self.setHeaderData(self.fieldIndex('value'),
                            Qt.Orientation.Horizontal,
                            "Value")
+        self.setHeaderData(self.fieldIndex('sync_interval'),
+                           Qt.Orientation.Horizontal,
+                           "Sync interval (min)")
 
     def refresh(self):
         self.select()
@@ -56,6 +63,10 @@ class ConnectorModel(QSqlRelationalTableModel):
         ConnectorModel.Fields.VALUE = DatabaseField("value", self.fieldIndex('value'), True)
         ConnectorModel.Fields.LASTMODIFIED = DatabaseField("last_modified", self.fieldIndex('last_modified'), False)
         ConnectorModel.Fields.WorkspaceID = DatabaseField("workspace_id", self.fieldIndex('workspace_id'), False)
+        ConnectorModel.Fields.SIZE = DatabaseField("size", self.fieldIndex('size'), False)
+        ConnectorModel.Fields.CONTENTHASH = DatabaseField("content_hash", self.fieldIndex('content_hash'), False)
+        ConnectorModel.Fields.LINEIDS = DatabaseField("line_ids", self.fieldIndex('line_ids'), False)
+        ConnectorModel.Fields.SYNCINTERVAL = DatabaseField("sync_interval", self.fieldIndex('sync_interval'), True)
 
     @classmethod
     def connectors(cls) -> dict[str,dict[Connector]]:
@@ -73,7 +84,12 @@ class ConnectorModel(QSqlRelationalTableModel):
             value = self.index(row, self.Fields.VALUE.index).data(Qt.ItemDataRole.DisplayRole)
             connector_type = self.index(row, self.Fields.TYPE.index).data(Qt.ItemDataRole.DisplayRole)
             last_modified = self.index(row, self.Fields.LASTMODIFIED.index).data(Qt.ItemDataRole.DisplayRole)
-            connnector = Connector(uid, connector_type, name, value, last_modified)
+            size = self.index(row, self.Fields.SIZE.index).data(Qt.ItemDataRole.DisplayRole)
+            content_hash = self.index(row, self.Fields.CONTENTHASH.index).data(Qt.ItemDataRole.DisplayRole)
+            line_ids = Connector.from_json(self.index(row, self.Fields.LINEIDS.index).data(Qt.ItemDataRole.DisplayRole))
+            sync_interval = self.index(row, self.Fields.SYNCINTERVAL.index).data(Qt.ItemDataRole.DisplayRole)
+            connnector = Connector(uid, connector_type, name, value, last_modified,
+                                   size or 0, content_hash or "", set(line_ids or []), sync_interval or 0)
             self._connectors.setdefault(connector_type, {}).update({uid:connnector})
 
     def addConnector(self, connector: Connector):
@@ -84,6 +100,7 @@ class ConnectorModel(QSqlRelationalTableModel):
         record.setValue('name', connector.name)
         record.setValue('value', connector.value) # section_id for OneNote, filepath for Word
         record.setValue('type', connector.type)
+        record.setValue('sync_interval', connector.sync_interval)
         record.setValue('workspace_id', AppDatabase.activeWorkspace().id)
 
         if not self.insertRecord(-1, record):
@@ -94,6 +111,23 @@ class ConnectorModel(QSqlRelationalTableModel):
         self.refresh()
         return True
     
+    def updateSyncInterval(self, index: QtCore.QModelIndex, sync_interval: int) -> bool:
+        """Set the sync interval of the connector at `index`
+
+        The cached connector is updated in place so the background sync keeps its state.
+        """
+        if not self.setData(self.index(index.row(), self.Fields.SYNCINTERVAL.index), sync_interval):
+            err = f"Cannot update connector - Error:{self.lastError().text()}"
+            logger.error(err)
+            return False
+
+        uid = self.index(index.row(), self.Fields.ID.index).data(Qt.ItemDataRole.DisplayRole)
+        connector_type = self.index(index.row(), self.Fields.TYPE.index).data(Qt.ItemDataRole.DisplayRole)
+        connector = self._connectors.get(connector_type, {}).get(uid)
+        if connector is not None:
+            connector.sync_interval = sync_interval
+        return True
+
     def removeConnector(self, index: QtCore.QModelIndex):
         self.beginRemoveRows(QtCore.QModelIndex(), index.row(), index.row())
         self.removeRow(index.row(), QtCore.QModelIndex())
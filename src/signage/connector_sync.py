@@ -0,0 +1,268 @@
+import time
+import logging
+from pathlib import Path
+from functools import partial
+from dataclasses import dataclass, replace
+
+from qtpy import QtCore, Signal, Slot
+
+from database.database import AppDatabase
+from common import Connector, ConnectorType, Signage
+from signage.model import SignageModel, DataService
+from signage.connector_model import ConnectorModel
+from onenote.fetcher import TagFetcher, TagBackend, PowershellBackend
+
+from utilities import config as mconf
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SyncState:
+    next_due: float = 0.0 # time.monotonic()
+    failures: int = 0
+    last_modified: str | None = None # OneNote section lastModifiedTime seen by the last check
+
+
+class CheckSignals(QtCore.QObject):
+    result = Signal(dict)
+
+
+class ChangeCheckWorker(QtCore.QRunnable):
+    """Check the cheap change signal of connectors
+
+    Docx: file mtime and size, OneNote: section lastModifiedTime.
+    Emit {uid: (changed, last_modified)}, changed is None if the check failed.
+    The worker reads snapshots of the connectors, the new state is applied by the receiver.
+    """
+    def __init__(self, connectors: list[Connector], fetcher: TagFetcher):
+        super().__init__()
+        self.connectors = [replace(connector, line_ids=set()) for connector in connectors]
+        self.fetcher = fetcher
+        self.signals = CheckSignals()
+
+    def run(self):
+        changes = {}
+        for connector in self.connectors:
+            if connector.type == ConnectorType.DOCX.value:
+                try:
+                    stat = Path(connector.value).stat()
+                except OSError as e:
+                    logger.error(f"Cannot check connector '{connector.name}'. Error: {e}")
+                    changes[connector.uid] = (None, None)
+                    continue
+                changed = (str(connector.last_modified) != str(stat.st_mtime_ns)
+                           or connector.size != stat.st_size)
+                changes[connector.uid] = (changed, None)
+
+            elif connector.type == ConnectorType.ONENOTE.value:
+                last_modified = self.fetcher.sectionLastModified(connector.value)
+                if last_modified is None:
+                    changes[connector.uid] = (None, None)
+                else:
+                    changes[connector.uid] = (last_modified != connector.last_modified, last_modified)
+
+        self.signals.result.emit(changes)
+
+
+class ConnectorSyncScheduler(QtCore.QObject):
+    """Synchronise the connectors in the background
+
+    Every connector with a sync interval is polled on its own interval. A cheap
+    change signal is checked first, the connector is only imported when it changed.
+    After a failure, the interval is doubled up to `max_backoff` minutes.
+    New signages are inserted by batches of `batch_size` per event loop iteration.
+    """
+    sigSynced = Signal(int) # number of signages imported
+
+    def __init__(self,
+                 model: SignageModel,
+                 backend: TagBackend | None = None,
+                 tick: int = 30,
+                 max_backoff: int = 240,
+                 batch_size: int = 20,
+                 parent=None):
+        super().__init__(parent)
+        self.model = model
+        self.max_backoff = max_backoff
+        self.batch_size = batch_size
+
+        if backend is None:
+            backend = PowershellBackend(mconf.config.app_data_path.joinpath("onenotescrapper.ps1").as_posix())
+        self._backend = backend
+        self._fetcher = TagFetcher(backend)
+
+        self._states: dict[int, SyncState] = {}
+        self._connectors: dict[int, Connector] = {}
+        self._pending: list[Signage] = []
+        self._checking = False
+        self._running = 0
+        self._holds = 0
+        self._imported = 0
+        self._workspace_id = None
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(tick * 1000)
+        self._timer.timeout.connect(self.poll)
+
+        self._flush_timer = QtCore.QTimer(self)
+        self._flush_timer.setInterval(0)
+        self._flush_timer.timeout.connect(self._flush)
+
+    def start(self):
+        self._timer.start()
+
+    def stop(self):
+        self._timer.stop()
+
+    def isActive(self) -> bool:
+        return self._timer.isActive()
+
+    def isBusy(self) -> bool:
+        return self._checking or self._running > 0 or bool(self._pending)
+
+    def hold(self):
+        """Do not start a synchronisation until `release` (e.g. during a manual import)"""
+        self._holds += 1
+
+    def release(self):
+        self._holds = max(0, self._holds - 1)
+
+    def regex(self) -> str:
+        regex = mconf.settings.value("regex")
+        return mconf.default_regex if regex is None or regex == "" else regex
+
+    def dueConnectors(self, now: float) -> list[Connector]:
+        due = []
+        for connectors in ConnectorModel.connectors().values():
+            for connector in connectors.values():
+                if not connector.sync_interval or connector.sync_interval <= 0:
+                    continue
+                state = self._states.setdefault(connector.uid, SyncState())
+                if state.next_due <= now:
+                    due.append(connector)
+        return due
+
+    @Slot()
+    def poll(self):
+        if self._holds or self.isBusy() or AppDatabase.activeWorkspace().id == 0:
+            return
+
+        due = self.dueConnectors(time.monotonic())
+        if not due:
+            return
+
+        self._checking = True
+        self._workspace_id = AppDatabase.activeWorkspace().id
+        self._connectors = {connector.uid: connector for connector in due}
+
+        worker = ChangeCheckWorker(due, self._fetcher)
+        worker.signals.result.connect(self._onChecked)
+        QtCore.QThreadPool.globalInstance().start(worker)
+
+    def _schedule(self, connector: Connector, ok: bool):
+        state = self._states.setdefault(connector.uid, SyncState())
+        state.failures = 0 if ok else state.failures + 1
+        delay = min(connector.sync_interval * 2 ** state.failures,
+                    max(self.max_backoff, connector.sync_interval))
+        state.next_due = time.monotonic() + delay * 60
+
+        if not ok:
+            logger.warning(f"Sync of connector '{connector.name}' failed {state.failures} time(s), "
+                           f"next attempt in {delay} min")
+
+    @Slot(dict)
+    def _onChecked(self, changes: dict):
+        self._checking = False
+
+        changed: dict[str, dict[int, Connector]] = {}
+        for uid, (is_changed, last_modified) in changes.items():
+            connector = self._connectors[uid]
+            if is_changed is None:
+                self._schedule(connector, False)
+            elif not is_changed:
+                self._schedule(connector, True)
+            else:
+                self._states[uid].last_modified = last_modified
+                changed.setdefault(connector.type, {})[uid] = connector
+
+        if self._holds or self._workspace_id != AppDatabase.activeWorkspace().id:
+            # Checked again at the next poll
+            for connectors in changed.values():
+                for uid in connectors:
+                    self._states[uid].next_due = 0.0
+            return
+
+        regex = self.regex()
+
+        for connector_type, connectors in changed.items():
+            logger.info(f"Background sync of {len(connectors)} {connector_type} connector(s)")
+            on_finished = partial(self._onLoaded, list(connectors.values()))
+            if connector_type == ConnectorType.DOCX.value:
+                self._running += 1
+                DataService.loadFromDocx(connectors=connectors,
+                                         regex=regex,
+                                         cache=self.model.connector_cache,
+                                         on_ready=self._onSignageReady,
+                                         on_finished=on_finished)
+            elif connector_type == ConnectorType.ONENOTE.value:
+                self._running += 1
+                DataService.loadFromOneNote(connectors=connectors,
+                                            regex=regex,
+                                            cache=self.model.connector_cache,
+                                            on_ready=self._onSignageReady,
+                                            on_finished=on_finished,
+                                            backend=self._backend)
+
+    def _onSignageReady(self, signage: Signage):
+        self._pending.append(signage)
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def _onLoaded(self, connectors: list[Connector], cache: dict, msg: str = "", failed: set[str] | None = None):
+        self._running -= 1
+
+        # The sync state of the Docx connectors is saved after this call, from the signages inserted
+        while self._pending:
+            self._flush()
+        failed = failed or set()
+
+        for connector in connectors:
+            if connector.type == ConnectorType.ONENOTE.value:
+                # A section which cannot be fetched keeps its last_modified: it is fetched again at the next attempt
+                ok = connector.value not in failed
+                if ok:
+                    connector.last_modified = self._states[connector.uid].last_modified
+                    AppDatabase.updateConnectorSyncState(connector)
+            else:
+                ok = not msg.startswith("⚠️")
+            self._schedule(connector, ok)
+
+        self._finish()
+
+    @Slot()
+    def _flush(self):
+        batch = self._pending[:self.batch_size]
+        del self._pending[:self.batch_size]
+
+        if self._workspace_id != AppDatabase.activeWorkspace().id:
+            logger.warning(f"Workspace changed, {len(batch) + len(self._pending)} signage(s) not imported")
+            self._pending.clear()
+            batch = []
+
+        for signage in batch:
+            if self.model.insertSignage(signage) is not False:
+                self._imported += 1
+
+        if not self._pending:
+            self._flush_timer.stop()
+            self._finish()
+
+    def _finish(self):
+        if self.isBusy() or not self._imported:
+            return
+
+        logger.info(f"{self._imported} signage(s) imported by background sync")
+        self.sigSynced.emit(self._imported)
+        self._imported = 0
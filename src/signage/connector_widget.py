@@ -29,10 +29,14 @@ class ConnectorManagerDialog(QtWidgets.QDialog):
         self.add_button = QtWidgets.QPushButton("Add Connector")
         self.add_button.setIcon(theme_icon_manager.get_icon(':add-box'))
 
+        self.edit_button = QtWidgets.QPushButton("Edit Connector")
+        self.edit_button.setIcon(theme_icon_manager.get_icon(':pencil'))
+
         self.delete_button = QtWidgets.QPushButton("Delete Connector")
         self.delete_button.setIcon(theme_icon_manager.get_icon(':delete-bin2'))
 
         button_layout.addWidget(self.add_button)
+        button_layout.addWidget(self.edit_button)
         button_layout.addWidget(self.delete_button)
         button_layout.addStretch()
 
@@ -59,6 +63,8 @@ class ConnectorManagerDialog(QtWidgets.QDialog):
 
     def initConnection(self):
         self.add_button.clicked.connect(self.onEditTriggered)
+        self.edit_button.clicked.connect(self.editConnector)
+        self.table.doubleClicked.connect(self.editConnector)
         self.delete_button.clicked.connect(self.removeConnector)
     
     def onEditTriggered(self):
@@ -74,6 +80,30 @@ class ConnectorManagerDialog(QtWidgets.QDialog):
                 return
             self.table.resizeColumnsToContents()
             
+    def editConnector(self):
+        index = self.table.selectionModel().currentIndex()
+
+        if not index.isValid():
+            return
+
+        uid = self._model.index(index.row(), ConnectorModel.Fields.ID.index).data()
+        connector_type = self._model.index(index.row(), ConnectorModel.Fields.TYPE.index).data()
+        connector = ConnectorModel.connectors().get(connector_type, {}).get(uid)
+        if connector is None:
+            return
+
+        edit_dialog = ConnectorEditDialog(self, connector)
+
+        if edit_dialog.exec():
+            ok = self._model.updateSyncInterval(index, edit_dialog.connector().sync_interval)
+
+            if not ok:
+                QtWidgets.QMessageBox.critical(self,
+                                               "Connector Manager",
+                                               "Failed to update connector")
+                return
+            self.table.resizeColumnsToContents()
+
     def removeConnector(self):
         index = self.table.selectionModel().currentIndex()
 
@@ -85,12 +115,19 @@ class ConnectorManagerDialog(QtWidgets.QDialog):
 
 
 class ConnectorEditDialog(QtWidgets.QDialog):
-    def __init__(self, parent = None):
+    """Add a connector, or edit the sync interval of `connector`
+
+    The source of an existing connector cannot be changed, its sync state would not match it anymore.
+    """
+    def __init__(self, parent = None, connector: Connector | None = None):
         super().__init__(parent)
         self._connector = Connector()
         self.setModal(False)
         self.initUI()
 
+        if connector is not None:
+            self.setConnector(connector)
+
     def initUI(self):
         self.setWindowTitle("Connector Editor")
         form = QtWidgets.QFormLayout()
@@ -113,11 +150,18 @@ class ConnectorEditDialog(QtWidgets.QDialog):
         self.value_lineedit = QtWidgets.QLineEdit()
         self.value_lineedit.setReadOnly(True)
 
+        self.sync_interval = QtWidgets.QSpinBox()
+        self.sync_interval.setRange(0, 24 * 60)
+        self.sync_interval.setSuffix(" min")
+        self.sync_interval.setSpecialValueText("Manual import only")
+        self.sync_interval.setToolTip("Interval of the background synchronisation")
+
         self.setMinimumWidth(500)
 
         form.addRow(QtWidgets.QLabel("Type"), self.connector_type)
         form.addRow(QtWidgets.QLabel("Name"), self.name_lineedit)
         form.addRow(QtWidgets.QLabel("Value"), self.value_lineedit)
+        form.addRow(QtWidgets.QLabel("Sync every"), self.sync_interval)
         form.addWidget(self.source_btn)
         form.addWidget(self.buttonBox)
 
@@ -125,6 +169,15 @@ class ConnectorEditDialog(QtWidgets.QDialog):
         self.source_btn.clicked.connect(self.onSourceClicked)
         self.connector_type.currentIndexChanged.connect(self.on_type_changed)
 
+    def setConnector(self, connector: Connector):
+        self.connector_type.setCurrentText(connector.type)
+        self.name_lineedit.setText(connector.name)
+        self.value_lineedit.setText(connector.value)
+        self.sync_interval.setValue(connector.sync_interval)
+
+        self.connector_type.setEnabled(False)
+        self.source_btn.setEnabled(False)
+
     def on_type_changed(self):
         self.name_lineedit.clear()
         self.value_lineedit.clear()
@@ -182,4 +235,5 @@ class ConnectorEditDialog(QtWidgets.QDialog):
         self._connector.name = self.name_lineedit.text()
         self._connector.value = self.value_lineedit.text()
         self._connector.type = self.connector_type.currentText()
+        self._connector.sync_interval = self.sync_interval.value()
         super().accept()
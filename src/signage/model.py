@@ -3,6 +3,7 @@ import json
 from datetime import datetime, timezone
 from qtpy import QtCore, Signal, Slot, QtSql, QSqlRelationalTableModel
 from pathlib import Path
+from dataclasses import dataclass, field
 
 from functools import partial
 from database.database import AppDatabase
@@ -11,15 +12,17 @@ from common import DatabaseField, Signage, Connector, SignageType, SignageStatus
 
 from base_models import TreeItem, TreeModel, ProxyModel
 from openpyxl import Workbook
-from openpyxl.worksheet.table import Table, TableStyleInfo
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.worksheet.table import Table, TableStyleInfo, TableColumn
 from openpyxl.styles import numbers, PatternFill, Font, Alignment
 from openpyxl.formatting.rule import CellIsRule
 from html2text import html2text
-from utilities.utils import mergeExcelFiles, find_match, extract_hash_lines
+from utilities.utils import mergeExcelFiles, find_match, extract_hash_lines, file_hash
+from utilities.html_converter import HtmlConverter
 
-from onenote.model import getTags
+from onenote.fetcher import TagFetcher, TagBackend, TagFetchError, PowershellBackend
 
-from utilities.config import config as mconf
+from utilities.config import config as mconf, settings
 
 logger = logging.getLogger(__name__)
 
@@ -54,96 +57,148 @@ class LoadWorker(QtCore.QRunnable):
 
 
 class ExportWorker(QtCore.QRunnable):
-    def __init__(self, sql_model, types, statuses, destination, include_publicnote):
+    def __init__(self, types, statuses, destination, include_publicnote, batch_size=1000):
         super().__init__()
-        self.sql_model: "SignageSqlModel" = sql_model
         self.types: list = types
         self.statuses: list = statuses
         self.destination: str = destination
         self.include_publicnote: bool = include_publicnote
+        self.batch_size: int = batch_size
         self.signals = WorkerSignals()
 
+    def query(self, db: QtSql.QSqlDatabase) -> QtSql.QSqlQuery:
+        """Select the signages to export, filtered on type and status
+
+        Signages without a known status or type are not exported, like the rows of the SQL model.
+        """
+        types = [f":type{i}" for i in range(len(self.types))]
+        statuses = [f":status{i}" for i in range(len(self.statuses))]
+
+        query = QtSql.QSqlQuery(db)
+        query.setForwardOnly(True)
+        query.prepare(f"""
+                        SELECT
+                            signage.refkey,
+                            signage.title,
+                            signage_status.name,
+                            signage_type.name
+                            {", signage.public_note" if self.include_publicnote else ""}
+                        FROM signage
+                        JOIN signage_status ON signage_status.uid = signage.status
+                        JOIN signage_type ON signage_type.uid = signage.type
+                        WHERE
+                            signage.workspace_id = :workspace_id
+                        AND
+                            signage_type.name IN ({", ".join(types)})
+                        {f"AND signage_status.name IN ({', '.join(statuses)})" if statuses else ""}
+                        ORDER BY
+                            signage.refkey;
+                      """)
+        query.bindValue(":workspace_id", AppDatabase.activeWorkspace().id)
+        for placeholder, value in zip(types, self.types):
+            query.bindValue(placeholder, value)
+        for placeholder, value in zip(statuses, self.statuses):
+            query.bindValue(placeholder, value)
+
+        return query
+
     def func(self):
         """Export Signage to Excel"""
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "main"
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("main")
 
         if self.include_publicnote:
             headers = ["Refkey", "Title", "Status", "Type", "Note"]
             xrange = "A1:E"
-            model_fields = [SignageSqlModel.Fields.Refkey.index,
-                            SignageSqlModel.Fields.Title.index,
-                            SignageSqlModel.Fields.Status.index,
-                            SignageSqlModel.Fields.Type.index,
-                            SignageSqlModel.Fields.PublicNote.index]
         else:
             headers = ["Refkey", "Title", "Status", "Type"]
             xrange = "A1:D"
-            model_fields = [SignageSqlModel.Fields.Refkey.index,
-                            SignageSqlModel.Fields.Title.index,
-                            SignageSqlModel.Fields.Status.index,
-                            SignageSqlModel.Fields.Type.index]
 
-        for column in range(len(headers)):
-            ws.cell(row=1, column=column + 1, value=headers[column])
-
-        # Selected Status List
-        # Select All if user did not made any choice
-        if len(self.statuses) == 0:
-            value: SignageStatus
-            for value in AppDatabase.cache_signage_status.values():
-                self.statuses.append(value.name)
-
-        record_count = 1
-        for row in range(self.sql_model.rowCount()):
-            record = self.sql_model.record(row)
-            
-            if record.value(SignageSqlModel.Fields.Type.index) in self.types:
-                if record.value(SignageSqlModel.Fields.Status.index) in self.statuses:
-                    record_count += 1
-                    values = list(map(record.value, model_fields))
-
-                    # Signage Type
-                    values[3] = record.value(SignageSqlModel.Fields.Type.index)
-
-                    # Signage Status
-                    values[2] = record.value(SignageSqlModel.Fields.Status.index)
-    
-                    if self.include_publicnote:
-                        if values[-1] is not None:
-                            values[-1] = html2text(values[-1]).strip()
+        # Column format, must be set before the first row is written
+        ws.column_dimensions["A"].number_format = numbers.FORMAT_TEXT
+        ws.column_dimensions["B"].width = 80.0
+        ws.column_dimensions["C"].width = 18.0
+        if "Note" in headers:
+            ws.column_dimensions["E"].width = 80.0
 
-                    ws.append(values)
+        # Alignement
+        alignments = {0: Alignment(horizontal="center"),
+                      1: Alignment(horizontal="left", vertical="top", wrap_text=True),
+                      4: Alignment(horizontal="left", vertical="top", wrap_text=True)}
+
+        def cells(values: list) -> list:
+            row = []
+            for column, value in enumerate(values):
+                cell = WriteOnlyCell(ws, value=value)
+                if column in alignments:
+                    cell.alignment = alignments[column]
+                row.append(cell)
+            return row
+
+        ws.append(cells(headers))
+
+        # Nothing to export if no type is selected, all statuses are exported if none is selected
+        if len(self.types) == 0:
+            record_count = 1
+        else:
+            record_count = self._writeRecords(ws, cells)
 
         if record_count == 1:
             record_count = 2
 
         table = Table(displayName="Table1", ref=f"{xrange}{record_count}")
+        # Table columns are not initialised from the cells in write-only mode
+        table.tableColumns = [TableColumn(id=i + 1, name=header) for i, header in enumerate(headers)]
         style = TableStyleInfo(name="TableStyleMedium2",
                                showFirstColumn=False,
                                showLastColumn=False,
                                showRowStripes=True,
                                showColumnStripes=False)
         table.tableStyleInfo = style
+        ws.add_table(table)
 
-        ws.column_dimensions["B"].width = 80.0
-        ws.column_dimensions["A"].number_format = numbers.FORMAT_TEXT
-        ws.column_dimensions["C"].width = 18.0
+        wb.save(self.destination)
 
-        # Alignement
-        for cell in ws['A':'A']:
-            cell.alignment = Alignment(horizontal="center")
-        for cell in ws['B': 'B']:
-            cell.alignment = Alignment(horizontal="left", vertical="top", wrap_text=True)
+    def _writeRecords(self, ws, cells: callable) -> int:
+        """Stream the signages from a dedicated connection into the worksheet"""
+        connection_name = f"export_{id(self)}"
+        db = AppDatabase.openReadConnection(connection_name)
+        if db is None:
+            raise RuntimeError("Cannot open a read connection to the database")
 
-        if "Note" in headers:
-            ws.column_dimensions["E"].width = 80.0
-            for cell in ws['E': 'E']:
-                cell.alignment = Alignment(horizontal="left", vertical="top", wrap_text=True)
+        record_count = 1
+        try:
+            with HtmlConverter() as converter:
+                query = self.query(db)
+                if not query.exec():
+                    raise RuntimeError(query.lastError().text())
+
+                column_count = query.record().count()
+                batch = []
+                has_next = query.next()
+                while has_next:
+                    batch.append([query.value(i) for i in range(column_count)])
+                    has_next = query.next()
+
+                    if len(batch) == self.batch_size or (not has_next and batch):
+                        if self.include_publicnote:
+                            notes = converter.convert([values[-1] for values in batch])
+                            for values, note in zip(batch, notes):
+                                values[-1] = note
+
+                        for values in batch:
+                            ws.append(cells(values))
+
+                        record_count += len(batch)
+                        batch.clear()
+
+                query.finish()
+                del query
+        finally:
+            del db
+            AppDatabase.closeConnection(connection_name)
 
-        ws.add_table(table)
-        wb.save(self.destination)
+        return record_count
 
     def run(self):
         try:
@@ -164,17 +219,76 @@ class ExcelLoader(QtCore.QRunnable):
         finished = Signal(str)
         error = Signal(Exception)
 
-    def __init__(self, sql_model, selected_files, update_title, batch_size=100):
+    def __init__(self, snapshot, selected_files, update_title, batch_size=100):
         super().__init__()
-        self.sql_model: "SignageSqlModel" = sql_model
+        self.snapshot: list[tuple] = snapshot   # (signage_id, refkey, type, title), see AppDatabase.querySignageKeys
         self.selected_files = selected_files
         self.update_title = update_title
         self.batch_size = batch_size
         self.signals = self.Signals()
 
+    @staticmethod
+    def diff(df, snapshot: list[tuple], update_title: bool, workspace_id=None) -> tuple[list[Signage], list[UpdateItem]]:
+        """Match the Excel rows against the signage snapshot on (refkey, type)
+
+        Both sides are keyed on the lowercased refkey and the signage type uid,
+        then hash-joined, so the cost is linear in the number of rows.
+
+        Returns the signages to insert and the titles to update.
+        """
+        from pandas import DataFrame
+
+        type_uids = {value.name.lower(): value.uid for value in AppDatabase.cache_signage_type.values()}
+
+        df = df[["Refkey", "Type", "Title"]].fillna("").astype(str)
+        df = df.assign(key_refkey=df["Refkey"].str.strip().str.lower(),
+                       key_type=df["Type"].str.strip().str.lower().map(type_uids))
+
+        # Ignore unknown signage type and rows without refkey
+        df = df[df["key_type"].notna() & (df["key_refkey"] != "")]
+        df = df.drop_duplicates(subset=["key_refkey", "key_type"], keep="first")
+        df = df.sort_values(by="Refkey", kind="stable")
+
+        db = DataFrame(snapshot, columns=["signage_id", "m_refkey", "m_type", "m_title"])
+        db = db[db["m_refkey"].notna() & db["m_type"].notna()]
+        db = db.assign(key_refkey=db["m_refkey"].astype(str).str.strip().str.lower(),
+                       key_type=db["m_type"].astype(int),
+                       m_title=db["m_title"].fillna("").astype(str))
+        db = db.drop_duplicates(subset=["key_refkey", "key_type"], keep="first")
+
+        df = df.astype({"key_type": int})
+        merged = df.merge(db[["signage_id", "m_title", "key_refkey", "key_type"]],
+                          on=["key_refkey", "key_type"],
+                          how="left",
+                          indicator=True)
+
+        insertions: list[Signage] = []
+        new_rows = merged[merged["_merge"] == "left_only"]
+        for refkey, title, signage_type in zip(new_rows["Refkey"], new_rows["Title"], new_rows["key_type"]):
+            signage = Signage(
+                refkey=refkey.strip(),
+                title=title,
+                type=int(signage_type),
+                source=f'{{"application":"InspectorMate", "module":"loadFromExcel"}}',
+                workspace_id=workspace_id,
+            )
+            insertions.append(signage)
+
+        updates: list[UpdateItem] = []
+        if update_title:
+            matched = merged[merged["_merge"] == "both"]
+            changed = matched[matched["Title"].str.strip().str.lower() != matched["m_title"].str.strip().str.lower()]
+            for signage_id, title in zip(changed["signage_id"], changed["Title"]):
+                updates.append(UpdateItem(int(signage_id), title))
+
+        return insertions, updates
+
     def func(self):
         from pandas import DataFrame
-        df: DataFrame = mergeExcelFiles(self.selected_files, drop_duplicate="first", outfile="")
+        df: DataFrame = mergeExcelFiles(self.selected_files,
+                                        drop_duplicate="first",
+                                        outfile="",
+                                        usecols=["Refkey", "Type", "Title"])
         
         try:
             df["Type"]
@@ -184,63 +298,17 @@ class ExcelLoader(QtCore.QRunnable):
             raise KeyError(f"Missing required column header: {e}") 
         except Exception as e:
             raise Exception(f"Error while validating file format: {e}")
-        
-        df.sort_values(by=['Refkey'], inplace=True)
-        df = df.fillna("", axis=0)
 
-        updates: list[UpdateItem] = []
-        insertions: list[Signage] = []
+        insertions, updates = self.diff(df,
+                                        self.snapshot,
+                                        self.update_title,
+                                        AppDatabase.activeWorkspace().id)
 
-        self.sql_model.sort(self.sql_model.Fields.Refkey.index, QtCore.Qt.SortOrder.AscendingOrder)
-
-        df["Refkey"] = df["Refkey"].str.lower()
-        df["Type"] = df["Type"].str.lower()
-        for _, df_row in df.iterrows():
-            df_refkey: str = df_row["Refkey"]
-            df_type: str = df_row["Type"]
-            df_title: str = df_row["Title"]
-
-            found = False
-            cache_signage_type = AppDatabase.cache_signage_type.get(df_type.capitalize())
-            if cache_signage_type:
-                for row in range(self.sql_model.rowCount()):
-                    refkey_index = self.sql_model.index(row, self.sql_model.Fields.Refkey.index)
-                    m_refkey: str = self.sql_model.data(refkey_index, QtCore.Qt.ItemDataRole.EditRole)
-                    type_index = self.sql_model.index(row, self.sql_model.Fields.Type.index)
-                    m_signage_type: str = self.sql_model.data(type_index, QtCore.Qt.ItemDataRole.EditRole)
-                    title_index = self.sql_model.index(row, self.sql_model.Fields.Title.index)
-                    m_title: str = self.sql_model.data(type_index, QtCore.Qt.ItemDataRole.EditRole)
-                    
-                    if m_refkey.lower() == df_refkey and m_signage_type.lower() == df_type:
-                        found = True
-                        if self.update_title and (df_title.strip().lower() != m_title.strip().lower()):
-                            signage_id = self.sql_model.index(row, self.sql_model.Fields.ID.index).data()
-                            updates.append(UpdateItem(signage_id, df_title))
-                        break
-
-            if not found and df_refkey and cache_signage_type:
-                signage = Signage(
-                    refkey=df_refkey,
-                    title=df_title,
-                    type=cache_signage_type.uid if cache_signage_type else None,
-                    source=f'{{"application":"InspectorMate", "module":"loadFromExcel"}}',
-                    workspace_id=AppDatabase.activeWorkspace().id,
-                )
-                insertions.append(signage)
-
-            # Emit in batches to avoid memory buildup
-            if len(updates) >= self.batch_size:
-                self.signals.batchReady.emit(updates.copy())
-                updates.clear()
-            if len(insertions) >= self.batch_size:
-                self.signals.signageBatch.emit(insertions.copy())
-                insertions.clear()
-
-        # Emit remaining
-        if updates:
-            self.signals.batchReady.emit(updates)
-        if insertions:
-            self.signals.signageBatch.emit(insertions)
+        # Emit in batches
+        for i in range(0, len(updates), self.batch_size):
+            self.signals.batchReady.emit(updates[i:i + self.batch_size])
+        for i in range(0, len(insertions), self.batch_size):
+            self.signals.signageBatch.emit(insertions[i:i + self.batch_size])
     
     @Slot()
     def run(self):
@@ -255,48 +323,113 @@ class ExcelLoader(QtCore.QRunnable):
             self.signals.finished.emit(msg)
 
 
+@dataclass
+class DocxSyncState:
+    """State of a Docx connector read by a sync, saved once the sync succeeded"""
+    connector: Connector
+    last_modified: int
+    size: int
+    content_hash: str
+    line_ids: set[str] = field(default_factory=set) # tagged lines of the file
+
+    def save(self, cache: dict):
+        """Save the state of the connector
+
+        Only the lines seen at the previous sync or imported (in the connector cache) are recorded,
+        a line whose signage was not inserted is imported again at the next sync.
+        """
+        seen = self.connector.line_ids
+        self.connector.line_ids = {lid for lid in self.line_ids if lid in seen or lid in cache.get("Docx")}
+        self.connector.last_modified = self.last_modified
+        self.connector.size = self.size
+        self.connector.content_hash = self.content_hash
+        AppDatabase.updateConnectorSyncState(self.connector)
+
+
 class DataService:
+    @staticmethod
+    def docxSignages(connectors: dict, regex: str, cache: dict, synced: list[DocxSyncState]):
+        """Yield the signages of the tagged lines added to the Docx connectors since their last sync
+
+        A file unchanged since the last sync is not read. Only the lines not seen at the last
+        sync of a changed file become signages, so a signage deleted by the user is not
+        imported again from its file. The connectors are not modified: their new state is
+        appended to `synced`, to be saved once the signages are inserted.
+        """
+        yielded = set()
+
+        connector: Connector
+        for connector in connectors.values():
+            fpath = Path(connector.value)
+
+            if not fpath.is_file():
+                raise FileNotFoundError
+
+            # Untouched file: same mtime and size as the last sync
+            stat = fpath.stat()
+            if str(connector.last_modified) == str(stat.st_mtime_ns) and connector.size == stat.st_size:
+                continue
+
+            # Touched but same content (e.g. copied or saved without edit)
+            content_hash = file_hash(fpath)
+            if content_hash == connector.content_hash:
+                synced.append(DocxSyncState(connector, stat.st_mtime_ns, stat.st_size, content_hash, set(connector.line_ids)))
+                continue
+
+            result = extract_hash_lines(connector.value)
+            if isinstance(result, tuple):
+                logger.error(f"Cannot extract lines from {connector.value} - Error: {result[1]}")
+                continue
+
+            synced.append(DocxSyncState(connector, stat.st_mtime_ns, stat.st_size, content_hash, set(result)))
+
+            # Line ids hash the line text: new and edited lines are the ids not seen at the last sync
+            seen = connector.line_ids
+
+            for lid, line in result.items():
+                if lid in seen or lid in cache.get("Docx") or lid in yielded:
+                    continue
+                text = line[1:]
+                signage = Signage()
+                signage.title = html2text(text).strip()
+                signage.refkey = find_match(text, regex)
+                signage.type = 3 if line[0] == '!' else 0
+                signage.workspace_id = AppDatabase.activeWorkspace().id
+                src = (f'{{"application":"Docx", "module":"loadFromDocx",' 
+                       f'"file":"{connector.value}", "object_id":"{lid}"}}')
+                signage.source = src
+                yielded.add(lid)
+                yield signage
+
     @staticmethod
     def loadFromDocx(connectors: dict,
                      regex: str,
                      cache: dict,
                      on_ready: callable,
                      on_finished: callable = None):
+        """Import the tagged lines of the Docx files in background
 
-        def func(connectors: dict, regex: str, cache: dict):
+        The signages must be inserted by `on_ready`, or at the latest by `on_finished`: the sync
+        state of the connectors is saved after `on_finished`, and only if the import succeeded.
+        """
+        synced: list[DocxSyncState] = []
 
-            connector: Connector
-            for connector in connectors.values():
-                fpath = Path(connector.value)
-
-                if not fpath.is_file():
-                    raise FileNotFoundError
-
-                last_modified = fpath.stat().st_mtime_ns
-                if connector.last_modified != last_modified:
-                    connector.last_modified = last_modified
-                    result = extract_hash_lines(connector.value)
-                    
-                    for lid, line in result.items():
-                        if lid in cache.get("Docx"):
-                            continue
-                        text = line[1:]
-                        signage = Signage()
-                        signage.title = html2text(text).strip()
-                        signage.refkey = find_match(text, regex)
-                        signage.type = 3 if line[0] == '!' else 0
-                        signage.workspace_id = AppDatabase.activeWorkspace().id
-                        src = (f'{{"application":"Docx", "module":"loadFromDocx",' 
-                               f'"file":"{connector.value}", "object_id":"{lid}"}}')
-                        signage.source = src
-                        cache.get("Docx").add(lid)
-                        yield signage
+        def onFinished(cache: dict, msg: str):
+            if on_finished is not None:
+                on_finished(cache, msg)
+
+            if msg.startswith("⚠️"):
+                logger.warning("Docx import failed, the sync state of the connectors is not saved")
+                return
+
+            for state in synced:
+                state.save(cache)
 
         pool = QtCore.QThreadPool().globalInstance()
 
-        worker = LoadWorker(partial(func, connectors, regex, cache), cache=cache)
+        worker = LoadWorker(partial(DataService.docxSignages, connectors, regex, cache, synced), cache=cache)
         worker.signals.result.connect(on_ready)
-        worker.signals.finished.connect(on_finished)
+        worker.signals.finished.connect(onFinished)
         worker.signals.error.connect(lambda e: logger.error(e))
         pool.start(worker)
 
@@ -305,63 +438,81 @@ class DataService:
                         regex: str,
                         cache: dict,
                         on_ready: callable,
-                        on_finished: callable):
-        
+                        on_finished: callable,
+                        backend: TagBackend | None = None):
+        """Import the tags of the OneNote sections in background
+
+        `on_finished` is called with the cache, the status message and the set of the
+        section ids which could not be fetched (all of them if the import failed).
+        """
+        failed: set[str] = set()
+
+        def onFinished(cache: dict, msg: str):
+            if msg.startswith("⚠️"):
+                failed.update(connector.value for connector in connectors.values())
+            elif failed:
+                msg = f"⚠️ {len(failed)} OneNote section(s) cannot be fetched!"
+            on_finished(cache, msg, failed)
+
         pool = QtCore.QThreadPool().globalInstance()
 
+        if backend is None:
+            backend = PowershellBackend(mconf.app_data_path.joinpath("onenotescrapper.ps1").as_posix())
+        fetcher = TagFetcher(backend, max_workers=settings.value("ONENOTE_WORKERS", 4, int))
+
         def func(connectors: dict, regex: str, cache: dict):
 
-            connector: Connector
-            for connector in connectors.values():
-                section_id = connector.value
-                section_name = connector.name
-                
-                ps_script = mconf.app_data_path.joinpath("onenotescrapper.ps1").as_posix()
-                tags = getTags(ps_script, section_id)                
-
-                tag: OETag
-                for tag in tags:
-                    if tag.ID in cache.get("OneNote"):
-                        continue
-                    signage = Signage()
-                    signage.title = tag.Text
-                    signage.refkey = find_match(tag.Text, regex)
-                    signage_type: SignageType = AppDatabase.cache_signage_type.get(tag.TypeName.capitalize().strip())
-
-                    # Ignore unknown signage
-                    if signage_type is None:
-                        logger.debug(f"Unknown tag's type: {tag}")
-                        continue
-
-                    signage.type = signage_type.uid
-                    signage.workspace_id = AppDatabase.activeWorkspace().id
-                    src = (f'{{"application":"OneNote", "module":"loadFromOnenote",'
-                           f'"section":"{section_name}", "page":"{tag.PageName}",'
-                           f'"object_id":"{tag.ID}",'
-                           f'"link":"{tag.Link}"}}')
-                    signage.source = src
-                    signage.creation_datetime = (datetime.fromisoformat(tag.CreationTime[:-1])
-                                                 .astimezone(timezone.utc).strftime('%Y-%m-%d'))
-                    signage.modification_datetime = tag.LastModifiedTime
-                    cache.get("OneNote").add(tag.ID)
-                    yield signage
+            sections = {connector.value: connector.name for connector in connectors.values()}
+
+            tag: OETag
+            for section_id, tag in fetcher.fetch(sections):
+                section_name = sections[section_id]
+
+                if isinstance(tag, TagFetchError):
+                    logger.error(tag)
+                    failed.add(section_id)
+                    continue
+
+                if tag.ID in cache.get("OneNote"):
+                    continue
+                signage = Signage()
+                signage.title = tag.Text
+                signage.refkey = find_match(tag.Text, regex)
+                signage_type: SignageType = AppDatabase.cache_signage_type.get(tag.TypeName.capitalize().strip())
+
+                # Ignore unknown signage
+                if signage_type is None:
+                    logger.debug(f"Unknown tag's type: {tag}")
+                    continue
+
+                signage.type = signage_type.uid
+                signage.workspace_id = AppDatabase.activeWorkspace().id
+                src = (f'{{"application":"OneNote", "module":"loadFromOnenote",'
+                       f'"section":"{section_name}", "page":"{tag.PageName}",'
+                       f'"object_id":"{tag.ID}",'
+                       f'"link":"{tag.Link}"}}')
+                signage.source = src
+                signage.creation_datetime = (datetime.fromisoformat(tag.CreationTime[:-1])
+                                             .astimezone(timezone.utc).strftime('%Y-%m-%d'))
+                signage.modification_datetime = tag.LastModifiedTime
+                cache.get("OneNote").add(tag.ID)
+                yield signage
   
         worker = LoadWorker(partial(func, connectors, regex, cache), cache=cache)
         worker.signals.result.connect(on_ready)
-        worker.signals.finished.connect(on_finished)
+        worker.signals.finished.connect(onFinished)
         worker.signals.error.connect(lambda e: logger.error(e))
         pool.start(worker)
 
     @staticmethod
-    def export2Excel(sql_model: "SignageSqlModel",
-                     types: list,
+    def export2Excel(types: list,
                      statuses: list,
                      destination: str,
                      include_publicnote: bool,
                      on_finished: callable):
         
         pool = QtCore.QThreadPool().globalInstance()
-        worker = ExportWorker(sql_model, types, statuses, destination, include_publicnote)
+        worker = ExportWorker(types, statuses, destination, include_publicnote)
         worker.signals.finished.connect(on_finished)
         worker.signals.error.connect(lambda e: logger.error(e))
         pool.start(worker)
@@ -373,8 +524,7 @@ class DataService:
                       on_signage_ready,
                       stopSpinner):
 
-        sql_model = model.rootModel()
-        loader = ExcelLoader(sql_model, selected_files, update_title)
+        loader = ExcelLoader(AppDatabase.querySignageKeys(), selected_files, update_title)
 
         def applyBatch(updates: list[UpdateItem]):
             model.layoutAboutToBeChanged.emit()
@@ -414,6 +564,11 @@ class SignageSqlModel(QSqlRelationalTableModel):
         ParentID: DatabaseField
         Workspace: DatabaseField
         Background: DatabaseField
+        Application: DatabaseField
+        Module: DatabaseField
+        ObjectID: DatabaseField
+        Target: DatabaseField
+        Anchor: DatabaseField
         DocCount: DatabaseField # virtual column
         Progress: DatabaseField # virtual column
 
@@ -425,8 +580,9 @@ class SignageSqlModel(QSqlRelationalTableModel):
                 if isinstance(value, DatabaseField)
             ]
         
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, lazy: bool = False):
         super().__init__(parent)
+        self._lazy = lazy
         self.setTable("signage")
         self.initFields()  
 
@@ -462,6 +618,11 @@ class SignageSqlModel(QSqlRelationalTableModel):
         self.Fields.DocCount = DatabaseField('Doc', self.columnCount() - 2, False)
         self.Fields.Progress = DatabaseField('Progress', self.columnCount() - 1, True)
         self.Fields.Background = DatabaseField('Background', self.fieldIndex('background'), False)
+        self.Fields.Application = DatabaseField('application', self.fieldIndex('application'), False)
+        self.Fields.Module = DatabaseField('module', self.fieldIndex('module'), False)
+        self.Fields.ObjectID = DatabaseField('object_id', self.fieldIndex('object_id'), False)
+        self.Fields.Target = DatabaseField('target', self.fieldIndex('target'), False)
+        self.Fields.Anchor = DatabaseField('anchor', self.fieldIndex('anchor'), False)
 
     def _renameHeaders(self):
         for field in self.Fields.fields():
@@ -476,19 +637,96 @@ class SignageSqlModel(QSqlRelationalTableModel):
     def parent_id(self, row):
         return self.data(self.index(row, self.fieldIndex("parentID")))
     
+    def selectStatement(self) -> str:
+        """Lazy mode: the note columns are not selected, they are loaded by the tree model on demand"""
+        statement = super().selectStatement()
+        if self._lazy:
+            for name in ("note", "public_note"):
+                statement = statement.replace(f'signage."{name}"', f'NULL AS "{name}"', 1)
+        return statement
+
     def refresh(self):
         self.submitAll()
         self.setFilter(f"workspace_id={AppDatabase.activeWorkspace().id}")
         self.select()
         return super().refresh()
     
-    def findIndexById(self, id: int) -> QtCore.QModelIndex|None:
-        """Return the QSqlTableModel index of the signage id"""
-        for row in range(self.rowCount()):
-            index = self.index(row, self.Fields.ID.index)
-            if int(self.data(index, QtCore.Qt.ItemDataRole.DisplayRole)) == int(id):
-                return index
-        return None
+    def findIndexById(self, id: int, fetch: bool = True) -> QtCore.QModelIndex|None:
+        """Return the QSqlTableModel index of the signage id
+
+        Rows are fetched by chunks, the next ones are fetched until the id is found
+        unless `fetch` is False.
+        """
+        row = 0
+        while True:
+            for row in range(row, self.rowCount()):
+                index = self.index(row, self.Fields.ID.index)
+                if int(self.data(index, QtCore.Qt.ItemDataRole.DisplayRole)) == int(id):
+                    return index
+
+            if not fetch or not self.canFetchMore():
+                return None
+            row = self.rowCount()
+            self.fetchMore()
+
+    def relationKey(self, column: int, value):
+        """Return the foreign key of a display value, the value itself if the column is not a relation
+
+        Return None if the display value of the relation is not found.
+        """
+        relation = self.relation(column)
+        if not relation.isValid():
+            return value
+
+        rel_model = self.relationModel(column)
+        key_col = rel_model.fieldIndex(relation.indexColumn())
+        display_col = rel_model.fieldIndex(relation.displayColumn())
+
+        match = rel_model.match(
+            rel_model.index(0, display_col), 
+            QtCore.Qt.ItemDataRole.DisplayRole, 
+            value, 
+            hits=1,
+            flags=QtCore.Qt.MatchFlag.MatchExactly
+        )
+        if not match:
+            return None
+
+        return rel_model.data(match[0].sibling(match[0].row(), key_col), QtCore.Qt.ItemDataRole.EditRole)
+
+    def updateSignage(self, signage_id: int, column: int, value) -> bool:
+        """Write a field of a signage in the database, the rows of the model are not fetched"""
+        record = AppDatabase.db().record("signage")
+        if not 0 <= column < record.count():
+            return False
+
+        key = self.relationKey(column, value)
+        if key is None and self.relation(column).isValid():
+            logger.error(f"⚠️ No matching foreign key for {value}")
+            return False
+
+        query = QtSql.QSqlQuery()
+        query.prepare(f"""UPDATE signage SET {record.fieldName(column)} = :value WHERE signage_id = :signage_id;""")
+        query.bindValue(":value", key)
+        query.bindValue(":signage_id", signage_id)
+
+        if not query.exec():
+            logger.error(f"Cannot update signage {signage_id} - Error: {query.lastError().text()}")
+            return False
+
+        return True
+
+    def deleteSignage(self, signage_id: int) -> bool:
+        """Delete a signage from the database, the rows of the model are not fetched"""
+        query = QtSql.QSqlQuery()
+        query.prepare("""DELETE FROM signage WHERE signage_id = :signage_id;""")
+        query.bindValue(":signage_id", signage_id)
+
+        if not query.exec():
+            logger.error(f"Cannot delete signage {signage_id} - Error: {query.lastError().text()}")
+            return False
+
+        return True
 
 
 class SignageProxyModel(ProxyModel):
@@ -498,42 +736,62 @@ class SignageProxyModel(ProxyModel):
         self.setRecursiveFilteringEnabled(True)
 
         self.owner_filter = []
+        self.owner_column = None
         self.evidence_filter = False
         self.evidence_column = 0
+        self.note_matches: set[int] = set()
+        self.id_column = None
+
+    def setNoteMatches(self, signage_ids: set[int], column: int):
+        """Accept the signages whose note matches the user filter, the notes are searched in the database"""
+        self.note_matches = signage_ids
+        if column != self.id_column:
+            self.id_column = column
+            self.clearFilterKeys()
 
     def setOwnerFilter(self, owners: list, column: int):
         self.owner_filter = owners
-        self.owner_column = column
+        if column != self.owner_column:
+            self.owner_column = column
+            self.clearFilterKeys()
 
     def setEvidenceFilter(self, evidence_only: QtCore.Qt.CheckState, column: int):
         self.evidence_filter = evidence_only
-        self.evidence_column = column
+        if column != self.evidence_column:
+            self.evidence_column = column
+            self.clearFilterKeys()
+
+    def buildFilterKey(self, source_row: int, source_parent: QtCore.QModelIndex) -> dict:
+        key = super().buildFilterKey(source_row, source_parent)
+
+        if self.owner_column is not None:
+            key["owner"] = self._sourceData(source_row, self.owner_column, source_parent)
+
+        key["evidence"] = bool(self._sourceData(source_row, self.evidence_column, source_parent))
+
+        if self.id_column is not None:
+            key["id"] = self._sourceData(source_row, self.id_column, source_parent)
+
+        return key
+
+    def acceptsUserFilter(self, key: dict) -> bool:
+        return super().acceptsUserFilter(key) or key.get("id") in self.note_matches
 
     def filterAcceptsRow(self, source_row: int, source_parent: QtCore.QModelIndex) -> bool:
-        owner_filter = True
-        evidence_filter = True
+        key = self.filterKey(source_row, source_parent)
 
         # Owner filter
-        if len(self.owner_filter) > 0:
-            index_owner = self.sourceModel().index(source_row, self.owner_column, source_parent)
-            data_owner = self.sourceModel().data(index_owner, QtCore.Qt.ItemDataRole.DisplayRole)
-            if data_owner in self.owner_filter:
-                owner_filter = True
-            else:
-                owner_filter = False
-
-        # Evidence filter
-        index_evidence = self.sourceModel().index(source_row, self.evidence_column, source_parent)
-        data_evidence = self.sourceModel().data(index_evidence, QtCore.Qt.ItemDataRole.DisplayRole)
+        if len(self.owner_filter) > 0 and key.get("owner") not in self.owner_filter:
+            return False
 
         # with evidence only
-        if self.evidence_filter == QtCore.Qt.CheckState.Checked:
-            evidence_filter = bool(data_evidence)
+        if self.evidence_filter == QtCore.Qt.CheckState.Checked and not key["evidence"]:
+            return False
         # without evidence only
-        elif self.evidence_filter == QtCore.Qt.CheckState.Unchecked:
-            evidence_filter = not bool(data_evidence)
+        elif self.evidence_filter == QtCore.Qt.CheckState.Unchecked and key["evidence"]:
+            return False
             
-        return ProxyModel.filterAcceptsRow(self, source_row, source_parent) and owner_filter and evidence_filter
+        return ProxyModel.filterAcceptsRow(self, source_row, source_parent)
 
     def sortTree(self, column=0, order=QtCore.Qt.SortOrder.AscendingOrder, parent=QtCore.QModelIndex()):
         self.sort(column, order)
@@ -541,6 +799,15 @@ class SignageProxyModel(ProxyModel):
             child = self.index(row, 0, parent)
             self.sortTree(column, order, child)
 
+class LazyTreeItem(TreeItem):
+    """TreeItem whose children and heavy columns are loaded on demand"""
+    def __init__(self, data: list, parent: TreeItem = None, has_children: bool = False):
+        super().__init__(data, parent)
+        self.has_children = has_children
+        self.fetched = False    # children loaded
+        self.loaded = False     # heavy columns loaded
+
+
 class SignageModel(TreeModel):
     """ 
     Tree Model that use QSqlRelationalTableModel to save data in the backend
@@ -549,16 +816,25 @@ class SignageModel(TreeModel):
     user inserted signage -> SQL Model -> disable SQL Model update in setData -> TreeModel
     user edited signage -> SQL Model -> TreeModel 
     user removed signage -> SQL Model -> TreeModel
+
+    In lazy mode, only the top-level signages are loaded at first. Children are
+    queried when their parent is expanded and the note columns when they are read.
+    Filters only apply to the loaded rows.
     """
     connector_cache = {} # word : [refkey_type, ...], onenote: [object_id]}
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, lazy: bool = False):
         super(SignageModel, self).__init__(parent)
-        self._source_model = SignageSqlModel()
+        self._lazy = lazy
+        self._review_cache = {}
+        self._source_model = SignageSqlModel(lazy=lazy)
         self.buildFromSqlModel()
         self.initCache()
         self._sync_enabled = True
 
+    def isLazy(self) -> bool:
+        return self._lazy
+
     def rootModel(self) -> SignageSqlModel:
         return self._source_model
     
@@ -572,6 +848,13 @@ class SignageModel(TreeModel):
 
         self.root_item = TreeItem(headers)
 
+        if self._lazy:
+            for item in self._queryItems(None):
+                item.parent_item = self.root_item
+                self.root_item.child_items.append(item)
+            self.endResetModel()
+            return
+
         # Build a dictionary of all items by id
         items_by_id = {}
         for row in range(self._source_model.rowCount()):
@@ -605,6 +888,120 @@ class SignageModel(TreeModel):
 
         self.endResetModel()
 
+    def _queryItems(self, parent_id: int | None = None, signage_id: int | None = None) -> list[LazyTreeItem]:
+        """Query the children of a signage, or the top-level signages, without the note columns
+
+        Only the signage `signage_id` is queried if given.
+        """
+        heavy_columns = (SignageSqlModel.Fields.Note.index, SignageSqlModel.Fields.PublicNote.index)
+
+        columns = []
+        record = AppDatabase.db().record("signage")
+        for i in range(record.count()):
+            if i == SignageSqlModel.Fields.Type.index:
+                columns.append("signage_type.name")
+            elif i == SignageSqlModel.Fields.Status.index:
+                columns.append("signage_status.name")
+            elif i in heavy_columns:
+                columns.append("NULL")
+            else:
+                columns.append(f"signage.{record.fieldName(i)}")
+
+        if signage_id is not None:
+            condition = "signage.signage_id = :signage_id"
+        elif parent_id is None:
+            # Top-level and orphaned signages
+            condition = """(signage.parentID IS NULL
+                            OR signage.parentID NOT IN (SELECT signage_id FROM signage WHERE workspace_id = :workspace_id))"""
+        else:
+            condition = "signage.parentID = :parent_id"
+
+        query = QtSql.QSqlQuery()
+        query.setForwardOnly(True)
+        query.prepare(f"""
+                        SELECT
+                            {", ".join(columns)},
+                            EXISTS (SELECT 1 FROM signage AS child WHERE child.parentID = signage.signage_id)
+                        FROM signage
+                        LEFT JOIN signage_type ON signage_type.uid = signage.type
+                        LEFT JOIN signage_status ON signage_status.uid = signage.status
+                        WHERE
+                            signage.workspace_id = :workspace_id
+                        AND
+                            {condition}
+                        ORDER BY
+                            signage.signage_id;
+                      """)
+        query.bindValue(":workspace_id", AppDatabase.activeWorkspace().id)
+        if signage_id is not None:
+            query.bindValue(":signage_id", signage_id)
+        elif parent_id is not None:
+            query.bindValue(":parent_id", parent_id)
+
+        items = []
+        if not query.exec():
+            logger.error(f"Query execution failed with error : {query.lastError().text()}")
+            return items
+
+        column_count = self._source_model.columnCount()
+        while query.next():
+            data = [query.value(i) for i in range(record.count())]
+            data.extend([None] * (column_count - len(data)))   # virtual columns
+            item = LazyTreeItem(data, has_children=bool(query.value(record.count())))
+            self._applyReview(item, self._review_cache)
+            items.append(item)
+
+        return items
+
+    def _loadHeavyColumns(self, item: LazyTreeItem):
+        """Load the note columns of a signage"""
+        item.loaded = True
+
+        query = QtSql.QSqlQuery()
+        query.prepare("""SELECT note, public_note FROM signage WHERE signage_id = :signage_id;""")
+        query.bindValue(":signage_id", item.data(SignageSqlModel.Fields.ID.index))
+
+        if not query.exec():
+            logger.error(f"Query execution failed with error : {query.lastError().text()}")
+        elif query.next():
+            item.setData(SignageSqlModel.Fields.Note.index, query.value(0))
+            item.setData(SignageSqlModel.Fields.PublicNote.index, query.value(1))
+
+    def data(self, index: QtCore.QModelIndex, role: int = None):
+        if self._lazy and index.isValid():
+            item = self.getItem(index)
+            if (isinstance(item, LazyTreeItem) and not item.loaded
+                and index.column() in (SignageSqlModel.Fields.Note.index, SignageSqlModel.Fields.PublicNote.index)
+                and role in (QtCore.Qt.ItemDataRole.DisplayRole, QtCore.Qt.ItemDataRole.EditRole)):
+                self._loadHeavyColumns(item)
+        return super().data(index, role)
+
+    def hasChildren(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> bool:
+        item = self.getItem(parent)
+        if isinstance(item, LazyTreeItem) and not item.fetched:
+            return item.has_children
+        return super().hasChildren(parent)
+
+    def canFetchMore(self, parent: QtCore.QModelIndex) -> bool:
+        item = self.getItem(parent)
+        return isinstance(item, LazyTreeItem) and not item.fetched and item.has_children
+
+    def fetchMore(self, parent: QtCore.QModelIndex):
+        item: LazyTreeItem = self.getItem(parent)
+        if not isinstance(item, LazyTreeItem) or item.fetched:
+            return
+
+        item.fetched = True
+        children = self._queryItems(item.data(SignageSqlModel.Fields.ID.index))
+        if not children:
+            return
+
+        self.beginInsertRows(parent, 0, len(children) - 1)
+        for child in children:
+            child.parent_item = item
+        item.child_items[0:0] = children
+        self.endInsertRows()
+
     def setData(self, index: QtCore.QModelIndex, value, role: int) -> bool:
         if role != QtCore.Qt.ItemDataRole.EditRole:
             return False
@@ -612,42 +1009,27 @@ class SignageModel(TreeModel):
         if self._sync_enabled: # Disabled when inserting
             # --- Apply datachange to sql Model first ---
             signage_id = index.sibling(index.row(), SignageSqlModel.Fields.ID.index).data()
-            root_index = self._source_model.findIndexById(signage_id)
+            # Lazy mode: only the rows already fetched by the SQL model are looked into
+            root_index = self._source_model.findIndexById(signage_id, fetch=not self._lazy)
 
-            if not root_index:
+            if root_index is None and self._lazy:
+                # Row not fetched by the SQL model, written directly
+                result = self._source_model.updateSignage(signage_id, index.column(), value)
+            elif not root_index:
                 return
-
-            if not root_index.isValid():
+            elif not root_index.isValid():
                 return True
+            else:
+                # Ensure we target the same column
+                sql_index = root_index.sibling(root_index.row(), index.column())
 
-            # Ensure we target the same column
-            sql_index = root_index.sibling(root_index.row(), index.column())
-
-            # Handle relational field resolution
-            relation = self._source_model.relation(index.column())
-            if relation.isValid():
-                # Convert the display value to the key value
-                rel_model = self._source_model.relationModel(index.column())
-                key_col = rel_model.fieldIndex(relation.indexColumn())
-                display_col = rel_model.fieldIndex(relation.displayColumn())
-
-                match = rel_model.match(
-                    rel_model.index(0, display_col), 
-                    QtCore.Qt.ItemDataRole.DisplayRole, 
-                    value, 
-                    hits=1,
-                    flags=QtCore.Qt.MatchFlag.MatchExactly
-                )
-                if match:
-                    # Convert found index to key_col index
-                    key_value = rel_model.data(match[0].sibling(match[0].row(), key_col),
-                                                QtCore.Qt.ItemDataRole.EditRole)
-                    result = self._source_model.setData(sql_index, key_value, role)
-                else:
+                # Handle relational field resolution, convert the display value to the key value
+                key_value = self._source_model.relationKey(index.column(), value)
+                if key_value is None and self._source_model.relation(index.column()).isValid():
                     logger.error(f"⚠️ No matching foreign key for {value}")
                     result = False
-            else:
-                result = self._source_model.setData(sql_index, value, role)
+                else:
+                    result = self._source_model.setData(sql_index, key_value, role)
         else:
             result = True
         
@@ -688,36 +1070,44 @@ class SignageModel(TreeModel):
             This cache is intended to avoid to load the same signage and the duplicate.        
         """
         self.connector_cache.clear()
-        self.connector_cache.setdefault("OneNote", set())
-        self.connector_cache.setdefault("Docx", set())
-
-        connector_cnt = 0
-        for row in range(self.rootModel().rowCount()):
-            source_json = (self.rootModel().index(row,
-                                                  SignageSqlModel.Fields.Source.index)
-                                                  .data(QtCore.Qt.ItemDataRole.DisplayRole))
-            if source_json.strip() == "":
-                continue
+        self.connector_cache.update(AppDatabase.querySignageObjectIds(["OneNote", "Docx"]))
 
-            try:
-                source: dict = json.loads(source_json)
-            except Exception as e:
-                logger.error(f"Fail to load json: '{source_json}'. error:{e}")
-                continue
-
-            if isinstance(source, dict):
-                application = source.get("application")
-                if application == "OneNote":
-                    object_id = source.get("object_id")
-                    self.connector_cache.setdefault("OneNote", set()).add(object_id)
-                    connector_cnt += 1
-                elif application == "Docx":
-                    object_id = source.get("object_id")
-                    self.connector_cache.setdefault("Docx", set()).add(object_id)        
-                    connector_cnt += 1
+        connector_cnt = sum(map(len, self.connector_cache.values()))
 
         logger.info(f"Connector cache's size: {connector_cnt}")
 
+    @staticmethod
+    def sourceKeys(source: str) -> tuple:
+        """Return the application, module, object_id, target and anchor of a signage source
+
+        The target is the file, the link or the note reached from the signage.
+        """
+        if not source:
+            return None, None, None, None, None
+
+        try:
+            source_dict = json.loads(source)
+        except Exception as e:
+            logger.error(f"Fail to load json: '{source}'. error:{e}")
+            return None, None, None, None, None
+
+        if not isinstance(source_dict, dict):
+            return None, None, None, None, None
+
+        application = source_dict.get("application")
+        module = source_dict.get("module")
+
+        if module == "Notebook":
+            target = source_dict.get("item_title")
+        elif application == "Docx":
+            target = source_dict.get("file")
+        elif application == "OneNote":
+            target = source_dict.get("link")
+        else:
+            target = source_dict.get("filepath")
+
+        return application, module, source_dict.get("object_id"), target, source_dict.get("anchor")
+
     def insertSignage(self, signage: Signage):
         """Insert new signage into the database"""
         signage.workspace_id = AppDatabase.activeWorkspace().id
@@ -729,6 +1119,12 @@ class SignageModel(TreeModel):
         record.setValue(SignageSqlModel.Fields.Type.index, signage.type)
         record.setValue(SignageSqlModel.Fields.Status.index, signage.status)
         record.setValue(SignageSqlModel.Fields.Source.index, signage.source)
+        application, module, object_id, target, anchor = self.sourceKeys(signage.source)
+        record.setValue(SignageSqlModel.Fields.Application.index, application)
+        record.setValue(SignageSqlModel.Fields.Module.index, module)
+        record.setValue(SignageSqlModel.Fields.ObjectID.index, object_id)
+        record.setValue(SignageSqlModel.Fields.Target.index, target)
+        record.setValue(SignageSqlModel.Fields.Anchor.index, anchor)
         record.setValue(SignageSqlModel.Fields.Note.index, signage.note)
         record.setValue(SignageSqlModel.Fields.PublicNote.index, signage.public_note)
         record.setValue(SignageSqlModel.Fields.ID.index, signage.signage_id)
@@ -740,6 +1136,10 @@ class SignageModel(TreeModel):
         if not self._source_model.insertRecord(-1, record):
             logger.error(self._source_model.lastError().text())
             return False
+
+        # Imported from a connector: not imported again (see DocxSyncState)
+        if object_id and application in self.connector_cache:
+            self.connector_cache[application].add(object_id)
         
         self._source_model.refresh()
 
@@ -749,17 +1149,39 @@ class SignageModel(TreeModel):
         if not new_id:
             return
                 
-        new_index = self._source_model.findIndexById(new_id)
+        if self._lazy:
+            # Queried alone, the SQL model is not paged up to the new row
+            new_items = self._queryItems(signage_id=new_id)
+            if not new_items:
+                logger.error("New record not found!")
+                return
+            self._loadHeavyColumns(new_items[0])
+            values = [new_items[0].data(column) for column in range(self.columnCount())]
+        else:
+            new_index = self._source_model.findIndexById(new_id)
 
-        if not new_index:
-            logger.error("Index of new record not found!")
-            return
-        
-        new_record = self._source_model.record(new_index.row())
+            if not new_index:
+                logger.error("Index of new record not found!")
+                return
+            
+            new_record = self._source_model.record(new_index.row())
+            values = [new_record.value(column) for column in range(self.columnCount())]
 
         if signage.parentID:
             parent_index = self.findIndexById(signage.parentID, SignageSqlModel.Fields.ID.index)
             parent_index = parent_index.sibling(parent_index.row(), 0)
+
+            if self._lazy:
+                parent_item = self.getItem(parent_index) if parent_index.isValid() else None
+                if parent_item is None:
+                    # Parent not loaded yet, the signage is queried with it
+                    return True
+                if isinstance(parent_item, LazyTreeItem) and not parent_item.fetched:
+                    # Children not loaded yet: they are queried with the new signage, the rows
+                    # inserted under the parent make the view query hasChildren again
+                    parent_item.has_children = True
+                    self.fetchMore(parent_index)
+                    return True
         else:
             parent_index = QtCore.QModelIndex()
 
@@ -769,8 +1191,7 @@ class SignageModel(TreeModel):
             return False
         
         self._sync_enabled=False
-        for column in range(self.columnCount()):
-            data = new_record.value(column)
+        for column, data in enumerate(values):
             index: QtCore.QModelIndex = self.index(row, column, parent_index)
             if not self.setData(index, data, QtCore.Qt.ItemDataRole.EditRole):
                 logger.error(f"Failed to set data={data}")
@@ -790,12 +1211,15 @@ class SignageModel(TreeModel):
             logger.error(f"Signage ID not found from TreeModel: row={index.row()}")
             return False
         
-        sql_index = self._source_model.findIndexById(signage_id)
-        if not sql_index:
+        sql_index = self._source_model.findIndexById(signage_id, fetch=not self._lazy)
+        if sql_index is None and self._lazy:
+            # Row not fetched by the SQL model, deleted directly
+            if not self._source_model.deleteSignage(signage_id):
+                return False
+        elif not sql_index:
             logger.error(f"Fail to find SQL Model's index for signage ID: {signage_id}")
             return False
-        
-        if not self._source_model.removeRow(sql_index.row(), QtCore.QModelIndex()):
+        elif not self._source_model.removeRow(sql_index.row(), QtCore.QModelIndex()):
             logger.error(f"Fail to remove record '{signage_id}' from SQL model:\n\t{self._source_model.lastError().text()}")
             return False
 
@@ -806,40 +1230,58 @@ class SignageModel(TreeModel):
         self._source_model.refresh()
         return True       
 
-    def summary(self) -> list:
+    def summary(self, use_cache: bool = True) -> list:
         """Get a summary of signage's status"""
         
         #          | Request | Question | 
         # Open     |   1     |   1      |  
         # Close    |   0     |   1      |  
         # Total    |   2     |   2      |
-                
+
+        statuses: list[SignageStatus] = list(AppDatabase.cache_signage_status.values())
+        types: list[SignageType] = list(AppDatabase.cache_signage_type.values())
+
         # Vertical headers
-        vheaders = list(AppDatabase.cache_signage_status.strkeys())
+        vheaders = [status.name for status in statuses]
         vheaders.append("Total")
 
         # Horizontal headers
-        hheaders = list(AppDatabase.cache_signage_type.strkeys())
+        hheaders = [signage_type.name for signage_type in types]
 
         # Init data table
         data = [[0] * len(hheaders) for i in range(len(vheaders))]  
 
         # Populate data table
-        for row in range(self._source_model.rowCount()):
-            t_str = (self._source_model.index(row, SignageSqlModel.Fields.Type.index)
-                 .data())
-            s_str = (self._source_model.index(row, SignageSqlModel.Fields.Status.index)
-                 .data())
-            
-            t = AppDatabase.cache_signage_type.get_int_key(t_str)
-            s = AppDatabase.cache_signage_status.get_int_key(s_str)
+        status_rows = {status.uid: row for row, status in enumerate(statuses)}
+        type_columns = {signage_type.uid: column for column, signage_type in enumerate(types)}
+
+        for (status, signage_type), count in AppDatabase.querySignageSummary(use_cache).items():
+            s = status_rows.get(status)
+            t = type_columns.get(signage_type)
 
             if t is not None and s is not None:
-                data[int(s)][int(t)] += 1    # row data
-                data[-1][int(t)] += 1        # Total row
+                data[s][t] += count    # row data
+                data[-1][t] += count   # Total row
 
         return data, vheaders, hheaders
 
+    @staticmethod
+    def _reviewValues(item: TreeItem, cache: dict) -> tuple | None:
+        """Return the (doc count, progress) of a signage, None if there is nothing to update"""
+        if item.data(SignageSqlModel.Fields.Type.index) == "Request":
+            progress = cache.get(item.data(SignageSqlModel.Fields.Refkey.index), 0)
+            if not progress:
+                return None
+            return progress.get('total'), progress.get('percentage')
+        return "", ""
+
+    def _applyReview(self, item: TreeItem, cache: dict):
+        """Set the review progress of an item that is not in the model yet"""
+        values = self._reviewValues(item, cache)
+        if values is not None:
+            item.setData(SignageSqlModel.Fields.DocCount.index, values[0])
+            item.setData(SignageSqlModel.Fields.Progress.index, values[1])
+
     def updateReviewProgess(self):
         """Update the signage progress bar
         
@@ -852,25 +1294,51 @@ class SignageModel(TreeModel):
         - Evidence status changed
         """
         cache = AppDatabase.queryEvidenceReview()
-
-        self._sync_enabled = False
-        for index in self.iter_model_rows():
-            refkey = index.sibling(index.row(), SignageSqlModel.Fields.Refkey.index).data(QtCore.Qt.ItemDataRole.DisplayRole)
-            signage_type = index.sibling(index.row(), SignageSqlModel.Fields.Type.index).data(QtCore.Qt.ItemDataRole.DisplayRole)
-            doc_index =  index.sibling(index.row(), SignageSqlModel.Fields.DocCount.index)
-            progress_index = index.sibling(index.row(), SignageSqlModel.Fields.Progress.index)
-
-            if signage_type == "Request" :
-                progress = cache.get(refkey, 0)
-                if progress:
-                    percentage = progress.get('percentage')
-                    total = progress.get('total')
-                    logger.debug(f'refkey: {refkey}, progress:{percentage}, total:{total}')
-                    self.setData(doc_index, total, QtCore.Qt.ItemDataRole.EditRole)
-                    self.setData(progress_index, percentage, QtCore.Qt.ItemDataRole.EditRole)
-            else:
-                self.setData(doc_index, "", QtCore.Qt.ItemDataRole.EditRole)
-                self.setData(progress_index, "", QtCore.Qt.ItemDataRole.EditRole)
-        self._sync_enabled = True
+        self._review_cache = cache
+
+        doc_col = SignageSqlModel.Fields.DocCount.index
+        progress_col = SignageSqlModel.Fields.Progress.index
+
+        # Compute the new values first: {parent_item: [(row, item, total, percentage), ...]}
+        changes: dict[TreeItem, list] = {}
+        stack: list[TreeItem] = [self.root_item]
+        while stack:
+            parent_item = stack.pop()
+            item: TreeItem
+            for row, item in enumerate(parent_item.child_items):
+                if item.child_items:
+                    stack.append(item)
+
+                values = self._reviewValues(item, cache)
+                if values is None:
+                    continue
+                total, percentage = values
+
+                if item.data(doc_col) != total or item.data(progress_col) != percentage:
+                    changes.setdefault(parent_item, []).append((row, item, total, percentage))
+
+        # Write into the TreeItems and notify the views once per run of consecutive rows
+        roles = [QtCore.Qt.ItemDataRole.DisplayRole, QtCore.Qt.ItemDataRole.EditRole]
+        for rows in changes.values():
+            first = last = None
+            for row, item, total, percentage in rows:
+                item.setData(doc_col, total)
+                item.setData(progress_col, percentage)
+
+                if last is not None and row == last[0] + 1:
+                    last = (row, item)
+                    continue
+                if first is not None:
+                    self.dataChanged.emit(self.createIndex(first[0], doc_col, first[1]),
+                                          self.createIndex(last[0], progress_col, last[1]),
+                                          roles)
+                first = last = (row, item)
+
+            if first is not None:
+                self.dataChanged.emit(self.createIndex(first[0], doc_col, first[1]),
+                                      self.createIndex(last[0], progress_col, last[1]),
+                                      roles)
+
+        logger.debug(f"Review progress updated: {sum(map(len, changes.values()))} row(s) changed")
 
  
\ No newline at end of file
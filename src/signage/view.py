@@ -1,5 +1,5 @@
 import logging
-from json import loads, dumps
+from json import dumps
 from base64 import b64decode
 from functools import partial
 from qtpy import Qt, QtGui, QtCore, Signal, Slot, QtWidgets, QtSql
@@ -16,6 +16,7 @@ from base_delegates import NoteColumnDelegate, CompositeDelegate
 from signage.model import SignageModel, SignageSqlModel, SignageProxyModel, DataService
 from signage.signage_style import TABLE_STYLE, DARK_TABLE_STYLE
 from signage.connector_model import ConnectorModel
+from signage.connector_sync import ConnectorSyncScheduler
 from signage.dialogs import SignageDialog, FilterDialog, ExportDialog, ImportDialog
 
 from widgets.basetab import BaseTab
@@ -221,6 +222,10 @@ class SignageTab(BaseTab):
         self.createAction()
         self.initUI()
 
+        self.sync_scheduler = ConnectorSyncScheduler(self.model, parent=self)
+        self.sync_scheduler.sigSynced.connect(self._on_background_sync)
+        self.sync_scheduler.start()
+
     def signageSource(self) -> dict:
         return {"application":"InspectorMate", "module":"Signage"}
 
@@ -403,7 +408,7 @@ class SignageTab(BaseTab):
         self.restoreTableColumnWidth()
 
         # --- Connections ---
-        self.search_tool.textChanged.connect(self.searchfor)
+        self.search_timer.timeout.connect(lambda: self.searchfor(self.search_tool.text()))
 
         self.model.updateReviewProgess()
 
@@ -675,12 +680,12 @@ class SignageTab(BaseTab):
 
     @Slot(str)
     def searchfor(self, text: str):
+        # Notes are searched in the database, they are not loaded in lazy mode
+        self.proxymodel.setNoteMatches(AppDatabase.querySignageIdsByNote(text), SignageSqlModel.Fields.ID.index)
         self.proxymodel.setUserFilter(text,
                                        [SignageSqlModel.Fields.Refkey.index,
                                         SignageSqlModel.Fields.Status.index,
                                         SignageSqlModel.Fields.Title.index,
-                                        SignageSqlModel.Fields.Note.index,
-                                        SignageSqlModel.Fields.PublicNote.index,
                                         SignageSqlModel.Fields.Owner.index,
                                         SignageSqlModel.Fields.Source.index])
 
@@ -733,19 +738,30 @@ class SignageTab(BaseTab):
     def _on_signage_ready(self, signage: Signage):
         self.model.insertSignage(signage=signage)
 
-    def _on_load_connector_finished(self, cache, msg=""):
+    def _on_load_connector_finished(self, cache, msg="", failed=None):
         """Called after batch insert"""
         self.model.connector_cache = cache
+        self.sync_scheduler.release()
         self.stopSpinner(msg)
         AppDatabase.update_document_signage_id()
         self.updateReviewProgess()
 
+    def _on_background_sync(self, count: int):
+        status_signal.status_message.emit(f"✔️ {count} signage(s) imported from connectors", 7000)
+        AppDatabase.update_document_signage_id()
+        self.updateReviewProgess()
+
     def importFromConnector(self, connector_type: ConnectorType):
         connectors: dict = ConnectorModel.connectors().get(connector_type.value)
 
         if not connectors:
             return
 
+        if self.sync_scheduler.isBusy():
+            status_signal.status_message.emit("⚠️ Connectors are being synchronised in background, try again later", 7000)
+            return
+        self.sync_scheduler.hold()
+
         regex = (mconf.default_regex if mconf.settings.value("regex") is None 
                  or mconf.settings.value("regex") == "" else mconf.settings.value("regex"))
 
@@ -815,8 +831,7 @@ class SignageTab(BaseTab):
         include_public_note = self.export_dialog.include_public_note 
 
         self.startSpinner()
-        DataService.export2Excel(self.model.rootModel(),
-                                 selected_types,
+        DataService.export2Excel(selected_types,
                                  selected_statuses,
                                  outfile_destination,
                                  include_public_note,
@@ -847,23 +862,21 @@ class SignageTab(BaseTab):
             return
         
         src_index = self.proxymodel.mapToSource(index)
-        source_idx = src_index.sibling(src_index.row(), SignageSqlModel.Fields.Source.index)
-        source = self.model.data(source_idx, Qt.ItemDataRole.DisplayRole)
-        source_dict: dict = loads(source)
+        app = src_index.sibling(src_index.row(), SignageSqlModel.Fields.Application.index).data(Qt.ItemDataRole.DisplayRole)
+        module = src_index.sibling(src_index.row(), SignageSqlModel.Fields.Module.index).data(Qt.ItemDataRole.DisplayRole)
+
+        if app not in ("InspectorMate", "Docx", "OneNote"):
+            return
 
-        app = source_dict.get("application")
-        module = source_dict.get("module")
-        target = None
+        target = src_index.sibling(src_index.row(), SignageSqlModel.Fields.Target.index).data(Qt.ItemDataRole.DisplayRole)
 
         if app == "InspectorMate":
             if module == "Notebook":
-                target = source_dict.get("item_title")
-                anchor = source_dict.get("anchor", "")
+                anchor = src_index.sibling(src_index.row(), SignageSqlModel.Fields.Anchor.index).data(Qt.ItemDataRole.DisplayRole) or ""
                 if target:
                     fpath = f"{AppDatabase.activeWorkspace().notebook_path}/{target}"
                     self.sigOpenNote.emit(fpath, anchor)
             else:
-                target = source_dict.get("filepath")
                 if target:
                     status_signal.status_message.emit("Opening target...", 5000)
                     try:
@@ -875,10 +888,8 @@ class SignageTab(BaseTab):
 
         else:
             if module == "loadFromDocx":
-                target = source_dict.get("file")
                 open_file(target)
             elif module == "loadFromOnenote":
-                target = source_dict.get("link")
                 QtGui.QDesktopServices.openUrl(QtCore.QUrl(target))
 
     def colorCell(self):
@@ -921,6 +932,7 @@ class SignageTab(BaseTab):
         settings.endGroup()
 
     def closeEvent(self, a0):
+        self.sync_scheduler.stop()
         self.saveTableColumnWidth()
         self.mapper.submit()
         return super().closeEvent(a0)
\ No newline at end of file
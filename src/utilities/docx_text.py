@@ -0,0 +1,69 @@
+"""Streaming text reader of Word (.docx) documents
+
+This module is imported by the pool processes, keep it free of Qt imports.
+"""
+from zipfile import ZipFile
+from xml.etree import ElementTree
+
+_W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_MC_NS = "{http://schemas.openxmlformats.org/markup-compatibility/2006}"
+_OFFICE_DOCUMENT_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+
+def _docx_main_part(archive: ZipFile) -> str:
+    """Return the path of the main document part of a .docx archive"""
+    try:
+        with archive.open("_rels/.rels") as rels:
+            for _, element in ElementTree.iterparse(rels):
+                if element.get("Type") == _OFFICE_DOCUMENT_REL:
+                    return element.get("Target").lstrip("/")
+    except KeyError:
+        pass
+    return "word/document.xml"
+
+def iter_docx_lines(docx_path):
+    """
+    Stream the text lines of a Word (.docx) document.
+
+    The main document part is parsed with iterparse, one paragraph at a time.
+    Lines are split the same way as mammoth's raw text: runs text and tabs,
+    deleted text and alternate content choices are skipped, and paragraphs
+    nested in a paragraph (text boxes) are lines of their own.
+    """
+    with ZipFile(docx_path) as archive:
+        with archive.open(_docx_main_part(archive)) as document:
+            buffers: list[list[str]] = [[]]  # one text buffer per open paragraph
+            run_depth = 0
+            skip_depth = 0  # inside mc:Choice, the mc:Fallback is read instead
+
+            for event, element in ElementTree.iterparse(document, events=("start", "end")):
+                tag = element.tag
+
+                if event == "start":
+                    if tag == f"{_W_NS}r":
+                        run_depth += 1
+                    elif tag == f"{_MC_NS}Choice":
+                        skip_depth += 1
+                    elif tag == f"{_W_NS}p" and not skip_depth:
+                        buffers.append([])
+                    continue
+
+                buffer = buffers[-1]
+
+                if tag == f"{_W_NS}r":
+                    run_depth -= 1
+                elif tag == f"{_MC_NS}Choice":
+                    skip_depth -= 1
+                elif skip_depth:
+                    pass
+                elif tag == f"{_W_NS}t" and run_depth:
+                    buffer.append(element.text or "")
+                elif tag == f"{_W_NS}tab" and run_depth:
+                    buffer.append("\t")
+                elif tag == f"{_W_NS}noBreakHyphen" and run_depth:
+                    buffer.append("\u2011")
+                elif tag == f"{_W_NS}p":
+                    yield from "".join(buffers.pop()).splitlines()
+                    element.clear()
+
+            for buffer in buffers:
+                yield from "".join(buffer).splitlines()
@@ -0,0 +1,208 @@
+"""Streaming Excel reader
+
+Workbooks are parsed on a process pool, one workbook per process, with a
+streaming engine (calamine if installed, openpyxl read_only otherwise).
+Only the requested columns are kept, and the rows are spooled by chunks to
+a temporary file read back by the parent process, which merges and
+deduplicates the chunks as the workbooks complete.
+
+This module is imported by the pool processes, keep it free of Qt imports.
+"""
+import os
+import pickle
+import logging
+import tempfile
+from datetime import datetime, date, time
+from typing import Iterator
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:
+    CalamineWorkbook = None
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 10_000 # rows
+
+
+def _cellValue(value) -> str | None:
+    """Convert a cell value to str the same way `pd.read_excel(dtype=str)` does"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    elif isinstance(value, date) and not isinstance(value, datetime):
+        value = datetime.combine(value, time())
+    return str(value)
+
+def _headers(row) -> list[str]:
+    """Name the columns like pandas does: blank headers become 'Unnamed: i', duplicates get a '.n' suffix"""
+    headers = []
+    seen = {}
+    for i, value in enumerate(row):
+        name = _cellValue(value) or f"Unnamed: {i}"
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        headers.append(name)
+    return headers
+
+def _iterRows(file: str):
+    """Yield the rows of the first worksheet"""
+    if CalamineWorkbook is not None:
+        sheet = CalamineWorkbook.from_path(file).get_sheet_by_index(0)
+        rows = sheet.iter_rows() if hasattr(sheet, "iter_rows") else sheet.to_python()
+        yield from rows
+    else:
+        from openpyxl import load_workbook
+        wb = load_workbook(file, read_only=True, data_only=True)
+        try:
+            yield from wb.worksheets[0].iter_rows(values_only=True)
+        finally:
+            wb.close()
+
+def iterExcelFile(file: str,
+                  usecols: list[str] | None = None,
+                  chunk_size: int = CHUNK_SIZE) -> Iterator[tuple[list[str], list[tuple]]]:
+    """Read the first worksheet of an Excel file by chunks of `chunk_size` rows
+
+    Yield the column names and the rows as tuples of str (None for empty cells).
+    Only the columns in `usecols` are returned, blank rows are skipped like `pd.read_excel` does.
+    """
+    rows_iter = _iterRows(file)
+    header = next(rows_iter, None)
+
+    if header is None:
+        return
+
+    headers = _headers(header)
+    if usecols is None:
+        positions = list(range(len(headers)))
+    else:
+        positions = [i for i, name in enumerate(headers) if name in usecols]
+    columns = [headers[i] for i in positions]
+
+    rows = []
+    for row in rows_iter:
+        values = tuple(_cellValue(value) for value in row)
+        if all(value is None for value in values):
+            continue
+        rows.append(tuple(values[i] if i < len(values) else None for i in positions))
+
+        if len(rows) >= chunk_size:
+            yield columns, rows
+            rows = []
+
+    if rows:
+        yield columns, rows
+
+def _spoolExcelFile(file: str, usecols: list[str] | None, chunk_size: int) -> str:
+    """Write the chunks of a workbook to a temporary file, return its path
+
+    Run by the pool processes: a workbook is never held in memory nor sent back in one piece.
+    """
+    fd, path = tempfile.mkstemp(prefix="excel_", suffix=".pickle")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in iterExcelFile(file, usecols, chunk_size):
+                pickle.dump(chunk, f, protocol=pickle.HIGHEST_PROTOCOL)
+    except BaseException:
+        os.remove(path)
+        raise
+    return path
+
+def _readSpool(path: str) -> Iterator[tuple[list[str], list[tuple]]]:
+    """Yield the chunks written by `_spoolExcelFile`, then delete the file"""
+    try:
+        with open(path, "rb") as f:
+            while True:
+                try:
+                    yield pickle.load(f)
+                except EOFError:
+                    return
+    finally:
+        os.remove(path)
+
+def readExcelFiles(files: list,
+                   usecols: list[str] | None = None,
+                   drop_duplicate: str | bool = 'first',
+                   max_workers: int | None = None,
+                   chunk_size: int = CHUNK_SIZE) -> pd.DataFrame:
+    """Read and merge the first worksheet of several Excel files
+
+    The workbooks are read by chunks of rows, deduplicated incrementally as they are received,
+    `drop_duplicate` follows `DataFrame.drop_duplicates(keep=...)`. Columns missing from a
+    workbook are left empty, like `pd.concat`.
+    """
+    files = [str(file) for file in files]
+
+    if max_workers is None:
+        max_workers = min(len(files), os.cpu_count() or 1)
+
+    executor = None
+    futures = []
+    if max_workers > 1:
+        executor = ProcessPoolExecutor(max_workers=max_workers)
+        futures = [executor.submit(_spoolExcelFile, file, usecols, chunk_size) for file in files]
+        chunks = (chunk for future in futures for chunk in _readSpool(future.result()))
+    else:
+        chunks = (chunk for file in files for chunk in iterExcelFile(file, usecols, chunk_size))
+
+    columns: list[str] = []
+    records: list[dict | None] = []
+    # Hash of the record -> [occurrences, position of the record kept]
+    seen: dict[int, list[int]] = {}
+
+    try:
+        for file_columns, rows in chunks:
+            for name in file_columns:
+                if name not in columns:
+                    columns.append(name)
+
+            for row in rows:
+                record = {name: value for name, value in zip(file_columns, row) if value is not None}
+                if not record:
+                    # Blank in the requested columns, not a row to import
+                    continue
+
+                # Same record whatever the order of the columns in its workbook. A 64-bit hash
+                # instead of the record itself: a collision between two rows is negligible
+                key = hash(tuple(sorted(record.items())))
+                entry = seen.get(key)
+                if entry is None:
+                    seen[key] = [1, len(records)]
+                    records.append(record)
+                    continue
+
+                entry[0] += 1
+                if drop_duplicate == 'last':
+                    records[entry[1]] = None
+                    entry[1] = len(records)
+                    records.append(record)
+    finally:
+        chunks.close()
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+            # Spool files of the workbooks not merged (e.g. after an error)
+            for future in futures:
+                if not future.cancelled() and future.exception() is None and os.path.exists(future.result()):
+                    os.remove(future.result())
+
+    if drop_duplicate is False:
+        # Drop every row that occurs more than once
+        kept = {position for count, position in seen.values() if count == 1}
+        records = [record for position, record in enumerate(records) if position in kept]
+    else:
+        records = [record for record in records if record is not None]
+
+    if usecols is not None:
+        columns = [name for name in usecols if name in columns]
+
+    logger.debug(f"{len(records)} rows read from {len(files)} file(s)")
+
+    return pd.DataFrame.from_records(records, columns=columns)
@@ -0,0 +1,49 @@
+"""HTML to plain text conversion on a process pool
+
+This module is imported by the pool processes, keep it free of Qt imports.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from html2text import html2text
+
+
+def htmlToText(html: str | None) -> str | None:
+    """Convert an HTML note to plain text"""
+    if html is None:
+        return None
+    return html2text(html).strip()
+
+
+class HtmlConverter:
+    """Convert batches of HTML notes to plain text
+
+    Batches smaller than `min_batch` are converted in the calling thread,
+    larger ones are spread over a process pool.
+    """
+
+    def __init__(self, max_workers: int | None = None, min_batch: int = 64):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.min_batch = min_batch
+        self._executor: ProcessPoolExecutor | None = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+
+    def convert(self, notes: list) -> list:
+        if self.max_workers < 2 or len(notes) < self.min_batch:
+            return [htmlToText(note) for note in notes]
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+
+        chunksize = max(1, len(notes) // (self.max_workers * 4))
+        return list(self._executor.map(htmlToText, notes, chunksize=chunksize))
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,60 @@
+"""Text extraction of the documents for the full-text index
+
+A document is extracted as a list of pages, documents without pages (Word, text)
+are a single page. This module is imported by the pool processes, keep it free
+of Qt imports.
+"""
+from pathlib import Path
+
+import pymupdf
+
+from utilities.docx_text import iter_docx_lines
+
+PDF_SUFFIXES = (".pdf", ".epub", ".xps")
+TEXT_SUFFIXES = (".txt", ".md")
+SUPPORTED_SUFFIXES = (*PDF_SUFFIXES, ".docx", *TEXT_SUFFIXES)
+
+# Increased when the extracted text changes, the documents are indexed again
+TEXT_VERSION = 1
+
+# Flags of Page.search_for: hyphens at the end of the lines are joined the same way
+SEARCH_FLAGS = (pymupdf.TEXT_DEHYPHENATE
+                | pymupdf.TEXT_PRESERVE_WHITESPACE
+                | pymupdf.TEXT_PRESERVE_LIGATURES
+                | pymupdf.TEXT_MEDIABOX_CLIP)
+
+
+def normalizeText(text: str) -> str:
+    """Collapse the whitespaces, the index and the queries are compared on this form"""
+    return " ".join(text.split())
+
+
+def pdfPages(filepath: str) -> list[str]:
+    """Return the normalized text of each page of a document opened by MuPDF
+
+    The text is extracted as search_for sees it, the line breaks become whitespaces.
+    """
+    with pymupdf.Document(filepath) as doc:
+        return [normalizeText(page.get_text(flags=SEARCH_FLAGS)) for page in doc]
+
+
+def docxPages(filepath: str) -> list[str]:
+    """Return the text of a Word document streamed from its XML"""
+    return [normalizeText(" ".join(iter_docx_lines(filepath)))]
+
+
+def textPages(filepath: str) -> list[str]:
+    return [normalizeText(Path(filepath).read_text(encoding="utf-8", errors="replace"))]
+
+
+def extractPages(filepath: str) -> list[str]:
+    """Return the pages of the document, an empty list if the format is not supported"""
+    suffix = Path(filepath).suffix.lower()
+
+    if suffix in PDF_SUFFIXES:
+        return pdfPages(filepath)
+    elif suffix == ".docx":
+        return docxPages(filepath)
+    elif suffix in TEXT_SUFFIXES:
+        return textPages(filepath)
+    return []
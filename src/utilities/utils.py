@@ -7,13 +7,15 @@ import pandas as pd
 from hashlib import sha1
 from pathlib import Path
 from zipfile import ZipFile
-from mammoth import extract_raw_text
 from typing import Literal
 from base64 import (b64decode, b64encode)
 from tempfile import gettempdir
 
 from qtpy import (QtWidgets, QtCore, QtGui)
 
+from utilities.excel_reader import readExcelFiles
+from utilities.docx_text import iter_docx_lines
+
 
 
 def walkFolder(path: str | Path) -> set[Path]:
@@ -116,19 +118,15 @@ def findRefKeyFromPath(filepath: str, pattern: str = "", parent_segment: str = "
     
     return refkey
 
-def mergeExcelFiles(files: list, drop_duplicate: str | bool = 'first', outfile: str = "") -> None | pd.DataFrame:
+def mergeExcelFiles(files: list, drop_duplicate: str | bool = 'first', outfile: str = "", usecols: list[str] | None = None) -> None | pd.DataFrame:
     """
     Merge the first worksheet of several excel files into one.
+
+    Workbooks are read in parallel and only `usecols` are kept if given.
     """
 
     if len(files) > 0:
-        dfs = []
-        for file in files:
-            dfs.append(pd.read_excel(file, dtype=str))
-            
-        df = pd.concat(dfs)
-
-        df.drop_duplicates(keep=drop_duplicate, inplace=True)
+        df = readExcelFiles(files, usecols=usecols, drop_duplicate=drop_duplicate)
         
         if outfile != "":
             try:
@@ -280,27 +278,31 @@ def contextual_line_id(line: str, context: str = "") -> str:
     normalized = f"{context.strip()}::{line.strip()}"
     return sha1(normalized.encode()).hexdigest()[:10]
 
+def file_hash(filepath, chunk_size: int = 1 << 20) -> str:
+    """Return the sha1 hexdigest of a file content"""
+    digest = sha1()
+    with open(filepath, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
 def line_id(line: str) -> str:
     normalized = " ".join(line.strip().split())
     return sha1(normalized.encode()).hexdigest()[:10]
 
 def extract_hash_lines(docx_path) -> dict:
     """
-    Extract all lines starting with '#' or '! from a Word (.docx) document using mammoth.
+    Extract all lines starting with '#' or '! from a Word (.docx) document.
     """
+    lines = {}
     try:
-        with open(docx_path, "rb") as docx_file:
-            result = extract_raw_text(docx_file)
-            text: str = result.value  # The raw text extracted
-
+        for line in iter_docx_lines(docx_path):
+            if line.strip().startswith(("#", "!")):
+                lid = line_id(line)
+                lines[lid] = line.strip()
     except Exception as e:
         return False, str(e)
 
-    lines = {}
-    for line in text.splitlines():
-        if line.strip().startswith(("#", "!")):
-            lid = line_id(line)
-            lines[lid] = line.strip()
     return lines
 
 def trim_file(filepath, keep_lines=10000):
@@ -1,4 +1,4 @@
-from qtpy import (Qt, QtWidgets, QtGui)
+from qtpy import (Qt, QtWidgets, QtGui, QtCore)
 
 from widgets.toolbar import ToolBar
 from qt_theme_manager import theme_icon_manager
@@ -42,6 +42,12 @@ class BaseTab(QtWidgets.QWidget):
         self.search_tool.setFixedWidth(180)
         self.action_search = self.toolbar.addWidget(self.search_tool)
 
+        # Filter once the user stops typing
+        self.search_timer = QtCore.QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(250)
+        self.search_tool.textChanged.connect(lambda: self.search_timer.start())
+
         # Separator
         self.toolbar.addSeparator()
 
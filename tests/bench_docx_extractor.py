@@ -0,0 +1,112 @@
+"""Benchmark the Docx connector tag extraction against mammoth
+
+Run from the repository root:
+    python tests/bench_docx_extractor.py [pages]
+
+A synthetic inspection script (tables, tabs, hyperlinks, tracked deletions,
+alternate content) is generated, then the tagged lines found by the
+streaming extractor are compared with the ones found in mammoth's raw text.
+"""
+import sys
+import random
+from time import perf_counter
+from pathlib import Path
+from zipfile import ZipFile, ZIP_DEFLATED
+from tempfile import TemporaryDirectory
+
+sys.path.insert(0, Path(__file__).parents[1].joinpath("src").as_posix())
+
+from mammoth import extract_raw_text
+
+from utilities.utils import extract_hash_lines, line_id
+
+PAGES = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+PARAGRAPHS_PER_PAGE = 40
+
+CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+</Types>"""
+
+RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
+</Relationships>"""
+
+DOCUMENT_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId9" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/hyperlink" Target="https://example.com" TargetMode="External"/>
+</Relationships>"""
+
+HEADER = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+          '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+          'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" '
+          'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006" '
+          'xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape" '
+          'mc:Ignorable="wps"><w:body>')
+FOOTER = '<w:sectPr/></w:body></w:document>'
+
+
+def run(text: str) -> str:
+    return f'<w:r><w:t xml:space="preserve">{text}</w:t></w:r>'
+
+
+def paragraph(rnd: random.Random, i: int) -> str:
+    kind = rnd.random()
+    prefix = rnd.choice(["#", "!", "", "", "", ""])
+    if kind < 0.6:
+        return f'<w:p><w:pPr><w:tabs><w:tab w:val="left" w:pos="720"/></w:tabs></w:pPr>{run(prefix + "Request")}{run(f" {i} about the batch record")}</w:p>'
+    if kind < 0.7:
+        return (f'<w:p>{run(prefix + "Item")}<w:r><w:tab/></w:r>{run(str(i))}'
+                f'<w:del w:id="{i}" w:author="x"><w:r><w:delText>removed</w:delText></w:r></w:del></w:p>')
+    if kind < 0.8:
+        return f'<w:p>{run(prefix + "See")}<w:hyperlink r:id="rId9">{run(f" link {i}")}</w:hyperlink></w:p>'
+    if kind < 0.9:
+        cells = "".join(f'<w:tc><w:p>{run(rnd.choice(["#", ""]) + f"cell {i}.{c}")}</w:p></w:tc>' for c in range(3))
+        return f'<w:tbl><w:tr>{cells}</w:tr></w:tbl>'
+    return (f'<w:p>{run(prefix + "Shape")}<w:r><mc:AlternateContent>'
+            f'<mc:Choice Requires="wps"><w:drawing><w:txbxContent><w:p>{run(f"#box {i}")}</w:p></w:txbxContent></w:drawing></mc:Choice>'
+            f'<mc:Fallback><w:pict><w:txbxContent><w:p>{run(f"#box {i}")}</w:p></w:txbxContent></w:pict></mc:Fallback>'
+            f'</mc:AlternateContent></w:r>{run(f" after {i}")}</w:p>')
+
+
+def build(path: Path, pages: int):
+    rnd = random.Random(0)
+    body = "".join(paragraph(rnd, i) for i in range(pages * PARAGRAPHS_PER_PAGE))
+    with ZipFile(path, "w", ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", CONTENT_TYPES)
+        archive.writestr("_rels/.rels", RELS)
+        archive.writestr("word/_rels/document.xml.rels", DOCUMENT_RELS)
+        archive.writestr("word/document.xml", HEADER + body + FOOTER)
+
+
+def mammoth_hash_lines(docx_path) -> dict:
+    """Previous implementation, based on mammoth's raw text"""
+    with open(docx_path, "rb") as docx_file:
+        text: str = extract_raw_text(docx_file).value
+
+    lines = {}
+    for line in text.splitlines():
+        if line.strip().startswith(("#", "!")):
+            lines[line_id(line)] = line.strip()
+    return lines
+
+
+with TemporaryDirectory() as tmp:
+    docx = Path(tmp).joinpath("script.docx")
+    build(docx, PAGES)
+
+    t0 = perf_counter()
+    expected = mammoth_hash_lines(docx)
+    t_mammoth = perf_counter() - t0
+
+    t0 = perf_counter()
+    result = extract_hash_lines(docx)
+    t_stream = perf_counter() - t0
+
+print(f"{PAGES} pages, {PAGES * PARAGRAPHS_PER_PAGE} blocks, {len(expected)} tagged lines")
+print(f"mammoth   : {t_mammoth * 1000:10.1f} ms")
+print(f"iterparse : {t_stream * 1000:10.1f} ms")
+print(f"same lines: {result == expected}")
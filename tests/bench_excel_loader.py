@@ -0,0 +1,61 @@
+"""Benchmark the Excel signage matching (10k Excel rows x 10k signages)
+
+Run from the repository root:
+    python tests/bench_excel_loader.py
+"""
+import sys
+import random
+from time import perf_counter
+from pathlib import Path
+
+sys.path.insert(0, Path(__file__).parents[1].joinpath("src").as_posix())
+
+from pandas import DataFrame
+
+from common import SignageType
+from database.database import AppDatabase
+from signage.model import ExcelLoader
+
+N_EXCEL = 10_000
+N_SIGNAGE = 10_000
+TYPES = ["Request", "Question", "Finding", "Todo"]
+
+for uid, name in enumerate(TYPES):
+    AppDatabase.cache_signage_type.add(uid, name, SignageType(uid, name, "", None))
+
+rnd = random.Random(0)
+
+snapshot = [(i, f"R{i:05d}", i % len(TYPES), f"title {i}") for i in range(N_SIGNAGE)]
+
+# Half the rows match an existing signage (a tenth of them with a new title), half are new
+rows = []
+for i in range(N_EXCEL):
+    if i % 2 == 0:
+        sid = rnd.randrange(N_SIGNAGE)
+        title = f"title {sid}" if i % 10 else f"renamed {sid}"
+        rows.append({"Refkey": f"r{sid:05d}", "Type": TYPES[sid % len(TYPES)], "Title": title})
+    else:
+        rows.append({"Refkey": f"N{i:05d}", "Type": rnd.choice(TYPES), "Title": f"new {i}"})
+df = DataFrame(rows)
+
+
+def naive(df: DataFrame, snapshot: list[tuple], sample: int):
+    """Previous nested-loop matching, on the first `sample` rows"""
+    for _, df_row in df.head(sample).iterrows():
+        for signage_id, refkey, signage_type, title in snapshot:
+            if refkey.lower() == df_row["Refkey"].lower() and TYPES[signage_type].lower() == df_row["Type"].lower():
+                break
+
+
+t0 = perf_counter()
+insertions, updates = ExcelLoader.diff(df, snapshot, update_title=True)
+t_hash = perf_counter() - t0
+
+sample = 200
+t0 = perf_counter()
+naive(df, snapshot, sample)
+t_naive = (perf_counter() - t0) * N_EXCEL / sample
+
+print(f"{N_EXCEL} rows x {N_SIGNAGE} signages")
+print(f"hash join   : {t_hash * 1000:10.1f} ms ({len(insertions)} insertions, {len(updates)} updates)")
+print(f"nested loop : {t_naive * 1000:10.1f} ms (extrapolated from {sample} rows)")
@@ -0,0 +1,64 @@
+"""Benchmark the OneNote tag fetcher with the replay backend
+
+Run from the repository root:
+    python tests/bench_onenote_fetcher.py [sections] [tags per section] [delay]
+
+Recorded JSON is generated for each section, then every section is fetched
+one after the other (previous behaviour) and with the concurrent fetcher.
+"""
+import sys
+import json
+from time import perf_counter
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+sys.path.insert(0, Path(__file__).parents[1].joinpath("src").as_posix())
+
+from onenote.fetcher import TagFetcher, ReplayBackend
+
+SECTIONS = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+TAGS = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+DELAY = float(sys.argv[3]) if len(sys.argv) > 3 else 0.002
+REPLAY = Path(__file__).with_name("onenote_replay.py")
+
+
+def record(folder: Path, section: int):
+    tags = [{"TypeName": "Request" if i % 3 else "Question",
+             "Text": f"Tag {i} of section {section} with \"quotes\" and unicode é",
+             "Link": f"onenote:#page{i}&section-id={{{section}}}",
+             "ID": f"{{{section}-{i}}}",
+             "PageID": f"{{page-{section}-{i // 10}}}",
+             "PageName": f"Page {i // 10}",
+             "CreationTime": "2024-06-20T10:00:00.000Z",
+             "LastModifiedTime": "2024-06-21T10:00:00.000Z",
+             "TypeIndex": "1"} for i in range(TAGS)]
+    folder.joinpath(f"section{section}.json").write_text(json.dumps(tags), encoding="utf-8")
+
+
+with TemporaryDirectory() as tmp:
+    folder = Path(tmp)
+    section_ids = [f"section{i}" for i in range(SECTIONS)]
+    for i in range(SECTIONS):
+        record(folder, i)
+
+    backend = ReplayBackend(folder, REPLAY, DELAY)
+
+    t0 = perf_counter()
+    sequential = [(section_id, tag)
+                  for section_id in section_ids
+                  for tag in TagFetcher(backend).fetchSection(section_id)]
+    t_sequential = perf_counter() - t0
+
+    t0 = perf_counter()
+    first = None
+    concurrent = []
+    for item in TagFetcher(backend, max_workers=4).fetch(section_ids):
+        if first is None:
+            first = perf_counter() - t0
+        concurrent.append(item)
+    t_concurrent = perf_counter() - t0
+
+print(f"{SECTIONS} sections x {TAGS} tags, {DELAY * 1000:.1f} ms per tag")
+print(f"sequential : {t_sequential * 1000:10.1f} ms")
+print(f"concurrent : {t_concurrent * 1000:10.1f} ms (first tag after {first * 1000:.1f} ms)")
+print(f"same tags  : {sorted(sequential, key=lambda t: t[1].ID) == sorted(concurrent, key=lambda t: t[1].ID)}")
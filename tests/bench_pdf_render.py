@@ -0,0 +1,86 @@
+"""Benchmark the page render latency of the PDF viewer
+
+Run from the repository root:
+    python tests/bench_pdf_render.py [pages] [repeat]
+
+A dense PDF (text and table grid) is generated, then every page is rendered at
+100%, 200% and 400% zoom for a standard and a high-DPI screen (dpr 1 and 2).
+The conversion of the raster to QPixmap is timed through a PNG round trip
+(previous behaviour) and over the pixmap samples.
+"""
+import sys
+from time import perf_counter
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pymupdf
+
+sys.path.insert(0, Path(__file__).parents[1].joinpath("src").as_posix())
+
+from qtpy import QtGui
+from PyMuPDF4QT.render_worker import toQPixmap
+
+PAGES = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+REPEAT = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+
+def build(path: Path):
+    doc = pymupdf.open()
+    for pno in range(PAGES):
+        page = doc.new_page()
+        for row in range(45):
+            y = 40 + row * 16
+            page.draw_line((36, y - 12), (560, y - 12), color=(0.6, 0.6, 0.6))
+            for col in range(6):
+                page.insert_text((40 + col * 87, y), f"R{row}C{col} p{pno} 0.{row * col:03d}", fontsize=7)
+    doc.save(path)
+
+
+def pngRoundTrip(fitzpix: pymupdf.Pixmap, dpr: float) -> QtGui.QPixmap:
+    pixmap = QtGui.QPixmap()
+    pixmap.loadFromData(fitzpix.tobytes())
+    pixmap.setDevicePixelRatio(dpr)
+    return pixmap
+
+
+def bench(doc: pymupdf.Document, zoom: float, dpr: float) -> tuple[float, float, float]:
+    t_render = t_png = t_samples = 0.0
+    matrix = pymupdf.Matrix(zoom * dpr, zoom * dpr)
+
+    for _ in range(REPEAT):
+        for page in doc:
+            dlist = page.get_displaylist()
+
+            t0 = perf_counter()
+            fitzpix = dlist.get_pixmap(alpha=0, matrix=matrix)
+            t1 = perf_counter()
+            png = pngRoundTrip(fitzpix, dpr)
+            t2 = perf_counter()
+            samples = toQPixmap(fitzpix, dpr)
+            t3 = perf_counter()
+
+            assert png.toImage().convertToFormat(QtGui.QImage.Format.Format_RGB32) == \
+                   samples.toImage().convertToFormat(QtGui.QImage.Format.Format_RGB32)
+
+            t_render += t1 - t0
+            t_png += t2 - t1
+            t_samples += t3 - t2
+
+    n = REPEAT * len(doc) / 1000
+    return t_render / n, t_png / n, t_samples / n
+
+
+app = QtGui.QGuiApplication(sys.argv[:1])
+
+with TemporaryDirectory() as tmp:
+    path = Path(tmp).joinpath("dense.pdf")
+    build(path)
+    doc = pymupdf.open(path)
+
+    print(f"{PAGES} pages x {REPEAT}, mean latency per page (ms)")
+    print(f"{'zoom':>5} {'dpr':>4} {'raster':>9} {'+ png':>9} {'+ samples':>10} {'total png':>10} {'total samples':>14}")
+    for dpr in (1.0, 2.0):
+        for zoom in (1.0, 2.0, 4.0):
+            render, png, samples = bench(doc, zoom, dpr)
+            print(f"{zoom:>5.0%} {dpr:>4.0f} {render:>9.1f} {png:>9.1f} {samples:>10.1f} "
+                  f"{render + png:>10.1f} {render + samples:>14.1f}")
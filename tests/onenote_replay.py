@@ -0,0 +1,49 @@
+"""Stand-in for onenotescrapper.ps1 replaying recorded JSON
+
+Write '<folder>/<section_id>.json' (as saved with -OutputJson in debug mode)
+on stdout, one tag at a time, waiting `delay` seconds between tags to mimic
+the OneNote COM API latency.
+
+With --hierarchy, write the section hierarchy node instead, its
+lastModifiedTime being the modification time of the recorded JSON.
+
+    python tests/onenote_replay.py --folder recorded --section-id {ID} [--delay 0.01] [--hierarchy]
+"""
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+from datetime import datetime, timezone
+
+parser = argparse.ArgumentParser(description="Replay the OneNote tags recorded for a section")
+parser.add_argument("--folder", required=True, help="Folder of <section_id>.json files")
+parser.add_argument("--section-id", required=True)
+parser.add_argument("--delay", type=float, default=0.0, help="Seconds to wait before each tag")
+parser.add_argument("--hierarchy", action="store_true", help="Write the section hierarchy node")
+args = parser.parse_args()
+
+path = Path(args.folder).joinpath(f"{args.section_id}.json")
+if not path.is_file():
+    sys.stderr.write(f"No recorded JSON for section {args.section_id}\n")
+    sys.exit(1)
+
+if args.hierarchy:
+    last_modified = datetime.fromtimestamp(path.stat().st_mtime, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+    sys.stdout.write('<one:Section xmlns:one="http://schemas.microsoft.com/office/onenote/2013/onenote" '
+                     f'name="{args.section_id}" ID="{args.section_id}" lastModifiedTime="{last_modified}"/>')
+    sys.exit(0)
+
+data = json.loads(path.read_text(encoding="utf-8-sig"))
+if not isinstance(data, list):
+    data = [data]
+
+out = sys.stdout
+out.write("[")
+for i, tag in enumerate(data):
+    if args.delay:
+        time.sleep(args.delay)
+    out.write(("," if i else "") + "\n" + json.dumps(tag, indent=4))
+    out.flush()
+out.write("\n]")
+out.flush()
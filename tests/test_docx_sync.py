@@ -0,0 +1,134 @@
+"""Tests of the Docx connector incremental sync
+
+Run from the repository root:
+    python -m pytest tests/test_docx_sync.py
+"""
+import os
+import sys
+import json
+import tempfile
+from pathlib import Path
+from zipfile import ZipFile
+
+sys.path.insert(0, Path(__file__).parents[1].joinpath("src").as_posix())
+# utilities.config resolves the application data folder at import
+os.environ.setdefault("LOCALAPPDATA", tempfile.gettempdir())
+
+import pytest
+
+pytest.importorskip("qtpy")
+
+from common import Connector
+from database.database import AppDatabase
+from signage.model import DataService
+
+RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
+</Relationships>"""
+
+HEADER = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+          '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>')
+FOOTER = '</w:body></w:document>'
+
+
+def write(path: Path, lines: list[str]):
+    body = "".join(f'<w:p><w:r><w:t xml:space="preserve">{line}</w:t></w:r></w:p>' for line in lines)
+    with ZipFile(path, "w") as archive:
+        archive.writestr("_rels/.rels", RELS)
+        archive.writestr("word/document.xml", HEADER + body + FOOTER)
+
+
+def sync(connector: Connector, cache: dict, insert=lambda signage: True) -> list[str]:
+    """Run a sync, the signages accepted by `insert` are inserted, then the sync state is saved"""
+    synced = []
+    titles = []
+    for signage in DataService.docxSignages({connector.uid: connector}, "", cache, synced):
+        titles.append(signage.title)
+        if insert(signage):
+            # Done by SignageModel.insertSignage
+            cache["Docx"].add(json.loads(signage.source)["object_id"])
+    assert [state.connector for state in synced] == [connector]
+    for state in synced:
+        state.save(cache)
+    return titles
+
+
+@pytest.fixture(autouse=True)
+def saved(monkeypatch) -> list[Connector]:
+    saved = []
+    monkeypatch.setattr(AppDatabase, "updateConnectorSyncState", saved.append)
+    return saved
+
+
+@pytest.fixture
+def script(tmp_path) -> Path:
+    path = tmp_path.joinpath("script.docx")
+    write(path, ["#First request", "no tag", "!First todo"])
+    return path
+
+
+def test_first_sync_imports_tagged_lines(script):
+    connector = Connector(uid=1, type="docx", value=script.as_posix())
+    cache = {"Docx": set()}
+
+    assert sync(connector, cache) == ["First request", "First todo"]
+    assert connector.line_ids == cache["Docx"]
+    assert connector.size == script.stat().st_size
+
+
+def test_unchanged_file_is_not_read(script):
+    connector = Connector(uid=1, type="docx", value=script.as_posix())
+    sync(connector, {"Docx": set()})
+
+    synced = []
+    assert list(DataService.docxSignages({1: connector}, "", {"Docx": set()}, synced)) == []
+    assert synced == []
+
+
+def test_connector_is_not_modified_before_save(script):
+    connector = Connector(uid=1, type="docx", value=script.as_posix())
+
+    synced = []
+    assert len(list(DataService.docxSignages({1: connector}, "", {"Docx": set()}, synced))) == 2
+    assert connector.line_ids == set() and connector.size == 0
+    assert synced[0].line_ids and synced[0].size == script.stat().st_size
+
+
+def test_line_not_inserted_is_imported_again(script, saved):
+    connector = Connector(uid=1, type="docx", value=script.as_posix())
+    cache = {"Docx": set()}
+
+    assert sync(connector, cache, insert=lambda signage: signage.title != "First todo") == ["First request", "First todo"]
+    assert saved == [connector]
+
+    write(script, ["#First request", "no tag", "!First todo", "#Second request"])
+    assert sync(connector, cache) == ["First todo", "Second request"]
+
+
+def test_deleted_signage_is_not_imported_again(script):
+    connector = Connector(uid=1, type="docx", value=script.as_posix())
+    sync(connector, {"Docx": set()})
+
+    # Both signages deleted by the user: the connector cache no longer holds their line ids
+    cache = {"Docx": set()}
+    write(script, ["#First request", "no tag", "!First todo", "#Second request"])
+
+    assert sync(connector, cache) == ["Second request"]
+
+
+def test_edited_line_is_a_new_signage(script):
+    connector = Connector(uid=1, type="docx", value=script.as_posix())
+    cache = {"Docx": set()}
+    sync(connector, cache)
+
+    write(script, ["#First request, edited", "no tag", "!First todo"])
+
+    assert sync(connector, cache) == ["First request, edited"]
+
+
+def test_new_connector_imports_deleted_signages(script):
+    sync(Connector(uid=1, type="docx", value=script.as_posix()), {"Docx": set()})
+
+    # A connector added again has no sync state
+    assert sync(Connector(uid=2, type="docx", value=script.as_posix()), {"Docx": set()}) == ["First request", "First todo"]
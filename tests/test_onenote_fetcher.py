@@ -0,0 +1,94 @@
+"""Tests of the concurrent OneNote tag fetcher with the replay backend
+
+Run from the repository root:
+    python -m pytest tests/test_onenote_fetcher.py
+"""
+import sys
+import json
+from pathlib import Path
+
+sys.path.insert(0, Path(__file__).parents[1].joinpath("src").as_posix())
+
+import pytest
+
+from onenote.fetcher import TagFetcher, TagBackend, TagFetchError, ReplayBackend
+
+REPLAY = Path(__file__).with_name("onenote_replay.py")
+
+
+class ScriptBackend(TagBackend):
+    """Run a Python snippet in place of the tag backend"""
+
+    def __init__(self, code: str):
+        self.code = code
+
+    def command(self, section_id: str) -> list[str]:
+        return [sys.executable, "-c", self.code]
+
+    def sectionCommand(self, section_id: str) -> list[str]:
+        return self.command(section_id)
+
+
+def tag(section: str, i: int) -> dict:
+    return {"TypeName": "Request",
+            "Text": f"Tag {i} of {section}",
+            "Link": f"onenote:#page&section-id={{{section}}}",
+            "ID": f"{{{section}-{i}}}",
+            "PageID": "{page}",
+            "PageName": "Page",
+            "CreationTime": "2024-06-20T10:00:00.000Z",
+            "LastModifiedTime": "2024-06-21T10:00:00.000Z",
+            "TypeIndex": "1"}
+
+
+@pytest.fixture
+def backend(tmp_path) -> ReplayBackend:
+    tmp_path.joinpath("full.json").write_text(json.dumps([tag("full", i) for i in range(3)]), encoding="utf-8")
+    tmp_path.joinpath("empty.json").write_text("[]", encoding="utf-8")
+    return ReplayBackend(tmp_path, REPLAY)
+
+
+def test_fetch_section(backend):
+    assert [t.ID for t in TagFetcher(backend).fetchSection("full")] == ["{full-0}", "{full-1}", "{full-2}"]
+    assert list(TagFetcher(backend).fetchSection("empty")) == []
+
+
+def test_failed_section_raises(backend):
+    with pytest.raises(TagFetchError) as e:
+        list(TagFetcher(backend).fetchSection("missing"))
+    assert e.value.section_id == "missing"
+
+
+def test_invalid_json_raises():
+    backend = ScriptBackend("import sys; sys.stdout.write('[{\"ID\": ')")
+    with pytest.raises(TagFetchError):
+        list(TagFetcher(backend).fetchSection("section"))
+
+
+def test_backend_cannot_start():
+    class MissingBackend(ScriptBackend):
+        def command(self, section_id: str) -> list[str]:
+            return [Path(sys.executable).with_name("no-such-backend").as_posix()]
+
+    with pytest.raises(TagFetchError):
+        list(TagFetcher(MissingBackend("")).fetchSection("section"))
+
+
+def test_large_error_output_does_not_block():
+    # More than a pipe buffer written on stderr before stdout is closed
+    backend = ScriptBackend("import sys; sys.stderr.write('x' * (1 << 20)); sys.stderr.flush(); sys.stdout.write('[]')")
+    assert list(TagFetcher(backend).fetchSection("section")) == []
+
+
+def test_fetch_yields_failed_sections(backend):
+    results = list(TagFetcher(backend, max_workers=3).fetch(["full", "missing", "empty"]))
+
+    failed = {section_id for section_id, t in results if isinstance(t, TagFetchError)}
+    tags = sorted(t.ID for section_id, t in results if not isinstance(t, TagFetchError))
+    assert failed == {"missing"}
+    assert tags == ["{full-0}", "{full-1}", "{full-2}"]
+
+
+def test_backend_is_abstract():
+    with pytest.raises(TypeError):
+        TagBackend()
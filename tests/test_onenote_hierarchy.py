@@ -0,0 +1,77 @@
+"""Tests of the lazy OneNote hierarchy loader against captured GetHierarchy XML
+
+Run from the repository root:
+    python -m pytest tests/test_onenote_hierarchy.py
+"""
+import sys
+from io import BytesIO
+from pathlib import Path
+from xml.etree import ElementTree as ET
+
+sys.path.insert(0, Path(__file__).parents[1].joinpath("src").as_posix())
+
+from onenote import onenote_api as OE
+from onenote.hierarchy import parseHierarchy, Notebook, SectionGroup, Section, Page
+
+FIXTURES = Path(__file__).parent.joinpath("fixtures", "onenote")
+
+
+def load(name: str = "hierarchy.xml") -> list[Notebook]:
+    return parseHierarchy(FIXTURES.joinpath(name).as_posix())
+
+
+def test_notebooks_match_eager_hierarchy():
+    eager = OE.Hierarchy(ET.parse(FIXTURES.joinpath("hierarchy.xml")).getroot())
+    notebooks = load()
+
+    assert [(n.id, n.name, n.nickname) for n in notebooks] == [(n.id, n.name, n.nickname) for n in eager]
+    for notebook, expected in zip(notebooks, eager):
+        assert [(s.id, s.name) for s in notebook] == [(s.id, s.name) for s in expected]
+
+
+def test_notebook_children():
+    inspection, personal, unfiled = load()
+
+    assert str(inspection) == "Inspection 2024"
+    assert str(personal) == "My notebook"
+    assert unfiled.nickname is None and list(unfiled) == []
+
+    requests, findings, sites = inspection
+    assert isinstance(requests, Section) and requests.color == "#8AA8E4"
+    assert findings.read_only == "true"
+    assert isinstance(sites, SectionGroup)
+    assert inspection.recycle_bin is not None and inspection.recycle_bin.is_recycle_bin
+
+
+def test_section_groups_expand_on_demand():
+    sites: SectionGroup = list(load()[0])[2]
+    assert not sites.isExpanded()
+
+    site_a, subcontractors = sites
+    assert sites.isExpanded()
+    assert site_a.parent is sites
+    assert isinstance(subcontractors, SectionGroup) and not subcontractors.isExpanded()
+    assert [s.name for s in subcontractors] == ["Lab X"]
+
+
+def test_pages_expand_on_demand():
+    requests: Section = next(iter(load()[0]))
+    assert not requests.isExpanded()
+
+    pages = list(requests)
+    assert requests.isExpanded()
+    assert all(isinstance(page, Page) for page in pages)
+    assert [(p.name, p.page_level) for p in pages] == [("Day 1", "1"), ("Day 2", "1"), ("Back room", "2")]
+    assert pages[0].is_currently_viewed == "true"
+    assert pages[0].parent is requests
+
+
+def test_nodes_use_slots():
+    notebook = load()[0]
+    for node in (notebook, *notebook, next(iter(next(iter(notebook))))):
+        assert not hasattr(node, "__dict__")
+
+
+def test_empty_hierarchy():
+    xml = b'<one:Notebooks xmlns:one="http://schemas.microsoft.com/office/onenote/2013/onenote"/>'
+    assert parseHierarchy(BytesIO(xml)) == []
@@ -0,0 +1,63 @@
+"""Tests of the page labels computed without loading the pages
+
+Run from the repository root:
+    python -m pytest tests/test_page_labels.py
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, Path(__file__).parents[1].joinpath("src").as_posix())
+
+import pymupdf
+import pytest
+
+from PyMuPDF4QT.QtPymuPdf import PageLabels
+
+PAGE_COUNT = 120
+
+
+def document(rules: list[dict]) -> pymupdf.Document:
+    doc = pymupdf.open()
+    for _ in range(PAGE_COUNT):
+        doc.new_page()
+    doc.set_page_labels(rules)
+    return doc
+
+
+@pytest.mark.parametrize("style", ["D", "r", "R", "a", "A", ""])
+@pytest.mark.parametrize("prefix", ["", "A-"])
+@pytest.mark.parametrize("firstpagenum", [1, 25])
+def test_label_matches_page_label(style, prefix, firstpagenum):
+    # More than 26 pages: the letter styles go past "z"
+    doc = document([{"startpage": 0, "prefix": prefix, "style": style, "firstpagenum": firstpagenum}])
+    labels = PageLabels(doc)
+
+    assert [labels.label(pno) for pno in range(PAGE_COUNT)] == [page.get_label() for page in doc]
+
+
+def test_several_rules():
+    doc = document([{"startpage": 0, "prefix": "", "style": "r", "firstpagenum": 1},
+                    {"startpage": 10, "prefix": "App-", "style": "a", "firstpagenum": 1},
+                    {"startpage": 60, "prefix": "", "style": "A", "firstpagenum": 3},
+                    {"startpage": 90, "prefix": "P", "style": "", "firstpagenum": 1},
+                    {"startpage": 95, "prefix": "", "style": "D", "firstpagenum": 5}])
+    labels = PageLabels(doc)
+
+    assert [labels.label(pno) for pno in range(PAGE_COUNT)] == [page.get_label() for page in doc]
+
+
+def test_page_number_of_label():
+    doc = document([{"startpage": 0, "prefix": "", "style": "r", "firstpagenum": 1},
+                    {"startpage": 10, "prefix": "", "style": "D", "firstpagenum": 1}])
+    labels = PageLabels(doc)
+
+    assert labels.pageNumber("iv") == 3
+    assert labels.pageNumber("1") == 10
+    assert labels.pageNumber("missing") is None
+
+
+def test_document_without_labels():
+    labels = PageLabels(document([]))
+
+    assert labels.label(0) == ""
+    assert labels.pageNumber("1") is None